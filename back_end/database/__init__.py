@@ -1,2 +1,2 @@
-# from back_end.database.redis_manager import RedisManager
+from back_end.database.redis_manager import RedisManager
 from back_end.database.sqlite_manager import Database
\ No newline at end of file
@@ -0,0 +1,165 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from loguru import logger as log
+from sqlalchemy import Engine, Index, text
+
+def covering_index(engine: Engine, table: str, columns: tuple) -> str | None:
+    """
+    Name of an existing full (non-partial) index, or the primary key, whose leading columns are exactly
+    `columns` in any order. Partial indexes are skipped: a plain filter can't use them.
+    """
+    want = set(columns)
+    with engine.connect() as conn:
+        pk = [r[1] for r in sorted(conn.execute(text(f'PRAGMA table_info("{table}")')), key=lambda r: r[5]) if r[5]]
+        if pk and set(pk[:len(want)]) == want: return "PRIMARY KEY"
+        for _, name, _, _, partial in conn.execute(text(f'PRAGMA index_list("{table}")')):
+            if partial: continue
+            cols = [r[2] for r in conn.execute(text(f'PRAGMA index_info("{name}")'))]
+            if set(cols[:len(want)]) == want: return name
+    return None
+
+@dataclass
+class FilterStats:
+    table: str
+    columns: tuple
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict:
+        return {"table": self.table, "columns": list(self.columns), "calls": self.calls,
+                "avg_ms": self.avg_ms, "max_ms": self.max_ms, "total_ms": self.total_ms}
+
+@dataclass
+class IndexAdvisor:
+    """
+    Records the filter column sets scrud reads use and how long they take.
+    mode="suggest" only reports; mode="auto" queues a filter once it turns hot and creates its index on a
+    background thread (or at DatabaseManager.migrate()), never inside the read that noticed it: the DDL
+    needs the single writer connection, which the reader's own transaction may be holding.
+    """
+    engine: Engine
+    read_engine: Engine | None = None
+    """introspection (covering-index lookups in suggest / report) goes here instead of through the writer"""
+    mode: str = "suggest"
+    min_calls: int = 50
+    min_avg_ms: float = 1.0
+    stats: dict = field(default_factory=dict)
+    created: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.lock = threading.Lock()
+        self._covered = {}
+        self.pending: set[tuple[str, tuple]] = set()
+        self.worker: threading.Thread | None = None
+
+    def __repr__(self):
+        return f"[IndexAdvisor mode={self.mode} filters={len(self.stats)}]"
+
+    @contextmanager
+    def observe(self, table: str, columns):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(table, columns, (time.perf_counter() - t0) * 1000)
+
+    def record(self, table: str, columns, elapsed_ms: float):
+        columns = tuple(sorted(columns))
+        if not columns: return
+        with self.lock:
+            st = self.stats.get((table, columns))
+            if st is None: st = self.stats[(table, columns)] = FilterStats(table, columns)
+            st.calls += 1
+            st.total_ms += elapsed_ms
+            st.max_ms = max(st.max_ms, elapsed_ms)
+            if self.mode != "auto" or not self._is_hot(st) or (table, columns) in self.pending: return
+            self.pending.add((table, columns))
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._drain, name="IndexAdvisor", daemon=True)
+                self.worker.start()
+
+    def _is_hot(self, st: FilterStats) -> bool:
+        return st.calls >= self.min_calls and st.avg_ms >= self.min_avg_ms and (st.table, st.columns) not in self._covered
+
+    def _drain(self):
+        """Worker thread body; it steps down (worker = None) under the lock that record() queues under"""
+        self.create_pending(worker=True)
+
+    def create_pending(self, worker: bool = False) -> list[str]:
+        """Create the queued hot indexes; waits for the writer connection like any other write"""
+        created = []
+        while True:
+            with self.lock:
+                if not self.pending:
+                    if worker: self.worker = None
+                    return created
+                table, columns = next(iter(self.pending))
+            try:
+                if name := self.create(table, columns): created.append(name)
+            except Exception as e:
+                log.warning(f"{self}: Could not create the index on {table}({', '.join(columns)}), will retry when it is hot again: {e}")
+                with self.lock: self.stats[(table, columns)] = FilterStats(table, columns)
+            with self.lock: self.pending.discard((table, columns))
+
+    def _covering(self, table: str, columns: tuple) -> str | None:
+        key = (table, columns)
+        if key not in self._covered:
+            name = covering_index(self.read_engine or self.engine, table, columns)
+            if name is None: return None
+            self._covered[key] = name
+        return self._covered[key]
+
+    def suggest(self) -> list[dict]:
+        """Hot filters with no covering index, hottest first, each with the DDL that would fix it"""
+        with self.lock:
+            hot = [st for st in self.stats.values() if st.calls >= self.min_calls and st.avg_ms >= self.min_avg_ms]
+        out = []
+        for st in sorted(hot, key=lambda s: s.total_ms, reverse=True):
+            if self._covering(st.table, st.columns): continue
+            out.append(dict(st.to_dict(), ddl=self.ddl(st.table, st.columns)))
+        return out
+
+    @staticmethod
+    def index_name(table: str, columns: tuple) -> str:
+        return f"ix_auto_{table}_{'_'.join(columns)}"
+
+    def ddl(self, table: str, columns: tuple) -> str:
+        cols = ", ".join(f'"{c}"' for c in columns)
+        return f'CREATE INDEX IF NOT EXISTS "{self.index_name(table, columns)}" ON "{table}" ({cols})'
+
+    def create(self, table: str, columns: tuple) -> str | None:
+        if self._covering(table, columns): return None
+        name = self.index_name(table, columns)
+        t0 = time.perf_counter()
+        with self.engine.begin() as conn:
+            conn.execute(text(self.ddl(table, columns)))
+        self._covered[(table, columns)] = name
+        self.created.append(name)
+        log.success(f"{self}: Created {name} in {(time.perf_counter() - t0) * 1000:.1f}ms")
+        return name
+
+    def apply(self) -> list[str]:
+        """Create an index for every current suggestion"""
+        return [name for s in self.suggest() if (name := self.create(s["table"], tuple(s["columns"])))]
+
+    def report(self) -> str:
+        lines = [f"{self}:"]
+        with self.lock:
+            ordered = sorted(self.stats.values(), key=lambda s: s.total_ms, reverse=True)
+        for st in ordered:
+            covered = self._covering(st.table, st.columns) or "-"
+            lines.append(f" - {st.table}({', '.join(st.columns)}): calls={st.calls} avg={st.avg_ms:.2f}ms max={st.max_ms:.2f}ms index={covered}")
+        return "\n".join(lines)
+
+def declared(name: str, *columns: str, where: str = None, unique: bool = False) -> Index:
+    """Shorthand for a composite / partial index in a model's __table_args__"""
+    kw = {"sqlite_where": text(where)} if where else {}
+    return Index(name, *columns, unique=unique, **kw)
@@ -0,0 +1,273 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from loguru import logger as log
+
+SUFFIXES = (".xlsx", ".csv", ".parquet")
+LOG_TABLE = "_ingest_log"
+RESERVED = ("uuid", "migrated_at", "source_file")
+"""metadata columns every ingested row gets; input columns may not use these names"""
+
+def sanitize(text: str) -> str:
+    """Column / table name safe to quote into SQL"""
+    text = str(text).strip()
+    text = re.sub(r"[^\w]", "_", text)
+    if text[0].isdigit():
+        text = "_" + text
+    return text.lower()
+
+def file_hash(file: Path) -> str:
+    with open(file, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def uuid4_hex(n: int):
+    """n random version-4 UUIDs as 32-char hex (sqlmodel's UUID storage format), without a per-row Python call"""
+    import numpy as np
+
+    b = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    b[:, 6] = (b[:, 6] & 0x0F) | 0x40
+    b[:, 8] = (b[:, 8] & 0x3F) | 0x80
+    return np.frombuffer(b.tobytes().hex().encode(), dtype="S32").astype(str)
+
+# --- readers: every format yields DataFrames of at most chunk_size rows ---
+def read_csv(file: Path, chunk_size: int) -> Iterator:
+    import pandas as pd
+
+    yield from pd.read_csv(file, chunksize=chunk_size)
+
+def read_parquet(file: Path, chunk_size: int) -> Iterator:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(f"Reading {file.name} needs pyarrow: pip install pyarrow") from e
+
+    for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+def read_xlsx(file: Path, chunk_size: int) -> Iterator:
+    """openpyxl read-only mode streams rows instead of loading the whole sheet like pd.read_excel"""
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None: return
+        header = [str(h) if h is not None else f"column_{i}" for i, h in enumerate(header)]
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=header).infer_objects()
+                chunk = []
+        if chunk: yield pd.DataFrame(chunk, columns=header).infer_objects()
+    finally:
+        wb.close()
+
+READERS = {".csv": read_csv, ".parquet": read_parquet, ".xlsx": read_xlsx}
+
+# --- typing ---
+INFERRED = {"integer": "INTEGER", "boolean": "INTEGER", "floating": "REAL", "mixed-integer-float": "REAL",
+            "decimal": "REAL", "datetime64": "TIMESTAMP", "datetime": "TIMESTAMP", "date": "TIMESTAMP"}
+
+def sqlite_type(series) -> str:
+    """SQLite column type for a pandas column; floats that only lost their int dtype to NaN stay INTEGER"""
+    from pandas.api import types
+
+    values = series.dropna()
+    if types.is_float_dtype(series):
+        return "INTEGER" if len(values) and (values % 1 == 0).all() else "REAL"
+    return INFERRED.get(types.infer_dtype(values, skipna=True), "TEXT")
+
+def to_rows(df) -> list[tuple]:
+    """DataFrame -> DB-API rows column-wise: NaN/NaT become NULL, datetimes ISO text, numpy scalars plain Python"""
+    import numpy as np
+    from pandas.api import types
+
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if types.is_datetime64_any_dtype(series):
+            if getattr(series.dt, "tz", None) is not None: series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+            values = np.datetime_as_string(series.to_numpy(dtype="datetime64[us]"), unit="us").astype(object)
+            values[series.isna().to_numpy()] = None
+        else:
+            values = series.to_numpy(dtype=object, na_value=None)
+        columns.append(values)
+    return list(zip(*columns))
+
+@dataclass
+class IngestResult:
+    file: str
+    table: str
+    rows: int = 0
+    chunks: int = 0
+    elapsed_ms: float = 0.0
+    skipped: bool = False
+    error: str | None = None
+
+    def __repr__(self):
+        if self.skipped: return f"[{self.file} -> {self.table}: unchanged, skipped]"
+        if self.error: return f"[{self.file} -> {self.table}: FAILED {self.error}]"
+        return f"[{self.file} -> {self.table}: {self.rows} rows in {self.chunks} chunk(s), {self.elapsed_ms:.1f}ms]"
+
+@dataclass
+class Ingestor:
+    """
+    Loads spreadsheet / CSV / Parquet files into SQLite tables named after the file.
+
+    Files are read in chunks of chunk_size rows (bounded memory) into a per-file staging table, column
+    types are inferred from the first chunk, each chunk is one executemany transaction. Once the whole
+    file is staged, one transaction replaces the rows it loaded before with the staged ones, so readers
+    never see a half-loaded file and a failure leaves the table as it was. Up to `workers` files are
+    parsed in parallel; writes go through one lock since SQLite has a single writer. A file whose sha256
+    matches the last successful ingest is skipped.
+    """
+    db_path: Path
+    input_dir: Path = None
+    chunk_size: int = 10_000
+    workers: int = 4
+    busy_timeout: float = 30.0
+    pragmas: dict = field(default_factory=dict)
+    """Connection pragmas, normally the DatabaseManager's SQLiteProfile.pragmas"""
+    results: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.lock = threading.Lock()
+        with closing(self.connect()) as conn, conn:
+            conn.execute(f'CREATE TABLE IF NOT EXISTS "{LOG_TABLE}" (file TEXT PRIMARY KEY, sha256 TEXT, table_name TEXT, rows INTEGER, ingested_at TEXT)')
+
+    def __repr__(self):
+        return f"[{Path(self.db_path).stem.title()}.Ingestor]"
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=self.busy_timeout)
+        for k, v in self.pragmas.items():
+            conn.execute(f"PRAGMA {k}={v}")
+        return conn
+
+    def files(self) -> list[Path]:
+        if self.input_dir is None or not self.input_dir.exists(): return []
+        return sorted(f for f in self.input_dir.iterdir() if f.suffix.lower() in SUFFIXES and not f.name.startswith("~$"))
+
+    def run(self, files: list[Path] = None, force: bool = False) -> list[IngestResult]:
+        files = self.files() if files is None else [Path(f) for f in files]
+        if not files: return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(files))), thread_name_prefix="ingest") as pool:
+            self.results = list(pool.map(lambda f: self.ingest_file(f, force=force), files))
+        done = [r for r in self.results if not r.skipped and not r.error]
+        log.success(f"{self}: Ingested {sum(r.rows for r in done)} rows from {len(done)} file(s), "
+                    f"{sum(r.skipped for r in self.results)} unchanged, {sum(bool(r.error) for r in self.results)} failed")
+        return self.results
+
+    def ingest_file(self, file: Path, table: str = None, force: bool = False) -> IngestResult:
+        file = Path(file)
+        table = sanitize(table or file.stem)
+        result = IngestResult(file.name, table)
+        t0 = time.perf_counter()
+        try:
+            reader = READERS.get(file.suffix.lower())
+            if reader is None: raise ValueError(f"Unsupported input format: {file.suffix}")
+            digest = file_hash(file)
+            with closing(self.connect()) as conn:
+                seen = conn.execute(f'SELECT sha256 FROM "{LOG_TABLE}" WHERE file = ?', (file.name,)).fetchone()
+            if seen and seen[0] == digest and not force:
+                result.skipped = True
+                log.debug(f"{self}: {result}")
+                return result
+
+            migrated_at = datetime.now(timezone.utc).isoformat()
+            staging = f"_staging_{table}_{digest[:12]}"
+            conn = self.connect()
+            try:
+                columns = None
+                for df in reader(file, self.chunk_size):
+                    if df.empty: continue
+                    df.columns = [sanitize(c) for c in df.columns]
+                    reserved = [c for c in df.columns if c in RESERVED]
+                    if reserved: raise ValueError(f"{file.name}: column(s) {reserved} are reserved for ingest metadata {RESERVED}, rename them")
+                    n = len(df)
+                    df.insert(0, "uuid", uuid4_hex(n))
+                    df.insert(1, "migrated_at", migrated_at)
+                    df.insert(2, "source_file", file.name)
+                    rows = to_rows(df)
+                    with self.lock:
+                        if columns is None:
+                            columns = self._stage(conn, staging, df)
+                        else:
+                            self._add_columns(conn, staging, df, columns)
+                        cols = ", ".join(f'"{c}"' for c in df.columns)
+                        marks = ", ".join("?" * len(df.columns))
+                        with conn:
+                            conn.executemany(f'INSERT INTO "{staging}" ({cols}) VALUES ({marks})', rows)
+                    result.rows += n
+                    result.chunks += 1
+                with self.lock:
+                    self._swap(conn, table, staging, columns, file.name,
+                               log_row=(file.name, digest, table, result.rows, migrated_at))
+            finally:
+                try:
+                    with self.lock, conn: conn.execute(f'DROP TABLE IF EXISTS "{staging}"')
+                finally:
+                    conn.close()
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            log.error(f"{self}: {result}")
+            return result
+        result.elapsed_ms = (time.perf_counter() - t0) * 1000
+        log.debug(f"{self}: {result}")
+        return result
+
+    def _stage(self, conn, staging: str, df) -> dict:
+        """A fresh staging table typed from the first chunk"""
+        with conn:
+            conn.execute(f'DROP TABLE IF EXISTS "{staging}"')
+            conn.execute(f'CREATE TABLE "{staging}" (uuid TEXT PRIMARY KEY, migrated_at TEXT, source_file TEXT)')
+        columns = {"uuid": "TEXT", "migrated_at": "TEXT", "source_file": "TEXT"}
+        self._add_columns(conn, staging, df, columns)
+        return columns
+
+    def _swap(self, conn, table: str, staging: str, columns: dict | None, source: str, log_row: tuple):
+        """
+        One transaction: create / extend the table, drop the rows a previous version of the file loaded,
+        copy the staged rows in and record the ingest. SQLite DDL is transactional, so all of it or none.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+            if columns is not None or exists:
+                conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (uuid TEXT PRIMARY KEY, migrated_at TEXT, source_file TEXT)')
+                current = {r[1]: r[2] for r in conn.execute(f'PRAGMA table_info("{table}")')}
+                if "source_file" not in current:  # table from the old ingest, which had no source_file column
+                    conn.execute(f'ALTER TABLE "{table}" ADD COLUMN source_file TEXT')
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_source_file" ON "{table}" (source_file)')
+                conn.execute(f'DELETE FROM "{table}" WHERE source_file = ?', (source,))
+            if columns is not None:
+                for col, kind in columns.items():
+                    if col not in current and col != "source_file": conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" {kind}')
+                cols = ", ".join(f'"{c}"' for c in columns)
+                conn.execute(f'INSERT INTO "{table}" ({cols}) SELECT {cols} FROM "{staging}"')
+                conn.execute(f'DROP TABLE "{staging}"')
+            conn.execute(f'INSERT OR REPLACE INTO "{LOG_TABLE}" VALUES (?, ?, ?, ?, ?)', log_row)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _add_columns(conn, table: str, df, columns: dict):
+        for col in df.columns:
+            if col in columns: continue
+            columns[col] = sqlite_type(df[col])
+            conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" {columns[col]}')
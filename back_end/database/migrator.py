@@ -0,0 +1,251 @@
+import time
+from dataclasses import dataclass, field
+
+from loguru import logger as log
+from sqlalchemy import Engine, MetaData, Table, TextClause, literal
+from sqlalchemy.schema import CreateTable
+
+@dataclass
+class MigrationStep:
+    table: str
+    kind: str  # create_table | add_column | create_index | drop_index | rebuild
+    detail: str
+    reasons: list = field(default_factory=list)
+    blocked: str | None = None
+    elapsed_ms: float = 0.0
+    rows: int = 0
+    batches: int = 0
+
+    def __repr__(self):
+        timing = f" {self.elapsed_ms:.1f}ms" if self.elapsed_ms else ""
+        copied = f" rows={self.rows} batches={self.batches}" if self.batches else ""
+        blocked = f" BLOCKED: {self.blocked}" if self.blocked else ""
+        return f"[{self.kind}] {self.table}: {self.detail}{timing}{copied}{blocked}"
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+@dataclass
+class Migrator:
+    """
+    Diffs model metadata against the live SQLite schema (PRAGMA table_info / index_list) and applies it.
+
+    Additive changes run in place: missing tables, ALTER TABLE ADD COLUMN, missing indexes.
+    Type, nullability, primary-key or constraint changes rebuild the table online: rows are copied into
+    a shadow table in short batches (readers and writers keep using the old table between them), changes
+    made meanwhile are captured by triggers and replayed, then the tables are swapped in one short transaction.
+    """
+    engine: Engine
+    tables: list[Table]
+    batch_size: int = 5_000
+    drop_indexes: bool = False
+    """Drop indexes that exist in the database but not in the models (never sqlite_autoindex_* or advisor ix_auto_*)."""
+    allow_drop: bool = False
+    """Let a rebuild drop database columns the model no longer declares; otherwise such rebuilds are blocked."""
+    steps: list = field(default_factory=list)
+
+    def __repr__(self):
+        return f"[Migrator tables={len(self.tables)}]"
+
+    # --- introspection ---
+    def _raw(self):
+        """DB-API connection in autocommit mode, so every transaction boundary below is explicit"""
+        raw = self.engine.raw_connection()
+        conn = raw.driver_connection
+        level = conn.isolation_level
+        conn.isolation_level = None
+        return raw, conn, level
+
+    @staticmethod
+    def _columns(conn, table: str) -> dict:
+        return {r[1]: {"type": (r[2] or "").upper().replace(" ", ""), "notnull": bool(r[3]), "pk": r[5]}
+                for r in conn.execute(f'PRAGMA table_info("{table}")')}
+
+    @staticmethod
+    def _indexes(conn, table: str) -> dict:
+        return {r[1]: r[3] for r in conn.execute(f'PRAGMA index_list("{table}")')}  # name -> origin (c, u, pk)
+
+    def _type(self, col) -> str:
+        return col.type.compile(dialect=self.engine.dialect).upper().replace(" ", "")
+
+    def _default(self, col):
+        """SQL literal for an ADD COLUMN / rebuild fill, from the server default or a scalar python default"""
+        if col.server_default is not None:
+            arg = col.server_default.arg
+            return arg.text if isinstance(arg, TextClause) else "'" + str(arg).replace("'", "''") + "'"
+        default = col.default
+        if default is not None and default.is_scalar and default.arg is not None:
+            return str(literal(default.arg, col.type).compile(dialect=self.engine.dialect, compile_kwargs={"literal_binds": True}))
+        return None
+
+    # --- planning ---
+    def plan(self) -> list[MigrationStep]:
+        raw, conn, level = self._raw()
+        try:
+            steps = []
+            for table in self.tables:
+                steps.extend(self._plan_table(conn, table))
+            return steps
+        finally:
+            conn.isolation_level = level
+            raw.close()
+
+    def _plan_table(self, conn, table: Table) -> list[MigrationStep]:
+        live = self._columns(conn, table.name)
+        if not live:
+            return [MigrationStep(table.name, "create_table", f"{len(table.columns)} columns, {len(table.indexes)} indexes")]
+
+        steps, rebuild = [], []
+        pk_model = [c.name for c in table.primary_key.columns]
+        pk_live = [name for name, info in sorted(live.items(), key=lambda kv: kv[1]["pk"]) if info["pk"]]
+        if pk_model != pk_live: rebuild.append(f"primary key {pk_live} -> {pk_model}")
+
+        for col in table.columns:
+            info = live.get(col.name)
+            if info is None:
+                reason = self._needs_rebuild(col)
+                if reason: rebuild.append(f"add {col.name}: {reason}")
+                else: steps.append(MigrationStep(table.name, "add_column", f"{col.name} {self._type(col)}"))
+                continue
+            if col.primary_key: continue
+            if info["type"] != self._type(col): rebuild.append(f"{col.name} type {info['type']} -> {self._type(col)}")
+            if info["notnull"] != (not col.nullable): rebuild.append(f"{col.name} {'NOT NULL' if col.nullable else 'NULL'} -> {'NULL' if col.nullable else 'NOT NULL'}")
+
+        extra = [name for name in live if name not in table.columns]
+        if rebuild:
+            step = MigrationStep(table.name, "rebuild", "batched copy into the new schema", reasons=rebuild)
+            missing = [c.name for c in table.columns if c.name not in live and not c.nullable and self._default(c) is None]
+            if missing: step.blocked = f"new NOT NULL column(s) {missing} have no default to fill existing rows"
+            elif extra and not self.allow_drop: step.blocked = f"would drop column(s) {extra}; pass allow_drop=True"
+            # the rebuild creates the new columns itself
+            steps = [s for s in steps if s.kind != "add_column"] + [step]
+        elif extra:
+            log.warning(f"{self}: {table.name} has column(s) not in the model, left in place: {extra}")
+
+        live_ix = self._indexes(conn, table.name)
+        model_ix = {ix.name for ix in table.indexes}
+        for ix in table.indexes:
+            if ix.name not in live_ix or rebuild: steps.append(MigrationStep(table.name, "create_index", ix.name))
+        for name, origin in live_ix.items():
+            if origin != "c" or name in model_ix or name.startswith("ix_auto_"): continue
+            if self.drop_indexes and not rebuild: steps.append(MigrationStep(table.name, "drop_index", name))
+            elif not rebuild: log.warning(f"{self}: {table.name} has index {name} not declared by the model")
+        return steps
+
+    def _needs_rebuild(self, col) -> str | None:
+        """Why SQLite's ALTER TABLE ADD COLUMN can't add this column, if it can't"""
+        if col.primary_key: return "primary key"
+        if col.unique: return "unique"
+        if col.foreign_keys: return "foreign key"
+        if not col.nullable and self._default(col) is None: return "NOT NULL without a default"
+        return None
+
+    # --- applying ---
+    def run(self, dry_run: bool = False) -> list[MigrationStep]:
+        self.steps = self.plan()
+        if dry_run: return self.steps
+        for step in self.steps:
+            if step.blocked:
+                log.error(f"{self}: Skipping {step}")
+                continue
+            t0 = time.perf_counter()
+            getattr(self, f"_{step.kind}")(step)
+            step.elapsed_ms = (time.perf_counter() - t0) * 1000
+            log.success(f"{self}: {step}")
+        return self.steps
+
+    def _table(self, name: str) -> Table:
+        return next(t for t in self.tables if t.name == name)
+
+    def _create_table(self, step: MigrationStep):
+        self._table(step.table).create(self.engine, checkfirst=True)
+
+    def _add_column(self, step: MigrationStep):
+        col = self._table(step.table).columns[step.detail.split(" ")[0]]
+        spec = f'"{col.name}" {self._type(col)}'
+        default = self._default(col)
+        if default is not None: spec += f" DEFAULT {default}"
+        if not col.nullable: spec += " NOT NULL"
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f'ALTER TABLE "{step.table}" ADD COLUMN {spec}')
+
+    def _create_index(self, step: MigrationStep):
+        ix = next(ix for ix in self._table(step.table).indexes if ix.name == step.detail)
+        ix.create(self.engine, checkfirst=True)
+
+    def _drop_index(self, step: MigrationStep):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{step.detail}"')
+
+    def _rebuild(self, step: MigrationStep):
+        table = self._table(step.table)
+        name, shadow, changes = table.name, f"_migrate_{table.name}", f"_migrate_{table.name}_changes"
+        raw, conn, level = self._raw()
+        try:
+            live = self._columns(conn, name)
+            cols = [c.name for c in table.columns]
+            select = ", ".join(f'"{c}"' if c in live else f"{self._default(table.columns[c]) or 'NULL'}" for c in cols)
+            insert = f'INSERT INTO "{shadow}" (rowid, {", ".join(chr(34) + c + chr(34) for c in cols)}) SELECT rowid, {select} FROM "{name}"'
+            triggers = [sql for (sql,) in conn.execute("SELECT sql FROM sqlite_master WHERE type='trigger' AND tbl_name=? AND name NOT LIKE '_migrate_%'", (name,))]
+
+            # 1. shadow table (no indexes yet: bulk copy is faster without them) + change capture
+            conn.execute(f'DROP TABLE IF EXISTS "{shadow}"')
+            conn.execute(f'DROP TABLE IF EXISTS "{changes}"')
+            scratch = MetaData()  # every model table, so foreign keys in the shadow DDL resolve
+            for t in self.tables: t.to_metadata(scratch)
+            ddl = str(CreateTable(table.to_metadata(scratch, name=shadow)).compile(dialect=self.engine.dialect))
+            conn.execute(ddl)
+            conn.execute(f'CREATE TABLE "{changes}" (rid INTEGER PRIMARY KEY)')
+            for event, ref in (("INSERT", "NEW"), ("UPDATE", "OLD"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                conn.execute(f'CREATE TRIGGER "_migrate_{name}_{event.lower()}_{ref.lower()}" AFTER {event} ON "{name}" '
+                             f'BEGIN INSERT OR IGNORE INTO "{changes}" (rid) VALUES ({ref}.rowid); END')
+
+            # 2. copy in short batches; the old table stays readable and writable between them
+            last = conn.execute(f'SELECT COALESCE(MIN(rowid), 0) - 1 FROM "{name}"').fetchone()[0]
+            while True:
+                conn.execute("BEGIN")
+                n = conn.execute(f"{insert} WHERE rowid > ? ORDER BY rowid LIMIT ?", (last, self.batch_size)).rowcount
+                if n > 0: last = conn.execute(f'SELECT MAX(rowid) FROM "{shadow}"').fetchone()[0]
+                conn.execute("COMMIT")
+                step.batches += 1
+                step.rows += max(n, 0)
+                if n < self.batch_size: break
+
+            # 3. replay captured changes and swap, in one short write transaction
+            fk = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+            conn.execute("PRAGMA foreign_keys=OFF")  # no-op inside a transaction, so set it first
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(f'DELETE FROM "{shadow}" WHERE rowid IN (SELECT rid FROM "{changes}")')
+                    conn.execute(f'{insert} WHERE rowid IN (SELECT rid FROM "{changes}")')
+                    conn.execute(f'DROP TABLE "{name}"')  # takes its triggers and indexes along
+                    conn.execute(f'ALTER TABLE "{shadow}" RENAME TO "{name}"')
+                    conn.execute(f'DROP TABLE "{changes}"')
+                    for sql in triggers: conn.execute(sql)
+                    violations = conn.execute(f'PRAGMA foreign_key_check("{name}")').fetchall()
+                    if fk and violations: raise RuntimeError(f"{self}: Rebuilt {name} violates foreign keys: {violations[:5]}")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.execute(f"PRAGMA foreign_keys={fk}")
+        except Exception:
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            for sql in (f'DROP TABLE IF EXISTS "{shadow}"', f'DROP TABLE IF EXISTS "{changes}"'):
+                conn.execute(sql)
+            for trigger in ("insert_new", "update_old", "update_new", "delete_old"):
+                conn.execute(f'DROP TRIGGER IF EXISTS "_migrate_{name}_{trigger}"')
+            raise
+        finally:
+            conn.isolation_level = level
+            raw.close()
+
+    def report(self) -> str:
+        total = sum(s.elapsed_ms for s in self.steps)
+        lines = [f"{self}: {len(self.steps)} step(s) in {total:.1f}ms"]
+        for step in self.steps:
+            lines.append(f" - {step}")
+            lines.extend(f"     {r}" for r in step.reasons)
+        return "\n".join(lines)
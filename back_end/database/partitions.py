@@ -0,0 +1,339 @@
+import heapq
+import shutil
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cached_property
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from loguru import logger as log
+from sqlmodel import SQLModel
+
+from back_end.database.registry import table_models
+from back_end.database.sqlite_manager import Database
+
+PERIODS = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+
+@dataclass
+class PartitionedDatabase:
+    """
+    Time-partitioned storage: one SQLite file per day or month under `<dir>/<name>-partitions/`.
+
+    Writes land in the partition of the row's `key` column (now when unset), reads fan out across
+    partitions newest first, and retention drops or archives whole files instead of running DELETEs.
+    Every partition is a plain Database built from the same models, so `models.<name>` exposes the
+    usual scrud operations. Integer primary keys are per partition; lookups by id return the newest match.
+    """
+    name: str
+    dir: Path
+    input_model: SQLModel | list[SQLModel]
+    period: str = "month"
+    key: str = "timestamp"
+    retain: int | None = None
+    """Partitions to keep; older ones are dropped whenever a new partition is opened. None keeps everything."""
+    archive_dir: Path | None = None
+    """Move expired partitions here instead of deleting them."""
+    options: dict = field(default_factory=dict)
+    """Extra Database(...) fields for every partition (profile, read_cache, query_profiler, ...)."""
+    project: Any = None
+
+    def __post_init__(self):
+        if self.period not in PERIODS: raise ValueError(f"[PartitionedDatabase] Unknown period: {self.period!r}")
+        self.root = Path(self.dir) / f"{self.name}-partitions"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.open: dict[str, Database] = {}
+        self.parked: list = []  # async engines of partitions retired from sync code, disposed by dispose()
+        self.manager = self  # same shape as Database: .manager.models
+
+    def __repr__(self):
+        return f"[{self.name.title()}.PartitionedDatabase period={self.period}]"
+
+    # --- partitions ---
+    def partition_key(self, when: datetime | None = None) -> str:
+        return (when or datetime.now(timezone.utc)).strftime(PERIODS[self.period])
+
+    def keys(self) -> list[str]:
+        """Every partition on disk, oldest first"""
+        prefix = f"{self.name}-"
+        return sorted(p.name[len(prefix):] for p in self.root.iterdir() if p.is_dir() and p.name.startswith(prefix))
+
+    def partition(self, key: str) -> Database:
+        with self.lock:
+            db = self.open.get(key)
+            if db is None:
+                keys = self.keys()
+                fresh = key not in keys
+                part_dir = self.root / f"{self.name}-{key}"
+                part_dir.mkdir(exist_ok=True)
+                db = self.open[key] = Database(name=f"{self.name}-{key}", dir=part_dir, project=self.project,
+                                               input_model=self.input_model, **self.options)
+                if fresh:
+                    log.info(f"{self}: Opened partition {key}")
+                    if self.retain and (not keys or key > keys[-1]): self._retire()  # a new period rolled over
+            return db
+
+    def _retire(self) -> list[str]:
+        """
+        Retention from sync code (partition() opening a new period): the expired partitions' sync engines are
+        disposed here; their async engines belong to some event loop, so they are parked for dispose() to close there.
+        """
+        keys = self.keys()
+        if len(keys) <= self.retain: return []
+        dropped = []
+        for key in keys[:-self.retain]:
+            with self.lock:
+                db = self.open.pop(key, None)
+            if db is not None:
+                engines = db.manager.__dict__
+                self.parked.extend(engines.pop(name) for name in ("async_read_engine", "async_engine") if name in engines)
+                for name in ("read_engine", "engine"):
+                    if name in engines: engines.pop(name).dispose()
+            if self._remove(key): dropped.append(key)
+        return dropped
+
+    def partitions(self, since: datetime | None = None, until: datetime | None = None, newest_first: bool = True) -> list[Database]:
+        lo = self.partition_key(since) if since else None
+        hi = self.partition_key(until) if until else None
+        keys = [k for k in self.keys() if (lo is None or k >= lo) and (hi is None or k <= hi)]
+        return [self.partition(k) for k in (reversed(keys) if newest_first else keys)]
+
+    # --- retention ---
+    async def drop(self, key: str) -> Path | None:
+        """Remove (or archive) one partition as a whole: dispose its engines, sync and async, then move or delete its directory"""
+        with self.lock:
+            db = self.open.pop(key, None)
+        if db is not None: await db.manager.dispose()
+        return self._remove(key)
+
+    def _remove(self, key: str) -> Path | None:
+        """Move or delete the directory of a partition whose engines are closed"""
+        with self.lock:
+            part_dir = self.root / f"{self.name}-{key}"
+            if not part_dir.exists(): return None
+            if self.archive_dir:
+                Path(self.archive_dir).mkdir(parents=True, exist_ok=True)
+                target = Path(shutil.move(str(part_dir), str(Path(self.archive_dir) / part_dir.name)))
+                log.warning(f"{self}: Archived partition {key} to {target}")
+                return target
+            shutil.rmtree(part_dir)
+            log.warning(f"{self}: Dropped partition {key}")
+            return part_dir
+
+    async def drop_before(self, when: datetime) -> list[str]:
+        cutoff = self.partition_key(when)
+        return [k for k in self.keys() if k < cutoff and await self.drop(k)]
+
+    async def enforce_retention(self) -> list[str]:
+        keys = self.keys()
+        if not self.retain or len(keys) <= self.retain: return []
+        return [k for k in keys[:-self.retain] if await self.drop(k)]
+
+    # --- scrud across partitions ---
+    @cached_property
+    def models(self):
+        import types
+
+        models = self.input_model if isinstance(self.input_model, list) else [self.input_model]
+        return types.SimpleNamespace(**{name: PartitionedView(self, name, model)
+                                        for name, model in table_models({m.__name__: m for m in models}).items()})
+
+    async def acheckpoint(self, mode: str = "FULL"):
+        for db in list(self.open.values()):
+            await db.manager.acheckpoint(mode)
+
+    async def dispose(self):
+        for db in list(self.open.values()):
+            await db.manager.dispose()
+        parked, self.parked = self.parked, []
+        for engine in parked: await engine.dispose()
+
+class PartitionedView:
+    """The scrud surface of one model spread over a PartitionedDatabase"""
+
+    def __init__(self, pdb: PartitionedDatabase, name: str, model: type[SQLModel]):
+        self.pdb = pdb
+        self.name = name
+        self.model = model
+
+    def __repr__(self):
+        return f"[{self.model.__name__} @ {self.pdb}]"
+
+    def __getattr__(self, name):
+        if name == "model": raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def __call__(self, *args, **kwargs):
+        return self.model(*args, **kwargs)
+
+    def _view(self, key: str):
+        return getattr(self.pdb.partition(key).manager.models, self.name)
+
+    def _views(self, since=None, until=None, newest_first=True):
+        return [getattr(db.manager.models, self.name) for db in self.pdb.partitions(since, until, newest_first)]
+
+    def _when(self, row) -> datetime | None:
+        value = row.get(self.pdb.key) if isinstance(row, dict) else getattr(row, self.pdb.key, None)
+        if isinstance(value, str):
+            try: return datetime.fromisoformat(value)
+            except ValueError: return None
+        return value if isinstance(value, datetime) else None
+
+    def _route(self, data) -> dict[str, list]:
+        rows = data if isinstance(data, list) else [data]
+        groups = {}
+        for row in rows:
+            groups.setdefault(self.pdb.partition_key(self._when(row)), []).append(row)
+        return groups
+
+    # --- create: each row goes to the partition of its timestamp ---
+    def c(self, data, session=None):
+        if not isinstance(data, list): return self._view(next(iter(self._route(data)))).c(data, session=session)
+        return [obj for key, rows in self._route(data).items() for obj in self._view(key).c(rows, session=session)]
+
+    def c_bulk(self, data: list, **kw):
+        return _combine([self._view(key).c_bulk(rows, **kw) for key, rows in self._route(data).items()])
+
+    async def ac(self, data, session=None):
+        if not isinstance(data, list): return await self._view(next(iter(self._route(data)))).ac(data, session=session)
+        return [obj for key, rows in self._route(data).items() for obj in await self._view(key).ac(rows, session=session)]
+
+    async def ac_bulk(self, data: list, **kw):
+        return _combine([await self._view(key).ac_bulk(rows, **kw) for key, rows in self._route(data).items()])
+
+    # --- read: newest partition first; the first hit wins ---
+    def r(self, data, since=None, until=None):
+        if not isinstance(data, list):
+            for view in self._views(since, until):
+                row = view.r(data)
+                if row is not None: return row
+            return None
+        lookup = _Lookup(data)
+        for view in self._views(since, until):
+            if lookup.done: break
+            lookup.feed(view.r(lookup.pending()))
+        return lookup.result()
+
+    async def ar(self, data, since=None, until=None):
+        if not isinstance(data, list):
+            for view in self._views(since, until):
+                row = await view.ar(data)
+                if row is not None: return row
+            return None
+        lookup = _Lookup(data)
+        for view in self._views(since, until):
+            if lookup.done: break
+            lookup.feed(await view.ar(lookup.pending()))
+        return lookup.result()
+
+    def _merged(self, parts: list[list], order_by: str | None, limit: int | None, offset: int | None = None, tuples: bool = False):
+        if order_by is None:
+            rows = (row for part in parts for row in part)
+        else:
+            col = order_by.lstrip("-")
+            if tuples:
+                i = list(self.model.__table__.columns.keys()).index(col)
+                value = lambda r: r[i]
+            else:
+                value = lambda r: getattr(r, col)
+            key = lambda r: (value(r) is not None, value(r))  # NULLs first ascending, last descending, as scrud sorts them
+            rows = heapq.merge(*parts, key=key, reverse=order_by.startswith("-"))
+        start = offset or 0
+        return list(islice(rows, start, start + limit if limit is not None else None))
+
+    def r_all(self, match: dict = None, order_by: str = None, limit: int = None, offset: int = None, since=None, until=None, **kw):
+        """Rows from every partition, oldest partition first (or merged by order_by); offset applies to the merged rows"""
+        per_part = (offset or 0) + limit if limit is not None else None
+        parts = [v.r_all(match, order_by=order_by, limit=per_part, **kw) for v in self._views(since, until, newest_first=False)]
+        return self._merged(parts, order_by, limit, offset, kw.get("tuples", False))
+
+    async def ar_all(self, match: dict = None, order_by: str = None, limit: int = None, offset: int = None, since=None, until=None, **kw):
+        per_part = (offset or 0) + limit if limit is not None else None
+        parts = [await v.ar_all(match, order_by=order_by, limit=per_part, **kw) for v in self._views(since, until, newest_first=False)]
+        return self._merged(parts, order_by, limit, offset, kw.get("tuples", False))
+
+    def r_stream(self, match: dict = None, since=None, until=None, **kw):
+        """Streams partition after partition, oldest first, each keyset-paginated by scrud"""
+        for view in self._views(since, until, newest_first=False):
+            yield from view.r_stream(match, **kw)
+
+    async def ar_stream(self, match: dict = None, since=None, until=None, **kw):
+        for view in self._views(since, until, newest_first=False):
+            async for row in view.ar_stream(match, **kw):
+                yield row
+
+    # --- update / delete: one set-based statement per partition, applied to every partition ---
+    def u(self, match, changes: dict, since=None, until=None, all_rows: bool = False):
+        """Update the matching rows in every partition; returns the newest partition's first updated row"""
+        return _first([v.u(match, changes, all_rows=all_rows) for v in self._views(since, until)])
+
+    def u_many(self, matches: list, changes: dict, since=None, until=None):
+        return _combine([v.u_many(matches, changes) for v in self._views(since, until)])
+
+    def d(self, data, since=None, until=None, all_rows: bool = False):
+        return _first([v.d(data, all_rows=all_rows) for v in self._views(since, until)])
+
+    def d_many(self, matches: list, since=None, until=None):
+        return _combine([v.d_many(matches) for v in self._views(since, until)])
+
+    async def au(self, match, changes: dict, since=None, until=None, all_rows: bool = False):
+        return _first([await v.au(match, changes, all_rows=all_rows) for v in self._views(since, until)])
+
+    async def au_many(self, matches: list, changes: dict, since=None, until=None):
+        return _combine([await v.au_many(matches, changes) for v in self._views(since, until)])
+
+    async def ad(self, data, since=None, until=None, all_rows: bool = False):
+        return _first([await v.ad(data, all_rows=all_rows) for v in self._views(since, until)])
+
+    async def ad_many(self, matches: list, since=None, until=None):
+        return _combine([await v.ad_many(matches) for v in self._views(since, until)])
+
+    def d_before(self, column: str, value, since=None, until=None) -> int:
+        return sum(v.d_before(column, value) for v in self._views(since, until))
+
+    async def ad_before(self, column: str, value, since=None, until=None) -> int:
+        return sum([await v.ad_before(column, value) for v in self._views(since, until)])
+
+    def cache_info(self) -> dict:
+        return {db.name: getattr(db.manager.models, self.name).cache_info() for db in self.pdb.open.values()}
+
+    def cache_clear(self):
+        for db in self.pdb.open.values(): getattr(db.manager.models, self.name).cache_clear()
+
+class _Lookup:
+    """A list read spread over partitions: filter lists keep their positions (None until found), id lists return what was found"""
+
+    def __init__(self, data: list):
+        self.filters = all(isinstance(i, dict) for i in data)
+        self.data = data if self.filters else list(dict.fromkeys(str(i) for i in data))
+        self.found: dict[int, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        return len(self.found) == len(self.data)
+
+    def pending(self) -> list:
+        return [d for i, d in enumerate(self.data) if i not in self.found]
+
+    def feed(self, rows: list):
+        missing = [i for i in range(len(self.data)) if i not in self.found]
+        if self.filters:
+            self.found.update((i, row) for i, row in zip(missing, rows) if row is not None)
+            return
+        by_id = {str(row.id): row for row in rows}
+        self.found.update((i, by_id[self.data[i]]) for i in missing if self.data[i] in by_id)
+
+    def result(self) -> list:
+        if self.filters: return [self.found.get(i) for i in range(len(self.data))]
+        return [self.found[i] for i in sorted(self.found)]
+
+def _first(results: list):
+    """The first row any partition returned (results are newest partition first)"""
+    return next((row for row in results if row), None)
+
+def _combine(results: list):
+    """RETURNING rows concatenate; rowcounts (no RETURNING support) add up"""
+    if all(isinstance(r, int) for r in results): return sum(results)
+    return [row for r in results if isinstance(r, list) for row in r]
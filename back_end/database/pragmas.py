@@ -0,0 +1,72 @@
+from dataclasses import dataclass, asdict
+
+@dataclass
+class SQLiteProfile:
+    """
+    Connection-level tuning applied to every SQLite connection on connect.
+
+    Values of None leave SQLite's own default in place, so `SQLiteProfile.stock()` reproduces
+    the plain `create_engine(f"sqlite:///{path}")` behaviour.
+    """
+    journal_mode: str | None = "WAL"
+    synchronous: str | None = "NORMAL"
+    mmap_size: int | None = 256 * 1024 * 1024
+    cache_size: int | None = -64_000  # negative = KiB, so ~64MB of page cache per connection
+    temp_store: str | None = "MEMORY"
+    busy_timeout: int | None = 5_000  # ms
+    foreign_keys: bool | None = None
+    """True enforces FOREIGN KEY constraints (SQLite leaves them off); opt in, existing data may hold dangling references."""
+    readers: int = 4
+    """Size of the read-only connection pool; 0 sends reads through the writer."""
+    split_rw: bool = True
+    """Route writes through a single pooled connection and reads through `readers` query_only connections."""
+
+    @classmethod
+    def tuned(cls) -> "SQLiteProfile":
+        return cls()
+
+    @classmethod
+    def stock(cls) -> "SQLiteProfile":
+        return cls(journal_mode=None, synchronous=None, mmap_size=None, cache_size=None,
+                   temp_store=None, busy_timeout=None, foreign_keys=None, readers=0, split_rw=False)
+
+    @classmethod
+    def resolve(cls, profile: "SQLiteProfile | str | None") -> "SQLiteProfile":
+        if isinstance(profile, cls): return profile
+        if profile is None or profile == "stock": return cls.stock()
+        if profile == "tuned": return cls.tuned()
+        raise ValueError(f"[SQLiteProfile] Unknown profile: {profile!r}")
+
+    @property
+    def pragmas(self) -> dict:
+        out = {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store,
+            "busy_timeout": self.busy_timeout,
+            "foreign_keys": None if self.foreign_keys is None else int(self.foreign_keys),
+        }
+        return {k: v for k, v in out.items() if v is not None}
+
+    def apply(self, dbapi_conn, read_only: bool = False):
+        """Run the pragmas on a raw DB-API connection (hooked to the engine's `connect` event)"""
+        cur = dbapi_conn.cursor()
+        try:
+            for k, v in self.pragmas.items():
+                cur.execute(f"PRAGMA {k}={v}")
+            if read_only: cur.execute("PRAGMA query_only=1")
+        finally:
+            cur.close()
+
+    def connect_args(self) -> dict:
+        args = {"check_same_thread": False}
+        if self.busy_timeout is not None: args["timeout"] = self.busy_timeout / 1000
+        return args
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def __repr__(self):
+        return f"[SQLiteProfile {self.pragmas} readers={self.readers} split_rw={self.split_rw}]"
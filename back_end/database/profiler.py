@@ -0,0 +1,212 @@
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from loguru import logger as log
+from sqlalchemy import Engine, event
+
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+EXPLAINABLE = ("select", "insert", "update", "delete", "with", "replace")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_LISTS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_SPACE = re.compile(r"\s+")
+
+def normalize(sql: str) -> str:
+    """Statement shape: literals become ?, IN / VALUES lists collapse to (?...), whitespace folds"""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _SPACE.sub(" ", sql).strip()
+    return _LISTS.sub("(?...)", sql)
+
+@dataclass
+class Histogram:
+    counts: list = field(default_factory=lambda: [0] * len(BUCKETS_MS))
+
+    def add(self, ms: float):
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile"""
+        total = sum(self.counts)
+        if not total: return 0.0
+        target, seen = p / 100 * total, 0
+        for bound, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= target: return bound
+        return BUCKETS_MS[-1]
+
+    def to_dict(self) -> dict:
+        return {f"<={b}ms" if b != float("inf") else f">{BUCKETS_MS[-2]}ms": n for b, n in zip(BUCKETS_MS, self.counts) if n}
+
+@dataclass
+class StatementStats:
+    sql: str
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    histogram: Histogram = field(default_factory=Histogram)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {"sql": self.sql, "count": self.count, "errors": self.errors, "total_ms": self.total_ms,
+                "avg_ms": self.avg_ms, "max_ms": self.max_ms, "p50_ms": self.histogram.percentile(50),
+                "p95_ms": self.histogram.percentile(95), "p99_ms": self.histogram.percentile(99),
+                "rows": self.rows, "histogram": self.histogram.to_dict()}
+
+@dataclass
+class SlowQuery:
+    sql: str
+    params: str
+    elapsed_ms: float
+    engine: str
+    at: str
+    plan: list
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+@dataclass
+class QueryProfiler:
+    """
+    Cursor-level instrumentation for the engines of one DatabaseManager.
+
+    Every statement is timed between before/after_cursor_execute and folded into a latency histogram
+    keyed by its normalized SQL. Statements slower than slow_ms land in a bounded slow-query log,
+    each with its EXPLAIN QUERY PLAN (captured once per statement shape). Transactions are counted
+    from engine begin/commit/rollback events, sessions by the manager that opens them.
+    """
+    slow_ms: float = 50.0
+    max_slow: int = 200
+    explain: bool = True
+    max_statements: int = 2_000
+
+    def __post_init__(self):
+        self.lock = threading.Lock()
+        self.statements: dict[str, StatementStats] = {}
+        self.slow: deque = deque(maxlen=self.max_slow)
+        self.plans: dict[str, list] = {}
+        self.transactions = {"begin": 0, "commit": 0, "rollback": 0}
+        self.sessions: dict[str, int] = {}
+        self.started_at = time.time()
+
+    def __repr__(self):
+        return f"[QueryProfiler statements={len(self.statements)} slow={len(self.slow)}]"
+
+    # --- hooks ---
+    def attach(self, engine: Engine, label: str):
+        """Listen on a sync Engine (pass AsyncEngine.sync_engine for async ones)"""
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", lambda *a: self._after(label, *a))
+        event.listen(engine, "handle_error", self._error)
+        for name in self.transactions:
+            event.listen(engine, name, lambda *_, name=name: self._transaction(name))
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, label, conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("query_start")
+        if not stack: return
+        elapsed = (time.perf_counter() - stack.pop()) * 1000
+        key = normalize(statement)
+        with self.lock:
+            st = self.statements.get(key)
+            if st is None:
+                if len(self.statements) >= self.max_statements: key = "<other>"
+                st = self.statements.setdefault(key, StatementStats(key))
+            st.count += 1
+            st.total_ms += elapsed
+            st.max_ms = max(st.max_ms, elapsed)
+            st.rows += max(cursor.rowcount, 0)
+            st.histogram.add(elapsed)
+        if elapsed >= self.slow_ms: self._slow(label, cursor, statement, parameters, executemany, key, elapsed)
+
+    def _error(self, context):
+        stack = context.connection.info.get("query_start") if context.connection is not None else None
+        if stack: stack.pop()
+        key = normalize(context.statement or "")
+        with self.lock:
+            self.statements.setdefault(key, StatementStats(key)).errors += 1
+
+    def _transaction(self, name: str):
+        with self.lock:
+            self.transactions[name] += 1
+
+    def session_opened(self, kind: str):
+        with self.lock:
+            self.sessions[kind] = self.sessions.get(kind, 0) + 1
+
+    def _slow(self, label, cursor, statement, parameters, executemany, key, elapsed):
+        plan = self.plans.get(key)
+        if plan is None and self.explain and statement.lstrip()[:7].lower().startswith(EXPLAINABLE):
+            plan = self.plans[key] = self._plan(cursor, statement, parameters[0] if executemany and parameters else parameters)
+        entry = SlowQuery(statement, repr(parameters)[:500], elapsed, label, datetime.now().isoformat(), plan or [])
+        with self.lock:
+            self.slow.append(entry)
+        log.warning(f"{self}: Slow query on {label} ({elapsed:.1f}ms): {key[:200]}")
+
+    @staticmethod
+    def _plan(cursor, statement: str, parameters) -> list:
+        """EXPLAIN QUERY PLAN on the same DB-API connection, in a fresh cursor so the caller's results are untouched"""
+        try:
+            cur = cursor.connection.cursor()
+            try:
+                cur.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+                return [row[-1] for row in cur.fetchall()]
+            finally:
+                cur.close()
+        except Exception as e:
+            return [f"<explain failed: {type(e).__name__}: {e}>"]
+
+    # --- surface ---
+    def top(self, n: int = 10, by: str = "total_ms") -> list[dict]:
+        with self.lock:
+            ordered = sorted(self.statements.values(), key=lambda s: getattr(s, by), reverse=True)[:n]
+            return [s.to_dict() for s in ordered]
+
+    def slow_queries(self) -> list[dict]:
+        with self.lock:
+            return [q.to_dict() for q in self.slow]
+
+    def stats(self) -> dict:
+        with self.lock:
+            count = sum(s.count for s in self.statements.values())
+            total = sum(s.total_ms for s in self.statements.values())
+            out = {"uptime_s": time.time() - self.started_at, "statements": count, "total_ms": total,
+                   "distinct": len(self.statements), "slow": len(self.slow),
+                   "transactions": dict(self.transactions), "sessions": dict(self.sessions)}
+        out["top"] = self.top()
+        return out
+
+    def reset(self):
+        with self.lock:
+            self.statements.clear()
+            self.slow.clear()
+            self.plans.clear()
+            self.transactions = dict.fromkeys(self.transactions, 0)
+            self.sessions.clear()
+            self.started_at = time.time()
+
+    def report(self, n: int = 10) -> str:
+        st = self.stats()
+        lines = [f"{self}: {st['statements']} statements, {st['total_ms']:.1f}ms total, "
+                 f"transactions={st['transactions']} sessions={st['sessions']}"]
+        for s in self.top(n):
+            lines.append(f" - {s['count']:>7}x avg={s['avg_ms']:.2f}ms p95<={s['p95_ms']}ms max={s['max_ms']:.2f}ms  {s['sql'][:160]}")
+        for q in list(self.slow)[-n:]:
+            lines.append(f" ! {q.elapsed_ms:.1f}ms on {q.engine} at {q.at}: {_SPACE.sub(' ', q.sql)[:160]}")
+            lines.extend(f"     {step}" for step in q.plan)
+        return "\n".join(lines)
@@ -0,0 +1,189 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+MISSING = object()
+
+def norm(v):
+    """ids come in as str, int or UUID; compare them all as str"""
+    return str(v) if isinstance(v, (int, uuid.UUID)) and not isinstance(v, bool) else v
+
+def filter_key(data: dict):
+    """Normalized, hashable key for a filter dict; None when a value can't be hashed (e.g. JSON)"""
+    try:
+        key = tuple(sorted((k, norm(v)) for k, v in data.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+def _get(row, k):
+    return row.get(k) if isinstance(row, dict) else getattr(row, k, None)
+
+def matches(key: tuple, row) -> bool:
+    for k, v in key:
+        got = _get(row, k)
+        if got is None and isinstance(row, dict): continue  # assigned by the database (autoincrement, server default): can't rule it out
+        if norm(got) != v: return False
+    return True
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return dict(vars(self), hit_rate=self.hit_rate)
+
+class ReadCache:
+    """
+    Identity-map read-through cache for one scrud model.
+
+    Rows are held once, keyed by primary key; filter dicts map to the primary key of the row
+    they resolved to (or to None for a miss). LRU-bounded by maxsize rows, TTL-bounded per entry,
+    invalidated precisely by the rows scrud writes, and safe to share across threads.
+
+    Cached rows are shared, detached objects: treat what `.r()` returns as read-only.
+    """
+
+    def __init__(self, model: str, pk: str = "id", maxsize: int = 1024, ttl: float | None = 30.0):
+        self.model = model
+        self.pk = pk
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.rows: OrderedDict = OrderedDict()  # pk -> (row, expires)
+        self.filters: OrderedDict = OrderedDict()  # filter key -> (pk | None, expires)
+        self.lock = threading.RLock()
+        self.stats = CacheStats()
+        self.generation = 0  # bumped on every invalidation, so a read that raced a write doesn't cache stale rows
+
+    def __repr__(self):
+        return f"[{self.model}.ReadCache rows={len(self.rows)} filters={len(self.filters)}]"
+
+    @classmethod
+    def configure(cls, model, default=None) -> "ReadCache | None":
+        """Per-model `__read_cache__` wins over the Database-wide default; True means default sizing"""
+        cfg = getattr(model, "__read_cache__", default)
+        if not cfg: return None
+        cfg = {} if cfg is True else dict(cfg)
+        pk = next(iter(model.__table__.primary_key.columns)).key
+        return cls(model.__name__, pk=pk, **cfg)
+
+    def _expires(self) -> float | None:
+        return time.monotonic() + self.ttl if self.ttl else None
+
+    @staticmethod
+    def _live(expires) -> bool:
+        return expires is None or expires > time.monotonic()
+
+    # --- lookups ---
+    def get_pk(self, pk):
+        with self.lock:
+            hit = self.rows.get(norm(pk))
+            if hit is not None:
+                row, expires = hit
+                if self._live(expires):
+                    self.rows.move_to_end(norm(pk))
+                    self.stats.hits += 1
+                    return row
+                del self.rows[norm(pk)]
+                self.stats.expired += 1
+            self.stats.misses += 1
+            return MISSING
+
+    def get_filter(self, data: dict):
+        key = filter_key(data)
+        if key is None: return MISSING
+        with self.lock:
+            hit = self.filters.get(key)
+            if hit is not None:
+                pk, expires = hit
+                if self._live(expires):
+                    if pk is None:
+                        self.filters.move_to_end(key)
+                        self.stats.hits += 1
+                        return None
+                    row = self.rows.get(pk)
+                    if row is not None and self._live(row[1]):
+                        self.filters.move_to_end(key)
+                        self.rows.move_to_end(pk)
+                        self.stats.hits += 1
+                        return row[0]
+                del self.filters[key]
+                self.stats.expired += 1
+            self.stats.misses += 1
+            return MISSING
+
+    # --- fills ---
+    def put_row(self, row, generation: int = None):
+        if row is None: return
+        with self.lock:
+            if generation is not None and generation != self.generation: return
+            pk = norm(getattr(row, self.pk))
+            self.rows[pk] = (row, self._expires())
+            self.rows.move_to_end(pk)
+            self._evict()
+
+    def put_filter(self, data: dict, row, generation: int = None):
+        key = filter_key(data)
+        if key is None: return
+        with self.lock:
+            if generation is not None and generation != self.generation: return
+            self.put_row(row)
+            self.filters[key] = (None if row is None else norm(getattr(row, self.pk)), self._expires())
+            self._evict()
+
+    def _evict(self):
+        while len(self.rows) > self.maxsize:
+            pk, _ = self.rows.popitem(last=False)
+            self.stats.evictions += 1
+        while len(self.filters) > self.maxsize:
+            self.filters.popitem(last=False)
+            self.stats.evictions += 1
+
+    # --- invalidation ---
+    def on_insert(self, rows, keep: bool = True):
+        """New rows can change what a cached filter resolves to (a miss or the first match); drop those filters"""
+        with self.lock:
+            self.generation += 1
+            self._drop_filters(lambda key, pk: any(matches(key, row) for row in rows))
+            for row in rows:
+                if keep and not isinstance(row, dict): self.put_row(row)
+
+    def on_change(self, rows):
+        """Updated or deleted rows (from RETURNING): drop them and every filter that resolved to or now matches them"""
+        if not isinstance(rows, list):
+            self.clear()  # no RETURNING, so we don't know which rows changed
+            return
+        with self.lock:
+            self.generation += 1
+            pks = {norm(getattr(row, self.pk)) for row in rows}
+            for pk in pks:
+                if self.rows.pop(pk, None) is not None: self.stats.invalidations += 1
+            self._drop_filters(lambda key, pk: pk in pks or any(matches(key, row) for row in rows))
+
+    def _drop_filters(self, stale):
+        for key in [k for k, (pk, _) in self.filters.items() if stale(k, pk)]:
+            del self.filters[key]
+            self.stats.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.stats.invalidations += len(self.rows) + len(self.filters)
+            self.rows.clear()
+            self.filters.clear()
+
+    def info(self) -> dict:
+        with self.lock:
+            return dict(self.stats.to_dict(), rows=len(self.rows), filters=len(self.filters), maxsize=self.maxsize, ttl=self.ttl)
@@ -0,0 +1,155 @@
+import asyncio
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger as log
+
+from back_end.database.serialization import dumps, loads
+
+RAW, ZLIB = b"\x00", b"\x01"
+
+@dataclass
+class RedisStats:
+    reads: int = 0
+    hits: int = 0
+    writes: int = 0
+    deletes: int = 0
+    pipelines: int = 0
+    """round trips that carried batched writes"""
+    compressed: int = 0
+    bytes_written: int = 0
+
+class RedisManager:
+    """
+    Key-value storage on Redis for one namespace: async, pooled, pipelined, with native TTL.
+
+    Values are compact JSON (orjson when installed) or bytes passed as is; values of compress_min bytes or more
+    are zlib-compressed. Every stored value starts with a one-byte marker (RAW or ZLIB), so any payload reads
+    back, whatever its first byte. Concurrent create() calls made
+    in the same event-loop turn are sent as one non-transactional pipeline of SET ... EX commands; create_many()
+    pipelines an explicit batch. The redis.asyncio client and its connection pool are made on first use and
+    released by close(); a client= passed in (another manager's, or fakeredis.aioredis.FakeRedis() in tests)
+    is used as is and left open.
+    """
+
+    def __init__(self, namespace: str, name: str = "Redis", url: str = "redis://localhost:6379/0", max_connections: int = 32,
+                 socket_timeout: float | None = 5.0, compress_min: int | None = 4096, max_batch: int = 256, client: Any = None):
+        self.namespace = namespace
+        self.name = name
+        self.url = url
+        self.max_connections = max_connections
+        self.socket_timeout = socket_timeout
+        self.compress_min = compress_min
+        self.max_batch = max_batch
+        self._client = client
+        self.owns_client = client is None
+        self.pending: list[tuple[str, bytes, int | None, asyncio.Future]] = []
+        self.flushing: asyncio.Task | None = None
+        self.stats = RedisStats()
+
+    def __repr__(self):
+        return f"[{self.name}.RedisManager {self.namespace}]"
+
+    @property
+    def client(self):
+        if self._client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError as e:
+                raise ImportError(f"{self}: The Redis backend needs redis: pip install redis") from e
+            pool = aioredis.ConnectionPool.from_url(self.url, max_connections=self.max_connections, socket_timeout=self.socket_timeout)
+            self._client = aioredis.Redis(connection_pool=pool)
+            log.debug(f"{self}: Connected to {self.url} (max_connections={self.max_connections})")
+        return self._client
+
+    def key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def encode(self, value) -> bytes:
+        data = value if isinstance(value, (bytes, bytearray)) else dumps(value)
+        if self.compress_min is not None and len(data) >= self.compress_min:
+            self.stats.compressed += 1
+            return ZLIB + zlib.compress(data, 1)
+        return RAW + bytes(data)
+
+    @staticmethod
+    def decode(data: bytes | None) -> bytes | None:
+        """Stored bytes back to the bytes given to create() (JSON for other values); parse with loads() or a from_bytes()"""
+        if data is None: return None
+        marker, payload = data[:1], data[1:]
+        if marker == ZLIB: return zlib.decompress(payload)
+        if marker == RAW: return payload
+        raise ValueError(f"[RedisManager] Unknown value marker {marker!r}")
+
+    async def create(self, key: str, value, ttl: int | None = None):
+        """SET key (expiring after ttl seconds); joins the pipeline of other create() calls in this loop turn"""
+        done = asyncio.get_running_loop().create_future()
+        self.pending.append((self.key(key), self.encode(value), ttl, done))
+        if len(self.pending) >= self.max_batch: await self.flush()
+        elif self.flushing is None: self.flushing = asyncio.get_running_loop().create_task(self.flush())
+        await done
+
+    async def create_many(self, items: list[tuple[str, Any, int | None]]):
+        """SET a batch of (key, value, ttl) in one pipelined round trip"""
+        await self._write([(self.key(k), self.encode(v), ttl) for k, v, ttl in items])
+
+    async def flush(self):
+        self.flushing = None
+        batch, self.pending = self.pending, []
+        if not batch: return
+        try:
+            await self._write([(k, data, ttl) for k, data, ttl, _ in batch])
+        except Exception as e:
+            for *_, done in batch:
+                if not done.done(): done.set_exception(e)
+            return
+        for *_, done in batch:
+            if not done.done(): done.set_result(None)
+
+    async def _write(self, items: list[tuple[str, bytes, int | None]]):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for k, data, ttl in items:
+                pipe.set(k, data, ex=max(1, int(ttl)) if ttl is not None else None)
+            await pipe.execute()
+        self.stats.pipelines += 1
+        self.stats.writes += len(items)
+        self.stats.bytes_written += sum(len(data) for _, data, _ in items)
+
+    async def read(self, key: str) -> bytes | None:
+        """JSON bytes stored under key, None when missing or expired"""
+        self.stats.reads += 1
+        data = self.decode(await self.client.get(self.key(key)))
+        if data is not None: self.stats.hits += 1
+        return data
+
+    async def read_many(self, keys: list[str]) -> list[bytes | None]:
+        self.stats.reads += len(keys)
+        if not keys: return []
+        out = [self.decode(d) for d in await self.client.mget([self.key(k) for k in keys])]
+        self.stats.hits += sum(d is not None for d in out)
+        return out
+
+    async def read_json(self, key: str):
+        data = await self.read(key)
+        return loads(data) if data is not None else None
+
+    async def delete(self, *keys: str) -> int:
+        if not keys: return 0
+        self.stats.deletes += len(keys)
+        return await self.client.delete(*(self.key(k) for k in keys))
+
+    async def ttl(self, key: str) -> int:
+        """Seconds to expiry; -1 without a TTL, -2 when missing"""
+        return await self.client.ttl(self.key(key))
+
+    def info(self) -> dict:
+        return dict(vars(self.stats), pending=len(self.pending), hit_rate=self.stats.hits / self.stats.reads if self.stats.reads else 0.0)
+
+    async def close(self):
+        """Send any batched writes, then release the connection pool"""
+        if self.pending: await self.flush()
+        if self._client is not None and self.owns_client:
+            await self._client.aclose()
+            self._client = None
+        log.debug(f"{self}: Closed, {self.info()}")
@@ -0,0 +1,85 @@
+import hashlib
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+from loguru import logger as log
+from sqlmodel import SQLModel
+
+def table_models(namespace: dict) -> dict:
+    """name.lower() -> class for every SQLModel table class in a module namespace"""
+    return {
+        name.lower(): obj
+        for name, obj in namespace.items()
+        if isinstance(obj, type)
+        and issubclass(obj, SQLModel)
+        and getattr(obj, "__table__", None) is not None  # not SQLModel itself or non-table models
+    }
+
+class ModelRegistry:
+    """
+    Process-wide cache of model modules and migrated schemas.
+
+    A `<name>-db-models.py` file is executed once per content hash, however many Databases point at it
+    (re-executing it would also redefine its tables on SQLModel's shared metadata). The stat() of each
+    path is remembered, so an unchanged file isn't even re-hashed.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.modules: dict[str, dict] = {}  # sha256 -> models
+        self.paths: dict[Path, tuple] = {}  # path -> ((mtime_ns, size), sha256)
+        self.migrated: set = set()  # (db path, schema fingerprint)
+        self.hits = 0
+        self.loads = 0
+
+    def __repr__(self):
+        return f"[ModelRegistry modules={len(self.modules)} hits={self.hits} loads={self.loads}]"
+
+    def digest(self, path: Path) -> str:
+        path = Path(path).resolve()
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        known = self.paths.get(path)
+        if known and known[0] == stamp: return known[1]
+        sha = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.paths[path] = (stamp, sha)
+        return sha
+
+    def load(self, path: Path) -> dict:
+        """Models defined in a file, executing it only the first time this content is seen"""
+        path = Path(path)
+        if not path.exists() or path.stat().st_size == 0: return {}
+        with self.lock:
+            sha = self.digest(path)
+            if sha in self.modules:
+                self.hits += 1
+                return self.modules[sha]
+            name = f"fastcontainer_models_{sha[:16]}"
+            spec = importlib.util.spec_from_file_location(name, path)
+            mod = importlib.util.module_from_spec(spec)
+            sys.modules[name] = mod  # so pydantic can resolve the module's forward references
+            try:
+                spec.loader.exec_module(mod)
+            except Exception:
+                del sys.modules[name]
+                raise
+            self.loads += 1
+            self.modules[sha] = models = table_models(vars(mod))
+            log.debug(f"{self}: Loaded {len(models)} models from {path.name}")
+            return models
+
+    @staticmethod
+    def fingerprint(tables: list) -> tuple:
+        return tuple(sorted((t.name, tuple((c.name, repr(c.type), c.nullable) for c in t.columns),
+                             tuple(sorted(ix.name for ix in t.indexes))) for t in tables))
+
+    def needs_migrate(self, db_path: Path, tables: list) -> bool:
+        """False when this process already migrated the same schema into the same file"""
+        return (Path(db_path).resolve(), self.fingerprint(tables)) not in self.migrated
+
+    def mark_migrated(self, db_path: Path, tables: list):
+        self.migrated.add((Path(db_path).resolve(), self.fingerprint(tables)))
+
+registry = ModelRegistry()
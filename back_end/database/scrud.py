@@ -1,17 +1,74 @@
 import json
 import uuid
+from contextlib import nullcontext
 from functools import singledispatch
 from typing import Type
 
+from sqlalchemy import and_, delete, insert, or_, true, tuple_, update
 from sqlmodel import SQLModel, select, Session
 from loguru import logger as log
 
+from back_end.database.read_cache import MISSING, ReadCache
 
-def scrud(db, cls: Type[SQLModel]):
-    cls._db = db
+try:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+except ImportError:  # async extras (greenlet, aiosqlite) not installed; sync scrud still works
+    AsyncSession = None
+
+OPS = ("c", "c_bulk", "r", "r_all", "r_page", "r_stream", "u", "d", "u_many", "d_many",
+       "ac", "ac_bulk", "ar", "ar_all", "ar_page", "ar_stream", "au", "ad", "au_many", "ad_many",
+       "d_before", "ad_before", "cache_info", "cache_clear")
+
+class ModelView:
+    """
+    A model class bound to one DatabaseManager: the scrud operations plus passthrough to the class
+    (attributes, columns, construction). The class itself is never mutated, so one model can back
+    any number of databases.
+    """
+
+    def __init__(self, model: Type[SQLModel], db, cache: ReadCache | None, ops: dict):
+        self.model = model
+        self._db = db
+        self._cache = cache
+        self.__dict__.update(ops)
+
+    def __getattr__(self, name):
+        if name == "model": raise AttributeError(name)  # not initialised yet (copy / pickle)
+        return getattr(self.model, name)
+
+    def __call__(self, *args, **kwargs):
+        return self.model(*args, **kwargs)
+
+    def __repr__(self):
+        return f"[{self.model.__name__} @ {self._db}]"
+
+def scrud(db, cls: Type[SQLModel]) -> ModelView:
+    cache = ReadCache.configure(cls, getattr(getattr(db, "db", None), "read_cache", None))
 
     def get_session(s: Session = None):
-        return s or cls._db.session()
+        return s or db.session()
+
+    def get_read_session(s: Session = None):
+        return s or db.read_session()
+
+    def observe(columns):
+        """time a filtered read for the manager's IndexAdvisor, if one is enabled"""
+        advisor = getattr(db, "advisor", None)
+        return advisor.observe(cls.__tablename__, columns) if advisor else nullcontext()
+
+    # --- READ CACHE ---
+    # only calls without a caller-owned session use the cache: inside a caller's transaction reads
+    # must see its uncommitted writes, and the rows belong to that session
+    def cached(session) -> ReadCache | None:
+        return cache if cache is not None and session is None else None
+
+    def inserted(rows, session=None):
+        if cache is not None: cache.on_insert(rows, keep=session is None)
+        return rows
+
+    def changed(rows):
+        if cache is not None: cache.on_change(rows)
+        return rows
 
     # --- CREATE ---
     @singledispatch
@@ -25,28 +82,102 @@ def scrud(db, cls: Type[SQLModel]):
             s.add(obj)
             s.commit()
             s.refresh(obj)
+            if session is None: s.expunge(obj)  # session() commits again on exit, which would expire it
             log.success(f"[SCRUD] Created {cls.__name__}: {obj}")
-            return obj
+        inserted([obj], session)
+        return obj
 
     @_create.register
     def _(data: str, session: Session = None):
         return _create(json.loads(data), session=session)
 
+    @_create.register
+    def _(data: SQLModel, session: Session = None):
+        with get_session(session) as s:
+            s.add(data)
+            s.commit()
+            s.refresh(data)
+            if session is None: s.expunge(data)
+            log.success(f"[SCRUD] Created {cls.__name__}: {data}")
+        inserted([data], session)
+        return data
+
     @_create.register
     def _(data: list, session: Session = None):
         if not all(isinstance(i, dict) for i in data):
             raise ValueError("All items must be dicts")
+        if not _returning("insert"):
+            with get_session(session) as s:
+                objs = [cls(**item) for item in data]
+                s.add_all(objs)
+                s.commit()
+                for obj in objs:
+                    s.refresh(obj)
+                    if session is None: s.expunge(obj)
+                log.success(f"[SCRUD] Bulk-created {len(objs)} {cls.__name__} records")
+            return inserted(objs, session)
+        return _bulk_insert(data, session=session, materialize=True)
+
+    # --- BULK INSERT ---
+    # Core INSERT executemany in chunks, one transaction; no per-row refresh SELECT
+    pk_cols = list(cls.__table__.primary_key.columns)
+    defaults = {}
+
+    def _defaults():
+        if not defaults:
+            static, factories = {}, {}
+            for name, f in cls.model_fields.items():
+                if name not in cls.__table__.columns: continue
+                if any(c.name == name for c in pk_cols) and f.default is None: continue  # autoincrement
+                if f.default_factory is not None: factories[name] = f.default_factory
+                elif not f.is_required(): static[name] = f.default
+            defaults.update(static=static, factories=factories)
+        return defaults["static"], defaults["factories"]
+
+    def _fill(data: list) -> list[dict]:
+        """Apply the model's python-side defaults (Core inserts skip them) and give every row the same keys"""
+        static, factories = _defaults()
+        keys = set(static) | set(factories)
+        for item in data: keys.update(item)
+        rows = []
+        for item in data:
+            row = {**static, **item}
+            for k, factory in factories.items():
+                if k not in item: row[k] = factory()
+            if len(row) != len(keys):
+                for k in keys: row.setdefault(k, None)
+            rows.append(row)
+        return rows
+
+    def _bulk_insert(data: list, session: Session = None, chunk_size: int = 5000, return_ids: bool = False, materialize: bool = False):
+        if not data: return [] if (return_ids or materialize) else 0
+        table = cls.__table__
+        rows = _fill(data)
+        out = []
         with get_session(session) as s:
-            objs = [cls(**item) for item in data]
-            s.add_all(objs)
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i:i + chunk_size]
+                if materialize:
+                    out.extend(s.scalars(insert(cls).returning(cls, sort_by_parameter_order=True), chunk).all())
+                elif return_ids:
+                    out.extend(s.scalars(insert(table).returning(*pk_cols, sort_by_parameter_order=True), chunk).all())
+                else:
+                    s.execute(insert(table), chunk)
+            for obj in out if materialize else ():
+                s.expunge(obj)
             s.commit()
-            for obj in objs:
-                s.refresh(obj)
-            log.success(f"[SCRUD] Bulk-created {len(objs)} {cls.__name__} records")
-            return objs
+        inserted(out if materialize else rows, session)
+        log.success(f"[SCRUD] Bulk-inserted {len(rows)} {cls.__name__} records in chunks of {chunk_size}")
+        return out if (return_ids or materialize) else len(rows)
+
+    def c_bulk(data: list, chunk_size: int = 5000, return_ids: bool = False, materialize: bool = False, session: Session = None):
+        """
+        High-throughput insert of many dicts. Returns the row count by default, primary keys with
+        return_ids (via RETURNING), or ORM objects with materialize.
+        """
+        return _bulk_insert(data, session=session, chunk_size=chunk_size, return_ids=return_ids, materialize=materialize)
 
-    @classmethod
-    def c(cls, data, session: Session = None):
+    def c(data, session: Session = None):
         return _create(data, session=session)
 
     # --- READ ---
@@ -56,17 +187,25 @@ def scrud(db, cls: Type[SQLModel]):
 
     @_read.register
     def _(data: dict, session: Session = None):
-        with get_session(session) as s:
+        c = cached(session)
+        if c and (hit := c.get_filter(data)) is not MISSING: return hit
+        generation = c and c.generation
+        with get_read_session(session) as s, observe(data):
             result = s.exec(select(cls).filter_by(**data)).first()
             log.debug(f"[SCRUD] Read by filter {data}: {result}")
-            return result
+        if c: c.put_filter(data, result, generation)
+        return result
 
     @_read.register
     def _(data: str, session: Session = None):
-        with get_session(session) as s:
+        c = cached(session)
+        if c and (hit := c.get_pk(data)) is not MISSING: return hit
+        generation = c and c.generation
+        with get_read_session(session) as s:
             result = s.exec(select(cls).where(cls.id == data)).first()
             log.debug(f"[SCRUD] Read by id {data}: {result}")
-            return result
+        if c: c.put_row(result, generation)
+        return result
 
     @_read.register
     def _(data: uuid.UUID, session: Session = None):
@@ -76,48 +215,522 @@ def scrud(db, cls: Type[SQLModel]):
     def _(data: list, session: Session = None):
         if not data:
             return []
-        with get_session(session) as s:
-            if all(isinstance(i, dict) for i in data):
+        if all(isinstance(i, dict) for i in data):
+            if not _hashable(data):
                 return [_read(i, session=session) for i in data]
-            if all(isinstance(i, (str, uuid.UUID)) for i in data):
-                ids = [str(i) for i in data]
-                result = s.exec(select(cls).where(cls.id.in_(ids))).all()
-                log.debug(f"[SCRUD] Read by id list {ids}: {result}")
-                return result
-            raise TypeError("List must be all dicts or UUID/str")
-
-    @classmethod
-    def r(cls, data, session: Session = None):
+            hits, misses, c = _cached_filters(data, session)
+            found = {}
+            if misses:
+                with get_read_session(session) as s:
+                    for keys, stmt in _batched_filters(misses):
+                        with observe(keys):
+                            rows = s.exec(stmt).all()
+                        for row in rows:
+                            found.setdefault(_row_key(keys, row), row)
+            result = _merge_filters(data, hits, found, c)
+            log.debug(f"[SCRUD] Read by {len(data)} filters: {sum(r is not None for r in result)} found")
+            return result
+        if all(isinstance(i, (str, uuid.UUID)) for i in data):
+            ids = [str(i) for i in data]
+            hits, misses, c = _cached_ids(ids, session)
+            rows = []
+            if misses:
+                with get_read_session(session) as s:
+                    rows = s.exec(select(cls).where(cls.id.in_(misses))).all()
+            result = _merge_ids(ids, hits, rows, c)
+            log.debug(f"[SCRUD] Read by id list {ids}: {result}")
+            return result
+        raise TypeError("List must be all dicts or UUID/str")
+
+    def r(data, session: Session = None):
         return _read(data, session=session)
 
-    # --- UPDATE ---
-    @classmethod
-    def u(cls, match: dict, changes: dict, session: Session = None):
-        obj = cls.r(match, session=session)
+    # --- BATCHED FILTERS ---
+    # a list of filter dicts becomes one IN (single key) or OR-of-ANDs query per READ_BATCH,
+    # grouped by key set; each dict then gets the first row (by primary key) that matches it
+    READ_BATCH = 500
+
+    def _norm(v):
+        return str(v) if isinstance(v, (int, uuid.UUID)) and not isinstance(v, bool) else v
+
+    def _hashable(data: list) -> bool:
+        try:
+            for m in data: hash(tuple(m.values()))
+        except TypeError:
+            return False
+        return True
+
+    def _match_key(m: dict):
+        keys = tuple(sorted(m))
+        return keys, tuple(_norm(m[k]) for k in keys)
+
+    def _row_key(keys: tuple, row):
+        return keys, tuple(_norm(getattr(row, k)) for k in keys)
+
+    def _batched_filters(data: list):
+        groups = {}
+        for m in data:
+            groups.setdefault(tuple(sorted(m)), []).append(m)
+        for keys, matches in groups.items():
+            for i in range(0, len(matches), READ_BATCH):
+                batch = matches[i:i + READ_BATCH]
+                if len(keys) == 1:
+                    col, values = getattr(cls, keys[0]), [m[keys[0]] for m in batch]
+                    where = col.in_([v for v in values if v is not None])
+                    if None in values: where = or_(where, col.is_(None))  # IN never matches NULL
+                else:
+                    where = or_(*(_match(m, all_rows=True) for m in batch))  # reads: {} is "any row", as in r({})
+                yield keys, select(cls).where(where).order_by(*pk_cols)
+
+    def _cached_filters(data: list, session):
+        """split filters into cache hits (by position) and the distinct misses still to query"""
+        c = cached(session)
+        if c is None: return {}, data, None
+        hits, misses = {}, {}
+        generation = c.generation
+        for i, m in enumerate(data):
+            hit = c.get_filter(m)
+            if hit is MISSING: misses.setdefault(_match_key(m), m)
+            else: hits[i] = hit
+        return hits, list(misses.values()), (c, generation)
+
+    def _merge_filters(data: list, hits: dict, found: dict, c):
+        result = []
+        for i, m in enumerate(data):
+            if i in hits:
+                result.append(hits[i])
+                continue
+            row = found.get(_match_key(m))
+            if c: c[0].put_filter(m, row, c[1])
+            result.append(row)
+        return result
+
+    def _cached_ids(ids: list, session):
+        c = cached(session)
+        if c is None: return {}, ids, None
+        generation = c.generation
+        hits = {i: hit for i in dict.fromkeys(ids) if (hit := c.get_pk(i)) is not MISSING and hit is not None}
+        return hits, [i for i in dict.fromkeys(ids) if i not in hits], (c, generation)
+
+    def _merge_ids(ids: list, hits: dict, rows: list, c):
+        if c is None: return rows
+        for row in rows: c[0].put_row(row, c[1])
+        found = {**hits, **{_norm(getattr(row, pk_cols[0].key)): row for row in rows}}
+        return [found[i] for i in dict.fromkeys(ids) if i in found]
+
+    # --- STREAMING / PAGINATION ---
+    def _order(order_by: str = None):
+        """"col" ascending, "-col" descending; None orders by primary key"""
+        if order_by is None: return pk_cols[0], False
+        return cls.__table__.columns[order_by.lstrip("-")], order_by.startswith("-")
+
+    def _select(tuples: bool):
+        return select(*cls.__table__.columns) if tuples else select(cls)
+
+    def _ordered(stmt, order_by: str = None):
+        """order column then primary key; NULLs sort first ascending and last descending, explicitly, so keyset cursors agree"""
+        col, desc = _order(order_by)
+        pk = pk_cols[0]
+        if col is pk: return stmt.order_by(pk.desc() if desc else pk)
+        if not col.nullable: return stmt.order_by(*((col.desc(), pk.desc()) if desc else (col, pk)))
+        return stmt.order_by(*((col.desc().nulls_last(), pk.desc()) if desc else (col.nulls_first(), pk)))
+
+    def _after(col, pk, desc: bool, cursor: tuple):
+        """rows strictly after (value, pk) in _ordered's order, NULL values included"""
+        value, key = cursor
+        if value is None:
+            tail = and_(col.is_(None), pk < key if desc else pk > key)
+            return tail if desc else or_(tail, col.isnot(None))
+        key_after = tuple_(col, pk) < tuple_(value, key) if desc else tuple_(col, pk) > tuple_(value, key)
+        if not col.nullable: return key_after
+        return or_(and_(col.isnot(None), key_after), col.is_(None)) if desc else and_(col.isnot(None), key_after)
+
+    def _page_stmt(match: dict = None, order_by: str = None, after=None, size: int = None, tuples: bool = False):
+        """keyset page: rows strictly after the cursor in (order column, primary key) order"""
+        col, desc = _order(order_by)
+        pk = pk_cols[0]
+        stmt = _select(tuples)
+        if match: stmt = stmt.where(_match(match))
+        if after is not None:
+            if col is pk: stmt = stmt.where(pk < after if desc else pk > after)
+            else: stmt = stmt.where(_after(col, pk, desc, tuple(after)))
+        stmt = _ordered(stmt, order_by)
+        return stmt.limit(size) if size else stmt
+
+    def _cursor(row, order_by: str = None):
+        col, _ = _order(order_by)
+        pk = getattr(row, pk_cols[0].key)
+        return pk if col is pk_cols[0] else (getattr(row, col.key), pk)
+
+    def _reader(session: Session = None):
+        return nullcontext(session) if session is not None else db.read_session()
+
+    def r_all(match: dict = None, order_by: str = None, limit: int = None, offset: int = None, tuples: bool = False, session: Session = None):
+        stmt = _select(tuples)
+        if match: stmt = stmt.where(_match(match))
+        stmt = _ordered(stmt, order_by)
+        if limit is not None: stmt = stmt.limit(limit)
+        if offset: stmt = stmt.offset(offset)
+        with _reader(session) as s, observe(match or ()):
+            rows = s.exec(stmt).all()
+        return [tuple(r) for r in rows] if tuples else rows
+
+    def r_page(match: dict = None, after=None, limit: int = 100, order_by: str = None, tuples: bool = False, session: Session = None):
+        """One keyset page; returns (rows, next_cursor) with next_cursor None on the last page"""
+        with _reader(session) as s:
+            rows = s.exec(_page_stmt(match, order_by, after, limit, tuples)).all()
+        cursor = _cursor(rows[-1], order_by) if len(rows) == limit else None
+        return ([tuple(r) for r in rows] if tuples else rows), cursor
+
+    def r_stream(match: dict = None, chunk_size: int = 1000, order_by: str = None, limit: int = None,
+                 tuples: bool = False, keyset: bool = True, session: Session = None):
+        """
+        Generator over every matching row without loading the table. keyset=True walks the table in
+        short keyset-paginated reads (no long-lived transaction); keyset=False streams one query with yield_per.
+        """
+        if not keyset:
+            stmt = _ordered(_select(tuples).where(_match(match)) if match else _select(tuples), order_by)
+            if limit is not None: stmt = stmt.limit(limit)
+            with _reader(session) as s:
+                for row in s.exec(stmt.execution_options(yield_per=chunk_size)):
+                    yield tuple(row) if tuples else row
+            return
+        after, seen = None, 0
+        while limit is None or seen < limit:
+            size = chunk_size if limit is None else min(chunk_size, limit - seen)
+            with _reader(session) as s:
+                rows = s.exec(_page_stmt(match, order_by, after, size, tuples)).all()
+            if not rows: return
+            for row in rows:
+                yield tuple(row) if tuples else row
+            seen += len(rows)
+            if len(rows) < size: return
+            after = _cursor(rows[-1], order_by)
+
+    # --- WHERE ---
+    def _id(data):
+        return str(data) if isinstance(data, uuid.UUID) else data
+
+    def _match(data, all_rows: bool = False):
+        """match dict or id -> WHERE clause; an empty dict (every row) only with all_rows=True"""
+        if isinstance(data, dict):
+            if not data:
+                if not all_rows: raise ValueError(f"[SCRUD] Empty match for {cls.__name__} would affect every row; pass all_rows=True")
+                return true()
+            return and_(*(getattr(cls, k) == v for k, v in data.items()))
+        return cls.id == _id(data)
+
+    def _match_many(matches: list):
+        """many matches folded into one clause: id IN (...) for ids, OR of ANDs for dicts"""
+        if not any(isinstance(m, dict) for m in matches):
+            return cls.id.in_([_id(m) for m in matches])
+        return or_(*(_match(m) for m in matches))
+
+    def _returning(kind: str) -> bool:
+        return getattr(db.engine.dialect, f"{kind}_returning", False)
+
+    def _update(where, changes: dict, session: Session = None):
+        stmt = update(cls).where(where).values(**changes)
         with get_session(session) as s:
-            for k, v in changes.items():
-                setattr(obj, k, v)
+            if _returning("update"):
+                rows = s.scalars(stmt.returning(cls), execution_options={"synchronize_session": False}).all()
+                for row in rows: s.expunge(row)  # keep RETURNING values; commit would expire them
+            else:
+                rows = s.execute(stmt, execution_options={"synchronize_session": False}).rowcount
             s.commit()
-            s.refresh(obj)
-            log.success(f"[SCRUD] Updated {cls.__name__} where {match} with {changes}")
-            return obj
+        return changed(rows)
+
+    def _delete(where, session: Session = None):
+        stmt = delete(cls).where(where)
+        with get_session(session) as s:
+            if _returning("delete"):
+                rows = s.scalars(stmt.returning(cls), execution_options={"synchronize_session": False}).all()
+                for row in rows: s.expunge(row)  # keep RETURNING values; commit would expire them
+            else:
+                rows = s.execute(stmt, execution_options={"synchronize_session": False}).rowcount
+            s.commit()
+        return changed(rows)
+
+    def _first(rows):
+        return (rows[0] if rows else None) if isinstance(rows, list) else rows
+
+    def _count(rows) -> int:
+        return len(rows) if isinstance(rows, list) else rows
+
+    # --- UPDATE ---
+    # one UPDATE ... WHERE ... RETURNING per call; without RETURNING support the affected rowcount is returned instead
+    def u(match, changes: dict, session: Session = None, all_rows: bool = False):
+        """
+        Update every row the match (dict or id) selects and return the first one (by RETURNING order); the
+        affected count is logged, use u_many for all updated rows. An empty match raises unless all_rows=True.
+        """
+        rows = _update(_match(match, all_rows), changes, session=session)
+        log.success(f"[SCRUD] Updated {_count(rows)} {cls.__name__} where {match} with {changes}")
+        return _first(rows)
+
+    def u_many(matches: list, changes: dict, session: Session = None):
+        if not matches: return []
+        rows = _update(_match_many(matches), changes, session=session)
+        log.success(f"[SCRUD] Bulk-updated {_count(rows)} {cls.__name__} for {len(matches)} matches with {changes}")
+        return rows
 
     # --- DELETE ---
-    @classmethod
-    def d(cls, data, session: Session = None):
-        obj = cls.r(data, session=session)
-        if obj:
-            with get_session(session) as s:
-                s.delete(obj)
-                s.commit()
-            log.warning(f"[SCRUD] Deleted {cls.__name__} with match {data}")
-        else:
-            log.warning(f"[SCRUD] Delete failed: {cls.__name__} not found for {data}")
+    def d(data, session: Session = None, all_rows: bool = False):
+        """Delete every row the match (dict or id) selects and return the first one; like u, {} needs all_rows=True"""
+        rows = _delete(_match(data, all_rows), session=session)
+        if _count(rows): log.warning(f"[SCRUD] Deleted {_count(rows)} {cls.__name__} with match {data}")
+        else: log.warning(f"[SCRUD] Delete failed: {cls.__name__} not found for {data}")
+        return _first(rows)
+
+    def d_many(matches: list, session: Session = None):
+        if not matches: return []
+        rows = _delete(_match_many(matches), session=session)
+        log.warning(f"[SCRUD] Bulk-deleted {_count(rows)} {cls.__name__} for {len(matches)} matches")
+        return rows
+
+    def d_before(column: str, value, session: Session = None) -> int:
+        """DELETE ... WHERE column < value (expiry / retention sweeps); returns the rowcount"""
+        stmt = delete(cls).where(cls.__table__.columns[column] < value)
+        with get_session(session) as s:
+            n = s.execute(stmt, execution_options={"synchronize_session": False}).rowcount
+            s.commit()
+        if n: log.debug(f"[SCRUD] Deleted {n} {cls.__name__} with {column} < {value}")
+        return changed(n)
+
+    # --- ASYNC ---
+    # same dispatch rules as c/r/u/d, awaited on the manager's aiosqlite engine
+    def get_asession(s: AsyncSession = None):
+        return nullcontext(s) if s is not None else db.asession()
+
+    def get_aread_session(s: AsyncSession = None):
+        return nullcontext(s) if s is not None else db.aread_session()
+
+    @singledispatch
+    async def _acreate(data, session: AsyncSession = None):
+        raise TypeError(f".ac() unsupported type: {type(data)}")
+
+    @_acreate.register
+    async def _(data: dict, session: AsyncSession = None):
+        async with get_asession(session) as s:
+            obj = cls(**data)
+            s.add(obj)
+            await s.commit()
+            await s.refresh(obj)
+            log.success(f"[SCRUD] Created {cls.__name__}: {obj}")
+        inserted([obj], session)
         return obj
 
-    # inject
-    cls.c = c
-    cls.r = r
-    cls.u = u
-    cls.d = d
-    return cls
+    @_acreate.register
+    async def _(data: str, session: AsyncSession = None):
+        return await _acreate(json.loads(data), session=session)
+
+    @_acreate.register
+    async def _(data: SQLModel, session: AsyncSession = None):
+        async with get_asession(session) as s:
+            s.add(data)
+            await s.commit()
+            await s.refresh(data)
+            log.success(f"[SCRUD] Created {cls.__name__}: {data}")
+        inserted([data], session)
+        return data
+
+    @_acreate.register
+    async def _(data: list, session: AsyncSession = None):
+        if not all(isinstance(i, dict) for i in data):
+            raise ValueError("All items must be dicts")
+        if not _returning("insert"):
+            async with get_asession(session) as s:
+                objs = [cls(**item) for item in data]
+                s.add_all(objs)
+                await s.commit()
+                for obj in objs:
+                    await s.refresh(obj)
+                log.success(f"[SCRUD] Bulk-created {len(objs)} {cls.__name__} records")
+            return inserted(objs, session)
+        return await _abulk_insert(data, session=session, materialize=True)
+
+    async def _abulk_insert(data: list, session: AsyncSession = None, chunk_size: int = 5000, return_ids: bool = False, materialize: bool = False):
+        if not data: return [] if (return_ids or materialize) else 0
+        table = cls.__table__
+        rows = _fill(data)
+        out = []
+        async with get_asession(session) as s:
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i:i + chunk_size]
+                if materialize:
+                    out.extend((await s.scalars(insert(cls).returning(cls, sort_by_parameter_order=True), chunk)).all())
+                elif return_ids:
+                    out.extend((await s.scalars(insert(table).returning(*pk_cols, sort_by_parameter_order=True), chunk)).all())
+                else:
+                    await s.execute(insert(table), chunk)
+            await s.commit()
+        inserted(out if materialize else rows, session)
+        log.success(f"[SCRUD] Bulk-inserted {len(rows)} {cls.__name__} records in chunks of {chunk_size}")
+        return out if (return_ids or materialize) else len(rows)
+
+    async def ac_bulk(data: list, chunk_size: int = 5000, return_ids: bool = False, materialize: bool = False, session: AsyncSession = None):
+        return await _abulk_insert(data, session=session, chunk_size=chunk_size, return_ids=return_ids, materialize=materialize)
+
+    async def ac(data, session: AsyncSession = None):
+        return await _acreate(data, session=session)
+
+    @singledispatch
+    async def _aread(data, session: AsyncSession = None):
+        raise TypeError(f".ar() unsupported type: {type(data)}")
+
+    @_aread.register
+    async def _(data: dict, session: AsyncSession = None):
+        c = cached(session)
+        if c and (hit := c.get_filter(data)) is not MISSING: return hit
+        generation = c and c.generation
+        async with get_aread_session(session) as s:
+            with observe(data):
+                result = (await s.exec(select(cls).filter_by(**data))).first()
+            log.debug(f"[SCRUD] Read by filter {data}: {result}")
+        if c: c.put_filter(data, result, generation)
+        return result
+
+    @_aread.register
+    async def _(data: str, session: AsyncSession = None):
+        c = cached(session)
+        if c and (hit := c.get_pk(data)) is not MISSING: return hit
+        generation = c and c.generation
+        async with get_aread_session(session) as s:
+            result = (await s.exec(select(cls).where(cls.id == data))).first()
+            log.debug(f"[SCRUD] Read by id {data}: {result}")
+        if c: c.put_row(result, generation)
+        return result
+
+    @_aread.register
+    async def _(data: uuid.UUID, session: AsyncSession = None):
+        return await _aread(str(data), session=session)
+
+    @_aread.register
+    async def _(data: list, session: AsyncSession = None):
+        if not data:
+            return []
+        if all(isinstance(i, dict) for i in data):
+            if not _hashable(data):
+                return [await _aread(i, session=session) for i in data]
+            hits, misses, c = _cached_filters(data, session)
+            found = {}
+            if misses:
+                async with get_aread_session(session) as s:
+                    for keys, stmt in _batched_filters(misses):
+                        with observe(keys):
+                            rows = (await s.exec(stmt)).all()
+                        for row in rows:
+                            found.setdefault(_row_key(keys, row), row)
+            result = _merge_filters(data, hits, found, c)
+            log.debug(f"[SCRUD] Read by {len(data)} filters: {sum(r is not None for r in result)} found")
+            return result
+        if all(isinstance(i, (str, uuid.UUID)) for i in data):
+            ids = [str(i) for i in data]
+            hits, misses, c = _cached_ids(ids, session)
+            rows = []
+            if misses:
+                async with get_aread_session(session) as s:
+                    rows = (await s.exec(select(cls).where(cls.id.in_(misses)))).all()
+            result = _merge_ids(ids, hits, rows, c)
+            log.debug(f"[SCRUD] Read by id list {ids}: {result}")
+            return result
+        raise TypeError("List must be all dicts or UUID/str")
+
+    async def ar(data, session: AsyncSession = None):
+        return await _aread(data, session=session)
+
+    async def ar_all(match: dict = None, order_by: str = None, limit: int = None, offset: int = None, tuples: bool = False, session: AsyncSession = None):
+        stmt = _select(tuples)
+        if match: stmt = stmt.where(_match(match))
+        stmt = _ordered(stmt, order_by)
+        if limit is not None: stmt = stmt.limit(limit)
+        if offset: stmt = stmt.offset(offset)
+        async with get_aread_session(session) as s:
+            with observe(match or ()):
+                rows = (await s.exec(stmt)).all()
+        return [tuple(r) for r in rows] if tuples else rows
+
+    async def ar_page(match: dict = None, after=None, limit: int = 100, order_by: str = None, tuples: bool = False, session: AsyncSession = None):
+        async with get_aread_session(session) as s:
+            rows = (await s.exec(_page_stmt(match, order_by, after, limit, tuples))).all()
+        cursor = _cursor(rows[-1], order_by) if len(rows) == limit else None
+        return ([tuple(r) for r in rows] if tuples else rows), cursor
+
+    async def ar_stream(match: dict = None, chunk_size: int = 1000, order_by: str = None, limit: int = None,
+                        tuples: bool = False, session: AsyncSession = None):
+        """Async generator over matching rows, keyset-paginated in chunks"""
+        after, seen = None, 0
+        while limit is None or seen < limit:
+            size = chunk_size if limit is None else min(chunk_size, limit - seen)
+            async with get_aread_session(session) as s:
+                rows = (await s.exec(_page_stmt(match, order_by, after, size, tuples))).all()
+            if not rows: return
+            for row in rows:
+                yield tuple(row) if tuples else row
+            seen += len(rows)
+            if len(rows) < size: return
+            after = _cursor(rows[-1], order_by)
+
+    async def _aupdate(where, changes: dict, session: AsyncSession = None):
+        stmt = update(cls).where(where).values(**changes)
+        async with get_asession(session) as s:
+            if _returning("update"):
+                rows = (await s.scalars(stmt.returning(cls), execution_options={"synchronize_session": False})).all()
+            else:
+                rows = (await s.execute(stmt, execution_options={"synchronize_session": False})).rowcount
+            await s.commit()
+        return changed(rows)
+
+    async def _adelete(where, session: AsyncSession = None):
+        stmt = delete(cls).where(where)
+        async with get_asession(session) as s:
+            if _returning("delete"):
+                rows = (await s.scalars(stmt.returning(cls), execution_options={"synchronize_session": False})).all()
+            else:
+                rows = (await s.execute(stmt, execution_options={"synchronize_session": False})).rowcount
+            await s.commit()
+        return changed(rows)
+
+    async def au(match, changes: dict, session: AsyncSession = None, all_rows: bool = False):
+        """Async u: updates every matching row, returns the first"""
+        rows = await _aupdate(_match(match, all_rows), changes, session=session)
+        log.success(f"[SCRUD] Updated {_count(rows)} {cls.__name__} where {match} with {changes}")
+        return _first(rows)
+
+    async def au_many(matches: list, changes: dict, session: AsyncSession = None):
+        if not matches: return []
+        rows = await _aupdate(_match_many(matches), changes, session=session)
+        log.success(f"[SCRUD] Bulk-updated {_count(rows)} {cls.__name__} for {len(matches)} matches with {changes}")
+        return rows
+
+    async def ad(data, session: AsyncSession = None, all_rows: bool = False):
+        """Async d: deletes every matching row, returns the first"""
+        rows = await _adelete(_match(data, all_rows), session=session)
+        if _count(rows): log.warning(f"[SCRUD] Deleted {_count(rows)} {cls.__name__} with match {data}")
+        else: log.warning(f"[SCRUD] Delete failed: {cls.__name__} not found for {data}")
+        return _first(rows)
+
+    async def ad_many(matches: list, session: AsyncSession = None):
+        if not matches: return []
+        rows = await _adelete(_match_many(matches), session=session)
+        log.warning(f"[SCRUD] Bulk-deleted {_count(rows)} {cls.__name__} for {len(matches)} matches")
+        return rows
+
+    async def ad_before(column: str, value, session: AsyncSession = None) -> int:
+        stmt = delete(cls).where(cls.__table__.columns[column] < value)
+        async with get_asession(session) as s:
+            n = (await s.execute(stmt, execution_options={"synchronize_session": False})).rowcount
+            await s.commit()
+        if n: log.debug(f"[SCRUD] Deleted {n} {cls.__name__} with {column} < {value}")
+        return changed(n)
+
+    def cache_info() -> dict | None:
+        """hit / miss / eviction counters of the model's read cache; None when caching is off"""
+        return cache.info() if cache is not None else None
+
+    def cache_clear():
+        """drop every cached row, e.g. after writing to the table outside scrud"""
+        if cache is not None: cache.clear()
+
+    ops = locals()
+    return ModelView(cls, db, cache, {name: ops[name] for name in OPS})
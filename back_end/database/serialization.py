@@ -0,0 +1,24 @@
+import json
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback: same output, slower
+    orjson = None
+
+def _default(obj):
+    if isinstance(obj, (datetime, date)): return obj.isoformat()
+    if hasattr(obj, "__dataclass_fields__"): return {f: getattr(obj, f) for f in obj.__dataclass_fields__}
+    if isinstance(obj, (set, frozenset, tuple)): return list(obj)
+    raise TypeError(f"[serialization] {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj) -> bytes:
+    """Compact JSON bytes; orjson when installed (dataclasses and datetimes natively), json otherwise"""
+    if orjson is not None: return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+def loads(data: bytes | bytearray | memoryview | str):
+    if orjson is not None: return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+JSONDecodeError = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
@@ -1,31 +1,66 @@
-import importlib.util
 import logging
-import re
+import threading
 import types
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
+from typing import Any
 
 from loguru import logger as log
-from sqlalchemy import MetaData, Engine, create_engine
+from sqlalchemy import MetaData, Engine, QueuePool, create_engine, event, text
 from sqlmodel import SQLModel, Session
 
-def sanitize(text: str) -> str:
-    text = str(text).strip()
-    text = re.sub(r"[^\w]", "_", text)
-    if text[0].isdigit():
-        text = "_" + text
-    return text.lower()
+from back_end.database.indexes import IndexAdvisor
+from back_end.database.ingest import Ingestor, sanitize
+from back_end.database.migrator import Migrator
+from back_end.database.pragmas import SQLiteProfile
+from back_end.database.profiler import QueryProfiler
+from back_end.database.registry import registry, table_models
+
+class WriterPool(QueuePool):
+    """
+    The single sync writer connection. A thread asking for it while already holding it (a scrud call without
+    session= inside an open writer session) would wait pool_timeout for itself, so that raises at once instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.holder: int | None = None
+
+    def _do_get(self):
+        if self.holder == threading.get_ident():
+            raise RuntimeError("[WriterPool] This thread already holds the writer connection; pass session= to nested calls")
+        conn = super()._do_get()
+        self.holder = threading.get_ident()
+        return conn
+
+    def _do_return_conn(self, record):
+        self.holder = None
+        super()._do_return_conn(record)
 
 @dataclass
 class Database:
-    path: Path
+    name: str = None
+    dir: Path = None
+    project: Any = None
+    path: Path = None
     model_path: Path = None #for generating models from a .py file
     input_model: SQLModel | list[SQLModel] = None #for generating models from an SQL Model / List of SQL Models
+    profile: SQLiteProfile | str | None = "tuned" #connection pragmas / pooling, see SQLiteProfile
+    index_advisor: str | None = None #None, "suggest" or "auto", see IndexAdvisor
+    migrate_batch: int = 5_000 #rows per transaction when migrate() rebuilds a table
+    ingest_chunk: int = 10_000 #rows per chunk when loading <name>-db-inputs files
+    ingest_workers: int = 4 #input files parsed in parallel
+    query_profiler: bool | dict | None = None #True or QueryProfiler kwargs (slow_ms, explain, ...) to time every statement
+    echo_sql: bool = False #forward every SQLAlchemy engine log record through loguru (slow; prefer query_profiler)
+    read_cache: bool | dict | None = None #True or ReadCache kwargs (maxsize, ttl) for every model; a model's __read_cache__ wins
     manager = None
 
     def __post_init__(self):
+        if self.dir is None and self.path is not None: self.dir = Path(self.path).parent
+        if self.name is None and self.path is not None: self.name = Path(self.path).stem
+        self.profile = SQLiteProfile.resolve(self.profile)
         if not self.dir.exists(): raise FileNotFoundError
         if not hasattr(self, "from_project_bool"):
             self.path: Path = self.dir / f"{self.name}.db"
@@ -40,8 +75,7 @@ class DatabaseManager:
     def __init__(self, db: Database):
         self.db = db
         self.project = self.db.project
-        _ = self.engine, self.models
-        self.migrate()
+        # engines, the models file and the migration all load on first use of .models / .engine
         #_ = self.xlsx_inputs
         log.success(f"{self}: Successfully Initialized!")
 
@@ -64,20 +98,62 @@ class DatabaseManager:
             else:
                 log.debug(msg)
 
+    @property
+    def profile(self) -> SQLiteProfile:
+        return self.db.profile
+
+    def _pool_kwargs(self, read_only: bool) -> dict:
+        if not self.profile.split_rw: return {}
+        # one writer connection serializes writes instead of racing for SQLite's file lock
+        return dict(pool_size=self.profile.readers if read_only else 1, max_overflow=0, pool_timeout=30)
+
+    def _create_engine(self, read_only: bool = False) -> Engine:
+        profile = self.profile
+        engine = create_engine(
+            f"sqlite:///{self.db.path}",
+            future=True,
+            echo=False,
+            connect_args=profile.connect_args(),
+            **({"poolclass": WriterPool} if profile.split_rw and not read_only else {}),
+            **self._pool_kwargs(read_only)
+        )
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_conn, _):
+            profile.apply(dbapi_conn, read_only=read_only)
+
+        if self.profiler: self.profiler.attach(engine, "read" if read_only else "write")
+        return engine
+
+    @cached_property
+    def profiler(self) -> QueryProfiler | None:
+        cfg = self.db.query_profiler
+        if not cfg: return None
+        return QueryProfiler(**({} if cfg is True else cfg))
+
+    def query_report(self, n: int = 10) -> str:
+        return self.profiler.report(n) if self.profiler else f"{self}: query profiling is off (Database(query_profiler=True))"
+
     @cached_property
     def engine(self) -> Engine:
         logger = logging.getLogger("sqlalchemy.engine")
         if not any(isinstance(h, self.InterceptHandler) for h in logger.handlers):
             logger.handlers = [self.InterceptHandler(repr(self))]
-            logger.setLevel(logging.DEBUG)
-        return create_engine(
-            f"sqlite:///{self.db.path}",
-            future=True,
-            echo=False
-        )
+        # DEBUG formats and ships every statement and row through loguru; only on request
+        logger.setLevel(logging.DEBUG if self.db.echo_sql else logging.WARNING)
+        log.debug(f"{self}: Using {self.profile}")
+        return self._create_engine()
+
+    @cached_property
+    def read_engine(self) -> Engine:
+        """Pool of query_only reader connections; the writer engine when the profile doesn't split"""
+        if not self.profile.split_rw or self.profile.readers < 1: return self.engine
+        _ = self.engine  # writer first so WAL is switched on before readers attach
+        return self._create_engine(read_only=True)
 
     @contextmanager
     def session(self):
+        if self.profiler: self.profiler.session_opened("write")
         session = Session(self.engine)
         try:
             yield session
@@ -88,27 +164,95 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @contextmanager
+    def read_session(self):
+        if self.profiler: self.profiler.session_opened("read")
+        session = Session(self.read_engine)
+        try:
+            yield session
+        finally:
+            session.close()  # close, not rollback: rollback would expire the rows we hand back
+
+    # --- async (aiosqlite) ---
+    def _create_async_engine(self, read_only: bool = False):
+        from sqlalchemy.ext.asyncio import create_async_engine  # needs aiosqlite + greenlet
+
+        profile = self.profile
+        connect_args = profile.connect_args()
+        connect_args.pop("check_same_thread", None)
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{self.db.path}",
+            echo=False,
+            connect_args=connect_args,
+            **self._pool_kwargs(read_only)
+        )
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _on_connect(dbapi_conn, _):
+            profile.apply(dbapi_conn, read_only=read_only)
+
+        if self.profiler: self.profiler.attach(engine.sync_engine, "async-read" if read_only else "async-write")
+        return engine
+
     @cached_property
-    def models(self) -> types.SimpleNamespace:
-        from back_end.database.scrud import scrud
+    def async_engine(self):
+        """AsyncEngine on the same file, pragmas and pool split as the sync engine"""
+        _ = self.engine  # sync writer migrates + switches WAL on first
+        return self._create_async_engine()
 
+    @cached_property
+    def async_read_engine(self):
+        if not self.profile.split_rw or self.profile.readers < 1: return self.async_engine
+        _ = self.async_engine
+        return self._create_async_engine(read_only=True)
+
+    @asynccontextmanager
+    async def asession(self):
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        if self.profiler: self.profiler.session_opened("async-write")
+        session = AsyncSession(self.async_engine, expire_on_commit=False)
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def aread_session(self):
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        if self.profiler: self.profiler.session_opened("async-read")
+        session = AsyncSession(self.async_read_engine, expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def acheckpoint(self, mode: str = "FULL"):
+        """Checkpoint the WAL into the database file; with synchronous=NORMAL this is the point commits are fsynced"""
+        async with self.async_engine.connect() as conn:
+            return (await conn.execute(text(f"PRAGMA wal_checkpoint({mode})"))).first()
+
+    async def dispose(self):
+        """Close every pooled connection, sync and async"""
+        for name in ("async_read_engine", "async_engine"):
+            if name in self.__dict__: await self.__dict__.pop(name).dispose()
+        for name in ("read_engine", "engine"):
+            if name in self.__dict__: self.__dict__.pop(name).dispose()
+
+    @cached_property
+    def model_classes(self) -> dict:
+        """name.lower() -> SQLModel class, from model_path (via the shared registry) and input_model"""
         model_map = {}
 
         # from model_path
-        if self.db.model_path.exists():
-            spec = importlib.util.spec_from_file_location("models", self.db.model_path)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-
-            file_models = {
-                name.lower(): scrud(self, obj)
-                for name, obj in vars(mod).items()
-                if isinstance(obj, type)
-                and issubclass(obj, SQLModel)
-                and getattr(obj, "__tablename__", None)
-            }
-
-            log.debug(f"{self}: Loaded {len(file_models)} models from file")
+        if self.db.model_path:
+            file_models = registry.load(self.db.model_path)
+            if file_models: log.debug(f"{self}: Loaded {len(file_models)} models from file")
             model_map.update(file_models)
 
         # from input_model (list or single)
@@ -117,94 +261,66 @@ class DatabaseManager:
             if not isinstance(input_models, list):
                 input_models = [input_models]
 
-            direct_models = {
-                model.__name__.lower(): scrud(self, model)
-                for model in input_models
-                if isinstance(model, type)
-                and issubclass(model, SQLModel)
-                and getattr(model, "__tablename__", None)
-            }
-
+            direct_models = table_models({model.__name__: model for model in input_models if isinstance(model, type)})
             log.debug(f"{self}: Loaded {len(direct_models)} models from input")
             model_map.update(direct_models)
 
         if not model_map:
             log.warning(f"{self}: No models found from path or input!")
+        return model_map
 
-        log.info(f"{self}: Accessible Namespaces:\n" + "\n".join(f" - {k}" for k in model_map))
+    @cached_property
+    def models(self) -> types.SimpleNamespace:
+        from back_end.database.scrud import scrud
 
-        return types.SimpleNamespace(**model_map)
+        tables = [model.__table__ for model in self.model_classes.values()]
+        if registry.needs_migrate(self.db.path, tables):
+            self.migrate()
+            registry.mark_migrated(self.db.path, tables)
 
+        log.info(f"{self}: Accessible Namespaces:\n" + "\n".join(f" - {k}" for k in self.model_classes))
+        return types.SimpleNamespace(**{name: scrud(self, model) for name, model in self.model_classes.items()})
 
-    def migrate(self):
-        tables = [
-            obj.__table__
-            for obj in self.models.__dict__.values()
-            if hasattr(obj, "__table__")
-        ]
+    def migrate(self, dry_run: bool = False) -> list:
+        """Diff the models against the live schema and apply it; see Migrator"""
+        tables = [model.__table__ for model in self.model_classes.values()]
         if not tables:
             log.warning(f"{self}: No models found to migrate.")
-            return
+            return []
 
         meta = MetaData()
         for t in tables:
             t.to_metadata(meta)        # clone into the new metadata
 
-        meta.create_all(self.engine, checkfirst=True)
+        self.migrator = Migrator(self.engine, list(meta.tables.values()), batch_size=self.db.migrate_batch)
+        steps = self.migrator.run(dry_run=dry_run)
+        if steps: log.info(self.migrator.report())
+        if not dry_run and "advisor" in self.__dict__ and self.advisor: self.advisor.create_pending()
         log.success(f"{self}: Migrated {len(tables)} model(s) ✔")
+        return steps
+
+    @cached_property
+    def advisor(self) -> IndexAdvisor | None:
+        if not self.db.index_advisor: return None
+        return IndexAdvisor(self.engine, read_engine=self.read_engine, mode=self.db.index_advisor)
+
+    @cached_property
+    def ingestor(self) -> Ingestor:
+        return Ingestor(self.db.path, self.db.input_dir, chunk_size=self.db.ingest_chunk,
+                        workers=self.db.ingest_workers, pragmas=self.profile.pragmas)
+
+    def ingest(self, files: list[Path] = None, force: bool = False) -> list:
+        """Load xlsx / CSV / Parquet files from <name>-db-inputs (or `files`) into tables named after them"""
+        return self.ingestor.run(files, force=force)
 
-    ##ignore this shit here this is wip
     @cached_property
     def xlsx_inputs(self):
-        files = []
-        for file in self.meta.input_dir.glob("*.xlsx"):
-            table = sanitize(file.stem.lower())
-            try:
-                DatabaseManager.xlsx_to_sqlite(self.meta.db_path, table, file)
-                log.debug(f"[DB Manager] Wrote {file.name} to {table}")
-                files.append(file.name)
-            except Exception as e:
-                log.error(f"[DB Manager] Failed on {file.name}: {e}")
-        return files
+        return [r.file for r in self.ingest() if not r.error]
 
     @staticmethod
     def xlsx_to_sqlite(db_path: Path, table: str, file: Path):
-        import uuid
-        import pandas as pd
-        from datetime import datetime
-        import sqlite3
-
-        df = pd.read_excel(file).where(pd.notnull, None)
-        df.columns = [sanitize(c) for c in df.columns]
-        df.insert(0, "uuid", [str(uuid.uuid4()) for _ in df.index])
-        df.insert(1, "migration_date", datetime.utcnow().isoformat())
-        table = sanitize(table)
-
-        with sqlite3.connect(str(db_path)) as conn:
-            cur = conn.cursor()
-
-            # Ensure table exists with base columns
-            cur.execute(f'''
-                CREATE TABLE IF NOT EXISTS "{table}" (
-                    uuid TEXT PRIMARY KEY,
-                    migrated_at TEXT
-                )
-            ''')
-
-            # Check existing columns
-            cur.execute(f'PRAGMA table_info("{table}")')
-            existing_cols = {row[1] for row in cur.fetchall()}
-
-            # Add missing columns
-            for col in df.columns:
-                if col not in existing_cols:
-                    cur.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" TEXT')
-
-            # Batch insert
-            cols = ', '.join(f'"{c}"' for c in df.columns)
-            placeholders = ', '.join(['?'] * len(df.columns))
-            insert_sql = f'INSERT INTO "{table}" ({cols}) VALUES ({placeholders})'
-            cur.executemany(insert_sql, df.itertuples(index=False, name=None))
-
-            conn.commit()
-
+        """Kept for callers of the old static helper: loads one file through an Ingestor (any supported format)"""
+        ingestor = Ingestor(Path(db_path))
+        result = ingestor.ingest_file(file, table=table, force=True)
+        if result.error: raise RuntimeError(f"{ingestor}: {result}")
+        return result
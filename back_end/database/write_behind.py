@@ -0,0 +1,163 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from loguru import logger as log
+
+DURABILITY = ("best_effort", "fsync")
+
+@dataclass
+class WriteBehindStats:
+    enqueued: int = 0
+    written: int = 0
+    flushes: int = 0
+    failed: int = 0
+    dropped: int = 0
+    blocked: int = 0
+    """put() calls that had to wait for room in the buffer"""
+    max_pending: int = 0
+    flush_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return dict(vars(self), avg_batch=self.written / self.flushes if self.flushes else 0.0)
+
+@dataclass
+class WriteBehind:
+    """
+    Buffers rows in memory and writes them in batches from a background task.
+
+    A flush runs when max_batch rows are pending or flush_interval seconds after the first pending row,
+    whichever comes first; each flush is one `sink(rows)` call (normally a scrud `ac_bulk`, one transaction).
+    At most max_pending rows are held: put() waits for the writer when the buffer is full, or drops the
+    row with on_full="drop". durability="fsync" runs `sync()` after every flush (a WAL checkpoint, see
+    DatabaseManager.acheckpoint) so flushed rows survive power loss; "best_effort" leaves that to SQLite.
+    close() flushes whatever is left and stops the task.
+    """
+    sink: Callable[[list], Awaitable[Any]]
+    sync: Callable[[], Awaitable[Any]] | None = None
+    max_batch: int = 500
+    flush_interval: float = 0.25
+    max_pending: int = 10_000
+    durability: str = "best_effort"
+    on_full: str = "block"
+    retries: int = 3
+    name: str = "WriteBehind"
+    stats: WriteBehindStats = field(default_factory=WriteBehindStats)
+
+    def __post_init__(self):
+        if self.durability not in DURABILITY: raise ValueError(f"[WriteBehind] durability must be one of {DURABILITY}")
+        if self.on_full not in ("block", "drop"): raise ValueError("[WriteBehind] on_full must be 'block' or 'drop'")
+        self.pending: list = []
+        self.waiters: list[tuple[int, asyncio.Future]] = []  # (position in pending, resolved once written)
+        self.task: asyncio.Task | None = None
+        self.closed = False
+        self._wake: asyncio.Event | None = None  # something is pending
+        self._now: asyncio.Event | None = None  # flush without waiting for flush_interval
+        self._room: asyncio.Condition | None = None
+
+    def __repr__(self):
+        return f"[{self.name}.WriteBehind pending={len(self.pending)} durability={self.durability}]"
+
+    def _start(self):
+        """The task and asyncio primitives belong to the loop of the first put()"""
+        if self.task is None or self.task.done():
+            self._wake, self._now = asyncio.Event(), asyncio.Event()
+            self._room = asyncio.Condition()
+            self.task = asyncio.get_running_loop().create_task(self._run(), name=f"{self.name}-write-behind")
+
+    async def put(self, row, wait: bool = False) -> bool:
+        """Queue one row; wait=True returns only once the batch holding it has been written (and synced)"""
+        if self.closed: raise RuntimeError(f"{self}: closed")
+        self._start()
+        if len(self.pending) >= self.max_pending:
+            if self.on_full == "drop":
+                self.stats.dropped += 1
+                log.warning(f"{self}: Buffer full, dropped a row")
+                return False
+            self.stats.blocked += 1
+            self._now.set()
+            async with self._room:
+                await self._room.wait_for(lambda: len(self.pending) < self.max_pending)
+        self.pending.append(row)
+        self.stats.enqueued += 1
+        self.stats.max_pending = max(self.stats.max_pending, len(self.pending))
+        self._wake.set()
+        if len(self.pending) >= self.max_batch: self._now.set()
+        if wait:
+            done = asyncio.get_running_loop().create_future()
+            self.waiters.append((len(self.pending), done))
+            self._now.set()
+            await done
+        return True
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            if not self._now.is_set():
+                try:
+                    await asyncio.wait_for(self._now.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            self._now.clear()
+            await self.flush()
+            if self.closed and not self.pending: return
+
+    async def flush(self) -> int:
+        """Write everything pending now, in batches of max_batch"""
+        written = 0
+        while self.pending:
+            batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+            waiters, self.waiters = self._split_waiters(len(batch))
+            if self._room is not None:
+                async with self._room: self._room.notify_all()
+            error = await self._write(batch)
+            for done in waiters:
+                if done.done(): continue
+                if error: done.set_exception(error)
+                else: done.set_result(True)
+            written += 0 if error else len(batch)
+        return written
+
+    def find(self, predicate: Callable[[Any], bool]):
+        """Newest pending row matching predicate (read-your-writes before the flush), else None"""
+        return next((row for row in reversed(self.pending) if predicate(row)), None)
+
+    def _split_waiters(self, n: int):
+        """Futures satisfied by the first n pending rows; the rest shift down by n"""
+        now, later = [], []
+        for pos, done in self.waiters:
+            if pos <= n: now.append(done)
+            else: later.append((pos - n, done))
+        return now, later
+
+    async def _write(self, batch: list) -> Exception | None:
+        t0 = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                await self.sink(batch)
+                if self.durability == "fsync" and self.sync is not None: await self.sync()
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    self.stats.failed += len(batch)
+                    log.error(f"{self}: Lost {len(batch)} rows after {attempt + 1} attempts: {type(e).__name__}: {e}")
+                    return e
+                await asyncio.sleep(0.05 * 2 ** attempt)
+        self.stats.flushes += 1
+        self.stats.written += len(batch)
+        self.stats.flush_ms += (time.perf_counter() - t0) * 1000
+        return None
+
+    async def close(self):
+        """Flush the remainder and stop the background task"""
+        if self.closed: return
+        self.closed = True
+        if self.task is not None and not self.task.done():
+            self._wake.set()
+            self._now.set()
+            await self.task
+        else:
+            await self.flush()
+        log.debug(f"{self}: Closed, {self.stats.to_dict()}")
@@ -1,16 +1,28 @@
+import asyncio
+import atexit
+import time
+from datetime import datetime
 from typing import Optional
 
-import aiohttp
 from loguru import logger as log
 from sqlalchemy import select
+from yarl import URL
 
+from back_end.database.partitions import PartitionedDatabase
+from back_end.database.redis_manager import RedisManager
 from back_end.database.sqlite_manager import Database
+from back_end.database.write_behind import WriteBehind
+from back_end.receptionist.http_session import HTTPSession
+from back_end.receptionist.l1_cache import L1Cache
+from back_end.receptionist.rate_limit import RateLimiter
+from back_end.receptionist.resilience import RETRYABLE_ERRORS, BulkheadFull, CircuitOpen, Resilience
+from back_end.receptionist.single_flight import SingleFlight
+from back_end.receptionist.http_cache import FRESH, SAFE_METHODS, STALE_WHILE_REVALIDATE, CachePolicy, cache_key
 from back_end.receptionist.models import (
-    RequestEntry,
     Routes,
     recep_resp,
     recep_request,
-    RequestEntryDC, RequestEntrySQL, RequestLog, CallbackEntry,
+    RequestEntryDC, RequestEntrySQL, RequestLog, CallbackEntrySQL,
 )
 
 class ReceptionistManager:
@@ -27,35 +39,50 @@ class ReceptionistManager:
     def __init__(self, recep):
         from back_end.receptionist.factory import Receptionist
         self.recep: Receptionist = recep
-        self.routes: Routes = recep.api_routes
-        self.headers = recep.api_headers
-        self.rlog = RequestLog(self)
+        self.routes: Routes = recep.routes
+        self.headers = recep.headers
+        self.rlog = RequestLog(self, **(getattr(recep, "request_log", None) or {}))
+        self.cache_policy = CachePolicy.resolve(getattr(recep, "cache", None))
+        self.refreshing: dict[str, asyncio.Task] = {}  # cache key -> background stale-while-revalidate refresh
+        self.evicted_at = time.monotonic()
+        self.l1 = L1Cache.resolve(getattr(recep, "l1", True))
+        self.http = HTTPSession.resolve(getattr(recep, "http", None), name=recep.name)
+        self.single_flight = SingleFlight.resolve(getattr(recep, "single_flight", "get"))
+        self.resilience = Resilience(policies=getattr(self.routes, "policies", {}), breaker=getattr(recep, "breaker", None) or {}, name=recep.name)
+        self.rate_limit = RateLimiter.resolve(getattr(recep, "rate_limit", None), name=recep.name)
 
         if recep.db:
-            if recep.callback:
-                self.db = Database(
-                    project=recep.project,
+            models = [RequestEntrySQL, CallbackEntrySQL] if recep.callback else RequestEntrySQL
+            if getattr(recep, "partition", None):
+                self.db = PartitionedDatabase(
+                    project=getattr(recep, "project", None),
                     name=recep.name,
                     dir=recep.dir,
-                    input_model=[RequestEntrySQL, CallbackEntrySQL] #type: ignore
+                    input_model=models, #type: ignore
+                    period=recep.partition,
+                    retain=getattr(recep, "retention", None)
                 )
-                self.callback_table = self.db.manager.models.callbackentrysql
             else: self.db = Database(
-                project=recep.project,
+                project=getattr(recep, "project", None),
                 name=recep.name,
                 dir=recep.dir,
-                input_model=RequestEntrySQL #type: ignore
+                input_model=models #type: ignore
             )
-            from back_end.database.sqlite_manager import DatabaseManager
-            self.manager: DatabaseManager = self.db.manager
+            self.manager = self.db.manager
             self.table: RequestEntrySQL = self.manager.models.requestentrysql
+            if recep.callback: self.callback_table = self.manager.models.callbackentrysql
+            options = getattr(recep, "write_behind", True)
+            self.writer = WriteBehind(sink=self.table.ac_bulk, sync=self.manager.acheckpoint, name=recep.name,
+                                      **(options if isinstance(options, dict) else {})) if options else None
         elif recep.redis:
+            options = recep.redis if isinstance(recep.redis, dict) else {}
+            self.redis = RedisManager("recep_entry", name=recep.name, **options)
             if recep.callback:
-                self.redis_callback = RedisManager(CallbackEntry, "callback_entry" )
-            self.redis = RedisManager(RequestEntry, "recep_entry")
+                self.redis_callback = RedisManager("callback_entry", name=recep.name, **{**options, "client": self.redis.client})
         else:
             raise RuntimeError("Receptionist must have either db or redis backend.")
         self.backend = self.db if hasattr(self, "db") else self.redis
+        atexit.register(self._close_at_exit)
         log.success(f"{self} Successfully initialized: \n- backend_mode={self.backend.__class__.__name__}\n- callback_mode={self.recep.callback}")
 
     def __repr__(self):
@@ -73,76 +100,173 @@ class ReceptionistManager:
             path = path.format(**format)
         if append:
             path += append
+        if kw.get("params"):  # the final URL keys the cache, single-flight and the stored entry
+            path = str(URL(path).extend_query(kw.pop("params")))
 
-        if force_refresh is False:
-            cached = self._get_cache(path)
-            if cached:
+        request_headers = {**self.headers.index, **(kw.get("headers") or {})}
+        key = cache_key(method, path, kw.get("json", kw.get("data")))
+        lookup = not force_refresh and self.cache_policy.cacheable_request(method, request_headers)
+        if lookup and self.l1:  # in-process hits skip the flight
+            hit = self.l1.get(key, lambda vary: self.cache_policy.vary_matches(vary, request_headers))
+            if hit and self.cache_policy.state(hit, request_headers) == FRESH:
                 log.debug(f"{self}: Cache HIT for {path}")
-                return cached
+                return self._cached_response(hit)
+        if self.single_flight and self.single_flight.applies(method):
+            # the backend lookup runs inside the flight: a caller arriving after the leader stored its response reads it
+            flight = f"{key}:{sorted((str(k), str(v)) for k, v in request_headers.items())}:{lookup}"
+            return await self.single_flight.do(flight, lambda: self._serve(route, method, path, key, request_headers, lookup, kw))
+        return await self._serve(route, method, path, key, request_headers, lookup, kw)
 
-        request = recep_request(method=method, route=path, headers=self.headers.index)
+    async def _serve(self, route: str, method: str, path: str, key: str, request_headers: dict, lookup: bool, kw: dict) -> recep_resp:
+        """The cache lookup, then the upstream call it can't answer (conditional when a stale entry is stored)"""
+        stored = None
+        if lookup:
+            stored = await self._get_cache(key, request_headers)
+            if stored:
+                state = self.cache_policy.state(stored, request_headers)
+                if state == FRESH:
+                    log.debug(f"{self}: Cache HIT for {path}")
+                    return self._cached_response(stored)
+                if state == STALE_WHILE_REVALIDATE:
+                    log.debug(f"{self}: Cache STALE HIT for {path}, refreshing in the background")
+                    self._refresh_later(route, method, path, key, stored, kw)
+                    return self._cached_response(stored)
+                log.debug(f"{self}: Cache STALE for {path}, revalidating")
+        try:
+            return await self._fetch(route, method, path, key, stored, **kw)
+        except (CircuitOpen, BulkheadFull, *RETRYABLE_ERRORS) as e:
+            if stored is None or not self.cache_policy.usable_on_error(stored): raise
+            log.warning(f"{self}: {type(e).__name__} for {path}, serving the stale cached response")
+            return self._cached_response(stored)
+
+    async def _fetch(self, route: str, method: str, path: str, key: str, stored: RequestEntryDC = None, **kw) -> recep_resp:
+        """One upstream call under the route's RoutePolicy; a stored entry's ETag / Last-Modified make it conditional"""
+        extra = {**(kw.pop("headers", None) or {}), **(self.cache_policy.validators(stored) if stored else {})}
         log.debug(f"{self}: {method.upper()} {path} | HEADERS={self.headers.index} | KWARGS={kw}")
 
-        async with aiohttp.ClientSession(headers=request.headers) as ses:
-            async with ses.request(method.upper(), path, **kw) as res:
-                try:
-                    content_type = res.headers.get("Content-Type", "")
-                    if "json" in content_type:
-                        content = await res.json()
-                    else:
-                        content = await res.text()
-                except Exception as e:
-                    content = await res.text()  # always fallback
-                    log.warning(f"{self}: Bad response decode → {e} | Fallback body: {content}")
-
-                out = recep_resp(
-                    status_code=res.status,
-                    headers=dict(res.headers),
-                    body=content
-                )
-                self.rlog.log(req=request, resp=out)
+        request_headers = {**self.headers.index, **extra}
+        out = await self.resilience.call(route, method, path, lambda timeout: self._send(route, method, path, request_headers, timeout, **kw))
+
+        if out.status_code == 304 and stored:
+            log.debug(f"{self}: Cache REVALIDATED for {path}")
+            fresh = self.cache_policy.freshen(stored, out.headers, request_headers)
+            if fresh: await self._store_cache(fresh)
+            return self._cached_response(fresh or stored)
+
+        cacheable = self.cache_policy.cacheable_request(method, request_headers)
+        entry = RequestEntryDC(
+            status=out.status_code,
+            method=method,
+            headers=self.headers.index,
+            url=path,
+            body=kw.get("json") or kw.get("data"),
+            response=out.body,
+            response_headers=out.headers,
+            key=key if cacheable else None
+        )
+        if cacheable:
+            entry = self.cache_policy.stamp(entry, request_headers) or entry
+            if entry.expires_at is None: entry.key = None  # not storable: logged, never served
+        elif method.upper() not in SAFE_METHODS and out.status_code < 400:
+            await self._invalidate(path)
+        await self._store_cache(entry)
+        return out
+
+    async def _send(self, route: str, method: str, path: str, headers: dict, timeout, **kw) -> recep_resp:
+        """A single HTTP attempt on the shared session, after waiting for the route's rate limit tokens"""
+        if self.rate_limit:
+            waited = await self.rate_limit.acquire(route)
+            if waited: log.debug(f"{self}: Rate limited {method.upper()} {path} for {waited:.2f}s")
+        request = recep_request(method=method, route=path, headers=self.headers.index)
+        t0 = time.perf_counter()
+        async with self.http.get().request(method.upper(), path, headers=headers, timeout=timeout, **kw) as res:
+            raw = await res.read()
+            out = recep_resp(
+                status_code=res.status,
+                headers=res.headers,  # copied into a dict only when read
+                raw=raw,  # decoded only when .body is read
+                content_type=res.content_type,
+                encoding=res.charset or "utf-8",
+                duration_ms=(time.perf_counter() - t0) * 1000
+            )
+        if self.rate_limit: self.rate_limit.observe(route, out.status_code, out.headers)
+        self.rlog.log(req=request, resp=out, route=route if route in self.routes.routes else None, size=len(raw))
+        return out
+
+    def _cached_response(self, entry: RequestEntryDC) -> recep_resp:
+        return recep_resp(
+            status_code=entry.status,
+            headers=entry.response_headers or {},
+            body=entry.response,
+            received_at=entry.timestamp
+        )
+
+    def _refresh_later(self, route: str, method: str, path: str, key: str, stored: RequestEntryDC, kw: dict):
+        """Background revalidation for stale-while-revalidate hits, at most one per key"""
+        if key in self.refreshing: return
 
-                self._store_cache(RequestEntryDC(
-                    status=out.status_code,
-                    method=method,
-                    headers=self.headers.index,
-                    url=path,
-                    body=kw.get("json") or kw.get("data"),
-                    response=out.body
-                ))
+        async def refresh():
+            try:
+                await self._fetch(route, method, path, key, stored, **dict(kw))
+            except Exception as e:
+                log.warning(f"{self}: Background refresh of {path} failed: {type(e).__name__}: {e}")
+            finally:
+                self.refreshing.pop(key, None)
 
-                return out
+        self.refreshing[key] = asyncio.get_running_loop().create_task(refresh())
 
-    def _store_cache(self, entry: RequestEntryDC):
+    async def _invalidate(self, path: str):
+        """A successful unsafe request (POST/PUT/DELETE...) expires what GET/HEAD cached for the same URL"""
+        keys = [cache_key(m, path) for m in self.cache_policy.methods]
+        now = datetime.utcnow()
+        if self.l1: self.l1.expire(keys, now)
         if hasattr(self, "db"):
-            self.table.c(entry.to_json())
+            for row in (self.writer.pending if self.writer else []):
+                if row["key"] in keys: row["expires_at"] = now
+            await self.table.au_many([{"key": k} for k in keys], {"expires_at": now})
         if hasattr(self, "redis"):
-            self.redis.create(entry.url, entry.to_json())
+            await self.redis.delete(*keys)
+
+    async def _store_cache(self, entry: RequestEntryDC):
+        if self.l1: self.l1.put(entry)
+        if hasattr(self, "db"):
+            if self.writer: await self.writer.put(entry.to_row())
+            else: await self.table.ac(entry.to_sql())
+            if time.monotonic() - self.evicted_at > self.cache_policy.evict_interval:
+                self.evicted_at = time.monotonic()
+                asyncio.get_running_loop().create_task(self.evict_expired())
+        if hasattr(self, "redis") and entry.key:
+            ttl = int((entry.stale_until - datetime.utcnow()).total_seconds()) + 1
+            await self.redis.create(entry.key, entry.to_bytes(), ttl=ttl)
+
+    async def _get_cache(self, key: str, request_headers: dict) -> Optional[RequestEntryDC]:
+        """Newest stored variant for a cache key whose Vary'd request headers match: L1 first, then the backend (promoted into L1)"""
+        matches = lambda vary: self.cache_policy.vary_matches(vary, request_headers)
+        if self.l1 and (hit := self.l1.get(key, matches)): return hit
+        found = await self._get_l2(key, matches)
+        if found and self.l1: self.l1.put(found, promoted=True)
+        return found
 
-    def _get_cache(self, url: str) -> Optional[recep_resp]:
+    async def _get_l2(self, key: str, matches) -> Optional[RequestEntryDC]:
         if hasattr(self, "db"):
-            with self.manager.session() as s:
-                row = self.table.r({"url": url}, session=s)
-                if row:
-                    dc = RequestEntryDC.from_sql(sql=row)
-                    return recep_resp(
-                        status_code=dc.status,
-                        headers=dc.headers or {},
-                        body=dc.response,
-                        received_at=dc.timestamp
-                    )
+            pending = self.writer.find(lambda r: r["key"] == key and matches(r["vary"])) if self.writer else None
+            if pending: return RequestEntryDC(**pending)
+            for row in await self.table.ar_all({"key": key}, order_by="-timestamp", limit=8):
+                if matches(row.vary): return RequestEntryDC.from_sql(sql=row)
         if hasattr(self, "redis"):
-            cached = self.redis.read(url)
+            cached = await self.redis.read(key)  # expired entries are gone through their TTL
             if cached:
-                dc = RequestEntryDC.from_json(cached)
-                return recep_resp(
-                    status_code=dc.status,
-                    headers=dc.headers or {},
-                    body=dc.response,
-                    received_at=dc.timestamp
-                )
+                dc = RequestEntryDC.from_bytes(cached)
+                if matches(dc.vary): return dc
         return None
 
+    async def evict_expired(self) -> int:
+        """Delete cache entries past their stale_until (rows never stored for caching are kept as the request log)"""
+        if not hasattr(self, "db"): return 0
+        n = await self.table.ad_before("stale_until", datetime.utcnow())
+        if n: log.debug(f"{self}: Evicted {n} expired cache entries")
+        return n
+
     async def get(self, route, append=None, format=None, force_refresh=False, **kw):
         return await self.request("get", route, append=append, format=format, force_refresh=force_refresh, **kw)
 
@@ -170,7 +294,31 @@ class ReceptionistManager:
         )
 
         if self.recep.callback:
-            if hasattr(self, "callback_table"): self.callback_table.c(entry.to_json())
+            if hasattr(self, "callback_table"): await self.callback_table.ac(entry.to_sql())
             elif hasattr(self, "redis_callback"): await self.redis_callback.create(f"{event}:{url}", entry.to_json())
             else: log.warning(f"{self}: Callback enabled but no storage backend found.")
-        else: log.warning(f"{self}: Callback method called but callback mode is off.")
\ No newline at end of file
+        else: log.warning(f"{self}: Callback method called but callback mode is off.")
+
+    def _close_at_exit(self):
+        """Interpreter exit without close(): write buffered cache rows through the sync engine and spill the request log"""
+        writer = getattr(self, "writer", None)
+        if writer is not None and writer.pending:
+            rows, writer.pending = writer.pending, []
+            try:
+                self.table.c_bulk(rows)
+                log.warning(f"{self}: Wrote {len(rows)} buffered cache rows at exit; await Receptionist.close() on shutdown instead")
+            except Exception as e:
+                log.error(f"{self}: Lost {len(rows)} buffered cache rows at exit: {type(e).__name__}: {e}")
+        self.rlog.flush()
+
+    async def close(self):
+        """Finish background refreshes, flush buffered cache writes and release pooled HTTP / database connections"""
+        atexit.unregister(self._close_at_exit)
+        if self.refreshing: await asyncio.gather(*self.refreshing.values(), return_exceptions=True)
+        await self.http.close()
+        if getattr(self, "writer", None): await self.writer.close()
+        self.rlog.flush()
+        if hasattr(self, "db"): await self.manager.dispose()
+        if hasattr(self, "redis_callback"): await self.redis_callback.close()
+        if hasattr(self, "redis"): await self.redis.close()
+        log.debug(f"{self}: Closed")
@@ -18,8 +18,25 @@ class Receptionist:
         callback (bool): If True, enables callback capture and storage logic.
         headers (headers): Default api_headers to use for outbound requests.
         routes (routes): Route mappings for outbound requests.
-        redis (bool): If True, uses Redis for request/callback storage.
+        redis (bool | dict): If set, uses Redis for the response cache and callbacks; a dict is passed to RedisManager
+            (url, max_connections, socket_timeout, compress_min, max_batch, client).
         db (bool): If True, uses SQLite for request/callback storage.
+        partition (str): "day" or "month" to split the SQLite request log into one file per period.
+        retention (int): Partitions to keep when partitioned; older ones are deleted as whole files.
+        write_behind (bool | dict): Batch SQLite cache writes in the background; a dict is passed to WriteBehind
+            (max_batch, flush_interval, max_pending, durability="best_effort"/"fsync", on_full). False writes inline.
+            Await close() on shutdown to flush it; rows still buffered at interpreter exit are written synchronously.
+        cache (CachePolicy | dict): HTTP caching rules for the response cache (default_ttl, stale_while_revalidate, ...).
+        l1 (bool | dict): In-process LRU in front of the SQLite / Redis cache; a dict is passed to L1Cache (max_bytes, max_entries).
+        single_flight (str): Coalesce concurrent identical requests into one upstream call: "get" (GET/HEAD),
+            "idempotent" (also PUT/DELETE/OPTIONS) or None to turn it off.
+        breaker (dict): Per-host CircuitBreaker options (failure_threshold, reset_timeout, half_open_probes;
+            enabled=False to turn breakers off). Route timeouts and retries live in routes.policies.
+        rate_limit (dict): Client-side token buckets: rate / burst for the whole receptionist and
+            routes={name: {"rate", "burst"}} per route. Calls queue FIFO for a token; X-RateLimit-* and Retry-After adjust them.
+        request_log (dict): RequestLog options: capacity (ring size), window (per-route percentile window),
+            spill (CSV path records are appended to before the ring overwrites them).
+        http (dict): Connection pool options for the receptionist's shared HTTPSession (limit, limit_per_host, dns_ttl, keepalive).
         manager (ReceptionistManager): Auto-initialized backend manager for this instance.
     """
     from back_end.receptionist.core import ReceptionistManager
@@ -29,8 +46,18 @@ class Receptionist:
     callback: bool = False
     headers: headers = field(default_factory=lambda: headers(index={}))
     routes: routes = field(default_factory=lambda: routes(base="", routes={}))
-    redis: bool = False
+    redis: bool | dict = False
     db: bool = False
+    partition: str | None = None
+    retention: int | None = None
+    write_behind: bool | dict = True
+    cache: dict | None = None
+    l1: bool | dict = True
+    http: dict | None = None
+    single_flight: str | None = "get"
+    breaker: dict | None = None
+    rate_limit: dict | None = None
+    request_log: dict | None = None
     manager: ReceptionistManager = None
 
     def __repr__(self):
@@ -42,4 +69,8 @@ class Receptionist:
         if not self.headers or not self.routes: log.warning(f"{self}: <self.api_headers={self.headers}> <api_routes={self.routes}>\n\n--RECEPTIONIST HELP--\nTry using initializing with api_headers of urls for easier request construction!\n")
         from back_end.receptionist.core import ReceptionistManager
         self.manager = ReceptionistManager.inst(self)
-        if not self.manager: raise RuntimeError(f"{self}: Failed to initialize self.manager!")
\ No newline at end of file
+        if not self.manager: raise RuntimeError(f"{self}: Failed to initialize self.manager!")
+
+    async def close(self):
+        """Flush buffered cache writes and the request log, then release connections; await it on shutdown"""
+        await self.manager.close()
\ No newline at end of file
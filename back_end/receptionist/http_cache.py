@@ -0,0 +1,160 @@
+import hashlib
+import json
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+FRESH = "fresh"
+STALE_WHILE_REVALIDATE = "stale-while-revalidate"
+STALE = "stale"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE"})
+
+HEURISTIC_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+"""Statuses cacheable without explicit freshness information (RFC 9110 15.1)"""
+
+def cache_key(method: str, url: str, body=None) -> str:
+    """method + url + sha256 of the request body; Vary'd request headers are matched per stored variant"""
+    h = hashlib.sha256(f"{method.upper()} {url}".encode())
+    if body is not None:
+        raw = body if isinstance(body, bytes) else (body.encode() if isinstance(body, str) else json.dumps(body, sort_keys=True, default=str).encode())
+        h.update(b"\0" + hashlib.sha256(raw).digest())
+    return h.hexdigest()
+
+def lower(headers: dict | None) -> dict:
+    return {str(k).lower(): v for k, v in (headers or {}).items()}
+
+def parse_cache_control(value: str | None) -> dict:
+    """'max-age=60, no-cache' -> {'max-age': 60, 'no-cache': True}"""
+    out = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if not name: continue
+        arg = arg.strip().strip('"')
+        out[name.lower()] = int(arg) if arg.isdigit() else (arg or True)
+    return out
+
+def http_date(value: str | None) -> datetime | None:
+    """HTTP-date -> naive UTC (the timestamps RequestEntrySQL stores)"""
+    if not value: return None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+@dataclass
+class CachePolicy:
+    """
+    HTTP caching rules for the receptionist's response cache (a private cache, RFC 9111).
+
+    Freshness comes from Cache-Control max-age, then Expires, then a heuristic (a fraction of the
+    Last-Modified age) for statuses that allow it, then default_ttl. Expired entries are served while a
+    background refresh runs for `stale-while-revalidate` seconds; after that, entries with an ETag or
+    Last-Modified are revalidated with a conditional request and kept keep_stale seconds for that.
+    """
+    methods: tuple = ("GET", "HEAD")
+    default_ttl: float = 300.0
+    """freshness for heuristically cacheable responses without validators or explicit lifetime"""
+    heuristic_fraction: float = 0.1
+    heuristic_max: float = 86_400.0
+    stale_while_revalidate: float = 0.0
+    """used when the response doesn't send its own stale-while-revalidate"""
+    keep_stale: float = 86_400.0
+    max_ttl: float | None = None
+    statuses: frozenset = HEURISTIC_STATUSES
+    evict_interval: float = 60.0
+    """seconds between expired-entry sweeps"""
+
+    @classmethod
+    def resolve(cls, policy: "CachePolicy | dict | None") -> "CachePolicy":
+        if isinstance(policy, cls): return policy
+        if policy is None: return cls()
+        if isinstance(policy, dict): return cls(**policy)
+        raise ValueError(f"[CachePolicy] Unknown policy: {policy!r}")
+
+    def cacheable_request(self, method: str, request_headers: dict) -> bool:
+        return method.upper() in self.methods and "no-store" not in parse_cache_control(lower(request_headers).get("cache-control"))
+
+    @staticmethod
+    def vary(response_headers: dict, request_headers: dict) -> dict | None:
+        """The request header values this response varies on; None when it varies on everything (Vary: *)"""
+        names = [v.strip().lower() for v in lower(response_headers).get("vary", "").split(",") if v.strip()]
+        if "*" in names: return None
+        req = lower(request_headers)
+        return {name: req.get(name) for name in names}
+
+    @staticmethod
+    def vary_matches(stored: dict | None, request_headers: dict) -> bool:
+        if not stored: return True
+        req = lower(request_headers)
+        return all(req.get(name) == value for name, value in stored.items())
+
+    def lifetime(self, status: int, response_headers: dict, now: datetime) -> tuple[float, float] | None:
+        """(fresh seconds, further seconds to keep) for a response, or None if it must not be stored"""
+        h = lower(response_headers)
+        cc = parse_cache_control(h.get("cache-control"))
+        if "no-store" in cc: return None
+        validators = "etag" in h or "last-modified" in h
+        date = http_date(h.get("date")) or now
+        if isinstance(cc.get("max-age"), int):
+            fresh = cc["max-age"]
+        elif "expires" in h:
+            expires = http_date(h["expires"])
+            fresh = (expires - date).total_seconds() if expires else 0
+        elif status in self.statuses:
+            modified = http_date(h.get("last-modified"))
+            fresh = min((date - modified).total_seconds() * self.heuristic_fraction, self.heuristic_max) if modified else self.default_ttl
+        else:
+            return None  # e.g. 5xx without explicit freshness
+        if "no-cache" in cc: fresh = 0
+        age = h.get("age")
+        fresh = max(0.0, fresh - (int(age) if str(age).isdigit() else 0))
+        if self.max_ttl is not None: fresh = min(fresh, self.max_ttl)
+        swr = 0 if ("must-revalidate" in cc or "no-cache" in cc) else cc.get("stale-while-revalidate", self.stale_while_revalidate)
+        swr = swr if isinstance(swr, (int, float)) else 0
+        keep = swr + (self.keep_stale if validators else 0)
+        if fresh <= 0 and keep <= 0: return None
+        return fresh, keep
+
+    def stamp(self, entry, request_headers: dict, now: datetime = None):
+        """entry with key-independent cache fields (vary, expires_at, stale_until) set, or None if not storable"""
+        now = now or datetime.utcnow()
+        life = self.lifetime(entry.status, entry.response_headers, now)
+        vary = self.vary(entry.response_headers, request_headers)
+        if life is None or vary is None: return None
+        fresh, keep = life
+        expires_at = now + timedelta(seconds=fresh)
+        return replace(entry, vary=vary or None, expires_at=expires_at, stale_until=expires_at + timedelta(seconds=keep))
+
+    def freshen(self, entry, response_headers: dict, request_headers: dict, now: datetime = None):
+        """A stored entry revalidated by a 304: its headers updated with the 304's, its lifetime restarted"""
+        merged = {**(entry.response_headers or {}), **{k: v for k, v in response_headers.items() if k.lower() != "content-length"}}
+        return self.stamp(replace(entry, response_headers=merged, timestamp=now or datetime.utcnow()), request_headers, now)
+
+    def state(self, entry, request_headers: dict, now: datetime = None) -> str:
+        now = now or datetime.utcnow()
+        req = parse_cache_control(lower(request_headers).get("cache-control"))
+        if "no-cache" in req or req.get("max-age") == 0: return STALE
+        if entry.expires_at and now < entry.expires_at: return FRESH
+        cc = parse_cache_control(lower(entry.response_headers).get("cache-control"))
+        if "must-revalidate" in cc or "no-cache" in cc: return STALE
+        swr = cc.get("stale-while-revalidate", self.stale_while_revalidate)
+        if entry.expires_at and isinstance(swr, (int, float)) and now < entry.expires_at + timedelta(seconds=swr):
+            return STALE_WHILE_REVALIDATE
+        return STALE
+
+    @staticmethod
+    def usable_on_error(entry) -> bool:
+        """Whether a stale entry may stand in when the upstream is unreachable (stale-if-error)"""
+        cc = parse_cache_control(lower(entry.response_headers).get("cache-control"))
+        return "must-revalidate" not in cc and "no-cache" not in cc
+
+    @staticmethod
+    def validators(entry) -> dict:
+        """Conditional request headers for revalidating a stored entry"""
+        h = lower(entry.response_headers)
+        out = {}
+        if "etag" in h: out["If-None-Match"] = h["etag"]
+        if "last-modified" in h: out["If-Modified-Since"] = h["last-modified"]
+        return out
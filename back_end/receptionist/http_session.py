@@ -0,0 +1,80 @@
+import asyncio
+from dataclasses import dataclass
+
+import aiohttp
+from loguru import logger as log
+
+@dataclass
+class HTTPSession:
+    """
+    One long-lived aiohttp.ClientSession per receptionist, created on first use.
+
+    Every route of the receptionist goes through the same TCPConnector, so calls to the same host reuse
+    kept-alive connections (and their TLS sessions) instead of a handshake per request; at most
+    limit_per_host connections are open to one host and resolved addresses are cached dns_ttl seconds.
+    The session belongs to the event loop that created it: used from another loop, a new one is made and
+    the old one is closed on its own loop (or, when that loop no longer runs, its sockets are dropped).
+    aiohttp speaks HTTP/1.1 only, so there is no HTTP/2 multiplexing; keep-alive pooling is the substitute.
+    """
+    limit: int = 100
+    limit_per_host: int = 16
+    dns_ttl: int = 300
+    keepalive: float = 30.0
+    name: str = "HTTPSession"
+
+    def __post_init__(self):
+        self.session: aiohttp.ClientSession | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.opened = 0
+
+    def __repr__(self):
+        state = "closed" if self.session is None or self.session.closed else "open"
+        return f"[{self.name}.HTTPSession {state} limit_per_host={self.limit_per_host}]"
+
+    @classmethod
+    def resolve(cls, options: "HTTPSession | dict | None", name: str = "HTTPSession") -> "HTTPSession":
+        if isinstance(options, cls): return options
+        return cls(name=name, **(options or {}))
+
+    def get(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.loop is not loop:
+            if self.session is not None and not self.session.closed: self._close_elsewhere(self.session, self.loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+            self.loop = loop
+            self.opened += 1
+            log.debug(f"{self}: Opened connection pool")
+        return self.session
+
+    def info(self) -> dict:
+        connector = self.session.connector if self.session is not None and not self.session.closed else None
+        return {
+            "open": connector is not None,
+            "sessions_opened": self.opened,
+            "connections": sum(len(c) for c in connector._conns.values()) if connector else 0,
+            "hosts": len(connector._conns) if connector else 0,
+        }
+
+    @staticmethod
+    def _close_elsewhere(session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop | None):
+        """Close a session owned by another loop: on that loop while it runs, otherwise by closing its transports directly"""
+        if loop is not None and loop.is_running():
+            return asyncio.run_coroutine_threadsafe(session.close(), loop)
+        if session.connector is not None: session.connector._close()  # a closed loop's sockets are left to it
+        return None
+
+    async def close(self):
+        session, loop, self.session = self.session, self.loop, None
+        if session is None or session.closed: return
+        if loop is asyncio.get_running_loop(): await session.close()
+        else:
+            done = self._close_elsewhere(session, loop)
+            if done is not None: await asyncio.wrap_future(done)
+        log.debug(f"{self}: Closed connection pool")
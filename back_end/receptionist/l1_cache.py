@@ -0,0 +1,115 @@
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable
+
+@dataclass
+class L1Stats:
+    hits: int = 0
+    misses: int = 0
+    promotions: int = 0
+    """L2 hits copied into L1"""
+    evictions: int = 0
+    expirations: int = 0
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return dict(vars(self), hit_rate=self.hits / lookups if lookups else 0.0)
+
+def entry_size(entry) -> int:
+    """Approximate bytes held by a RequestEntryDC: its body, response and headers as text, plus fixed overhead"""
+    size = 256 + len(entry.url)
+    for part in (entry.body, entry.response, entry.response_headers, entry.vary):
+        if part is None: continue
+        if isinstance(part, str): size += len(part)
+        elif isinstance(part, bytes): size += len(part)
+        else: size += len(json.dumps(part, default=str))
+    return size
+
+class L1Cache:
+    """
+    In-process LRU of response cache entries in front of the SQLite / Redis tier.
+
+    Keyed like the L2 (http_cache.cache_key), each key holding its Vary'd variants newest first.
+    Bounded both by entry count and by approximate bytes (entry_size, computed once per put);
+    the least recently used keys go first. Entries past their stale_until are dropped on lookup.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 10_000, max_variants: int = 4):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_variants = max_variants
+        self.lock = threading.Lock()
+        self.data: OrderedDict[str, list] = OrderedDict()  # key -> [(entry, size), ...] newest first
+        self.bytes = 0
+        self.stats = L1Stats()
+
+    def __repr__(self):
+        return f"[L1Cache keys={len(self.data)} bytes={self.bytes}/{self.max_bytes}]"
+
+    @classmethod
+    def resolve(cls, options: "L1Cache | dict | bool | None") -> "L1Cache | None":
+        if isinstance(options, cls): return options
+        if not options: return None
+        return cls(**options) if isinstance(options, dict) else cls()
+
+    def get(self, key: str, matches: Callable[[dict | None], bool], now: datetime = None):
+        """Newest variant of key whose vary matches, else None"""
+        now = now or datetime.utcnow()
+        with self.lock:
+            variants = self.data.get(key)
+            if variants:
+                live = [(e, n) for e, n in variants if e.stale_until is None or e.stale_until > now]
+                if len(live) != len(variants):
+                    self.stats.expirations += len(variants) - len(live)
+                    self.bytes -= sum(n for _, n in variants) - sum(n for _, n in live)
+                    if live: self.data[key] = variants = live
+                    else:
+                        del self.data[key]
+                        variants = None
+            if variants:
+                for entry, _ in variants:
+                    if matches(entry.vary):
+                        self.data.move_to_end(key)
+                        self.stats.hits += 1
+                        return entry
+            self.stats.misses += 1
+            return None
+
+    def put(self, entry, promoted: bool = False):
+        """Store entry as the newest variant of its key, replacing a variant with the same vary"""
+        if not entry.key: return
+        size = entry_size(entry)
+        if size > self.max_bytes: return
+        with self.lock:
+            previous = self.data.pop(entry.key, [])
+            variants = [(e, n) for e, n in previous if e.vary != entry.vary]
+            kept = [(entry, size)] + variants[:self.max_variants - 1]
+            self.bytes += sum(n for _, n in kept) - sum(n for _, n in previous)
+            self.data[entry.key] = kept
+            if promoted: self.stats.promotions += 1
+            self._evict()
+
+    def _evict(self):
+        while self.data and (self.bytes > self.max_bytes or len(self.data) > self.max_entries):
+            _, variants = self.data.popitem(last=False)
+            self.bytes -= sum(n for _, n in variants)
+            self.stats.evictions += 1
+
+    def expire(self, keys: list[str], now: datetime):
+        """Mark keys stale (an unsafe request changed the resource) without dropping their validators"""
+        with self.lock:
+            for key in keys:
+                if key in self.data:
+                    self.data[key] = [(replace(e, expires_at=now), n) for e, n in self.data[key]]
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.bytes = 0
+
+    def info(self) -> dict:
+        with self.lock:
+            return dict(self.stats.to_dict(), keys=len(self.data), bytes=self.bytes, max_bytes=self.max_bytes)
@@ -1,6 +1,10 @@
-from dataclasses import dataclass, asdict
+import csv
+import time
+from array import array
+from dataclasses import dataclass, asdict, fields
 from dataclasses import field
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, Any
 from typing import Optional
 
@@ -9,10 +13,126 @@ from pydantic import BaseModel
 from sqlalchemy import inspect
 from sqlmodel import SQLModel, Field, Column, JSON, Session
 from pydantic.dataclasses import dataclass as pydantic_dc
+from functools import cached_property
+from operator import attrgetter
+from urllib.parse import urlsplit
+
+from back_end.database.serialization import JSONDecodeError, dumps, loads
+
+@dataclass
+class Headers:
+    """
+    Container for HTTP index used in outgoing API requests.
+
+    Automatically ensures the presence of an 'Accept' header (defaults to 'application/json').
+    Useful for injecting standard index like Authorization, User-Agent, etc.
+
+    Example:
+        Headers(index={
+            "Authorization": "Bearer abc123",
+            "User-Agent": "my-client"
+        })
+    """
+    index: Dict[str, str]
+    """
+    A dictionary of HTTP index to include in the request.
+    Must have string keys and values. Will be validated and normalized.
+    """
+    accept: Optional[str] = None
+    """
+    Optional override for the Accept header.
+    If not provided, defaults to 'application/json'.
+    Injected into the index dict automatically during post-init.
+    """
+
+    def __post_init__(self):
+        self.accept = self.accept or "application/json"
+        self.index["Accept"] = self.accept
+        for k, v in self.index.items():
+            setattr(self, k.lower().replace("-", "_"), v)
+        if not self._validate(): log.error("[Headers] Validation failed")
+
+    def _validate(self) -> bool:
+        try:
+            if not isinstance(self.index, dict): raise TypeError
+            for k, v in self.index.items():
+                if not isinstance(k, str) or not isinstance(v, str): raise ValueError
+            # if hasattr(self, "authorization") and not self.authorization.startswith("Bearer "):
+            #    raise ValueError("Authorization must start with Bearer")
+        except Exception as e:
+            log.error(f"[Headers] Invalid index: {e}")
+            return False
+        return True
+
+    @cached_property
+    def as_dict(self):
+        return self.index
 
-routes = Routes
 
 @dataclass
+class Routes:
+    """
+    Defines a base URL and a mapping of route keys to endpoint paths.
+
+    Used to centralize route definitions and build full request URLs.
+    Allows access via dictionary-like syntax: urls["status"] → full path.
+
+    Example:
+        Routes(
+            base="https://api.example.com",
+            api_routes={"status": "/v1/status", "info": "/v1/info"}
+        )
+    """
+    base: str
+    """
+    The base URL for all api_routes (e.g., "https://api.example.com").
+    Should not end with a trailing slash.
+    """
+    routes: Dict[str, str]
+    """
+    Dictionary mapping route names to URL suffixes (e.g., {"status": "/v1/status"}).
+    Each value is appended to the base URL during resolution.
+    """
+    policies: Dict[str, Any] = field(default_factory=dict)
+    """
+    Timeouts / retries / bulkhead per route name, as RoutePolicy or its kwargs (e.g., {"status": {"retries": 5}}).
+    The "*" entry applies to every route without its own policy, including raw URLs.
+    """
+
+    def __post_init__(self):
+        if not self._validate(): log.error("[Routes] Validation failed")
+
+    def _validate(self) -> bool:
+        try:
+            if not isinstance(self.base, str) or not isinstance(self.routes, dict): raise TypeError
+            for k, v in self.routes.items():
+                if not isinstance(k, str) or not isinstance(v, str): raise ValueError
+        except Exception as e:
+            log.error(f"[Routes] Invalid api_routes: {e}")
+            return False
+        return True
+
+    def __getitem__(self, key: str) -> str:
+        """
+        Resolve a named route into a full URL.
+
+        Retrieves the full URL for a given route key by appending the mapped path
+        to the base URL defined in the instance.
+
+        Example:
+            urls["status"] -> "https://api.example.com/status/200"
+
+        :param key: The name of the route (must exist in self.api_routes)
+        :return: A full URL string composed of base + route path
+        :raises KeyError: If the provided key does not exist in the route map
+        """
+        if key not in self.routes: raise KeyError(f"Missing route: {key}")
+        return self.base + self.routes[key]
+
+headers = Headers
+routes = Routes
+
+@dataclass(slots=True)
 class ReceptionistRequest:
     method: str
     route: str
@@ -21,13 +141,65 @@ class ReceptionistRequest:
 
 recep_request = ReceptionistRequest
 
-@dataclass
+_UNSET = object()
+
 class ReceptionistResponse:
-    status_code: int
-    headers: dict
-    body: dict | str
-    duration_ms: float | None = None
-    received_at: datetime = field(default_factory=datetime.utcnow)
+    """
+    An upstream or cached response.
+
+    headers may be any mapping (aiohttp's CIMultiDictProxy is kept as received) and becomes a dict on first
+    access. Built with raw bytes instead of a body, the body is decoded on first access: JSON (orjson when
+    installed) for a json content type, text otherwise, falling back to text when the JSON is malformed.
+    """
+    __slots__ = ("status_code", "_headers", "_body", "raw", "content_type", "encoding", "duration_ms", "received_at")
+
+    def __init__(self, status_code: int, headers, body: dict | str = _UNSET, duration_ms: float | None = None,
+                 received_at: datetime | None = None, raw: bytes | None = None, content_type: str = "", encoding: str = "utf-8"):
+        self.status_code = status_code
+        self._headers = headers
+        self._body = body
+        self.raw = raw
+        self.content_type = content_type
+        self.encoding = encoding
+        self.duration_ms = duration_ms
+        self.received_at = received_at or datetime.utcnow()
+
+    def __repr__(self):
+        return f"ReceptionistResponse(status_code={self.status_code}, duration_ms={self.duration_ms}, received_at={self.received_at!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, ReceptionistResponse): return NotImplemented
+        return (self.status_code, self.headers, self.body) == (other.status_code, other.headers, other.body)
+
+    @property
+    def headers(self) -> dict:
+        if not isinstance(self._headers, dict): self._headers = dict(self._headers or {})
+        return self._headers
+
+    @headers.setter
+    def headers(self, value):
+        self._headers = value
+
+    @property
+    def body(self) -> dict | str:
+        if self._body is _UNSET: self._body, self.raw = self._decode(), None  # the decoded body replaces the bytes
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
+    def _decode(self) -> dict | str | None:
+        raw = self.raw or b""
+        if "json" in self.content_type:
+            if not raw.strip(): return None
+            try:
+                return loads(raw)
+            except (JSONDecodeError, UnicodeDecodeError) as e:
+                text = raw.decode(self.encoding, errors="replace")
+                log.warning(f"[ReceptionistResponse]: Bad response decode → {e} | Fallback body: {text[:200]}")
+                return text
+        return raw.decode(self.encoding, errors="replace")
 
 recep_resp = ReceptionistResponse
 
@@ -44,7 +216,7 @@ class RequestEntry(BaseModel):
         preview = str(self.body)[:200].replace("\n", "")
         return f"[{self.timestamp.isoformat()}] {self.method.upper()} {self.url} → {self.status} | body={preview}"
 
-@dataclass
+@dataclass(slots=True)
 class RequestEntryDC:
     status: int
     method: str
@@ -53,29 +225,26 @@ class RequestEntryDC:
     body: dict | str | None
     response: dict | str
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    key: str | None = None
+    """http_cache.cache_key of method + url + body"""
+    vary: dict | None = None
+    """request header values named by the response's Vary"""
+    response_headers: dict | None = None
+    expires_at: datetime | None = None
+    """fresh until"""
+    stale_until: datetime | None = None
+    """kept (for stale-while-revalidate / conditional revalidation) until; evicted after"""
+
+    def to_row(self) -> dict:
+        """Column values for a Core bulk insert (scrud c_bulk / ac_bulk); values are shared, not copied"""
+        return dict(zip(ENTRY_FIELDS, _entry_values(self)))
 
     def to_sql(self) -> "RequestEntrySQL":
-        return RequestEntrySQL(
-            status=self.status,
-            method=self.method,
-            headers=self.headers,
-            url=self.url,
-            body=self.body,
-            response=self.response,
-            timestamp=self.timestamp
-        )
+        return RequestEntrySQL(**self.to_row())
 
     @classmethod
     def from_sql(cls, sql: "RequestEntrySQL", session: Session | None = None) -> "RequestEntryDC":
-        return cls(
-            status=sql.status,
-            method=sql.method,
-            headers=sql.headers,
-            url=sql.url,
-            body=sql.body,
-            response=sql.response,
-            timestamp=sql.timestamp
-        )
+        return cls(*_entry_values(sql))
 
     def to_json(self) -> dict:
         return {
@@ -86,6 +255,11 @@ class RequestEntryDC:
             "body": self.body,
             "response": self.response,
             "timestamp": self.timestamp.isoformat(),
+            "key": self.key,
+            "vary": self.vary,
+            "response_headers": self.response_headers,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "stale_until": self.stale_until.isoformat() if self.stale_until else None,
         }
 
     @classmethod
@@ -98,8 +272,28 @@ class RequestEntryDC:
             body=data.get("body"),
             response=data["response"],
             timestamp=datetime.fromisoformat(data["timestamp"]),
+            key=data.get("key"),
+            vary=data.get("vary"),
+            response_headers=data.get("response_headers"),
+            expires_at=datetime.fromisoformat(data["expires_at"]) if data.get("expires_at") else None,
+            stale_until=datetime.fromisoformat(data["stale_until"]) if data.get("stale_until") else None,
         )
 
+    def to_bytes(self) -> bytes:
+        """Compact JSON straight from the slots (orjson walks the dataclass without an intermediate dict)"""
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | str) -> "RequestEntryDC":
+        values = loads(data)
+        for name in ENTRY_DATETIMES:
+            if values.get(name): values[name] = datetime.fromisoformat(values[name])
+        return cls(**values)
+
+ENTRY_FIELDS = tuple(f.name for f in fields(RequestEntryDC))
+ENTRY_DATETIMES = ("timestamp", "expires_at", "stale_until")
+_entry_values = attrgetter(*ENTRY_FIELDS)
+
 recep_entry = RequestEntryDC
 
 class RequestEntrySQL(SQLModel, table=True):
@@ -107,37 +301,164 @@ class RequestEntrySQL(SQLModel, table=True):
     status: int
     method: str
     headers: dict | None = Field(default=None, sa_column=Column(JSON))
-    url: str
+    url: str = Field(index=True)  # cache lookups filter on url
     body: dict | str | None = Field(default=None, sa_column=Column(JSON))
     response: dict | str = Field(sa_column=Column(JSON))
     timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
+    key: Optional[str] = Field(default=None, index=True)  # cache lookups filter on key
+    vary: dict | None = Field(default=None, sa_column=Column(JSON))
+    response_headers: dict | None = Field(default=None, sa_column=Column(JSON))
+    expires_at: Optional[datetime] = None
+    stale_until: Optional[datetime] = Field(default=None, index=True)  # eviction sweeps on stale_until
 
     def __str__(self):
         preview = str(self.body)[:200].replace("\n", "")
         return f"[{self.timestamp.isoformat()}] {self.method.upper()} {self.url} → {self.status} | body={preview}"
 
 
+METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CALLBACK")
+
+class _Window:
+    """The last n latencies and error flags of one route"""
+
+    def __init__(self, n: int):
+        self.latency = array("f", bytes(4 * n))
+        self.errors = array("B", bytes(n))
+        self.n = n
+        self.count = 0
+
+    def add(self, latency_ms: float, error: bool):
+        i = self.count % self.n
+        self.latency[i] = latency_ms
+        self.errors[i] = error
+        self.count += 1
+
+    def summary(self) -> dict:
+        size = min(self.count, self.n)
+        ordered = sorted(self.latency[:size])
+        pct = lambda p: ordered[min(size - 1, int(round(p / 100 * (size - 1))))] if size else None
+        return {"requests": self.count, "window": size, "p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99),
+                "error_rate": sum(self.errors[:size]) / size if size else 0.0}
+
 @dataclass
 class RequestLog:
-    #from back_end.receptionist.core import ReceptionistManager
+    """
+    Fixed-capacity ring buffer of the receptionist's upstream calls.
+
+    Each call is a compact record (timestamp, status, method, URL id, route id, latency, response size) in
+    array-backed columns; URLs and routes are interned, bodies are never kept. Every route also keeps a
+    rolling window of its last `window` latencies and errors for p50 / p95 / p99 and error rate. With
+    spill set, records are appended to that CSV file in batches before the ring overwrites them.
+    """
     manager: Any #ReceptionistManager
-    entries: list[RequestEntryDC] = field(default_factory=list)
-
-    def log(self, req: ReceptionistRequest, resp: ReceptionistResponse):
-        entry = RequestEntryDC(
-            status=resp.status_code,
-            method=req.method,
-            headers=req.headers,
-            url=req.route,
-            body=req.body,
-            response=resp.body
-        )
-        self.entries.append(entry)
-        if entry.status == 200: log.success(f"{self}: {entry.status} | {entry.response}")
-        else: log.warning(f"{self}: {entry.status} | {entry.response}")
+    capacity: int = 4096
+    window: int = 1024
+    spill: Path | str | None = None
+
+    def __post_init__(self):
+        n = self.capacity
+        self.timestamps = array("d", bytes(8 * n))
+        self.statuses = array("H", bytes(2 * n))
+        self.methods = array("B", bytes(n))
+        self.url_ids = array("I", bytes(4 * n))
+        self.route_ids = array("I", bytes(4 * n))
+        self.latencies = array("f", bytes(4 * n))
+        self.sizes = array("I", bytes(4 * n))
+        self.urls: dict[str, int] = {}
+        self.url_names: list[str] = []
+        self.routes: dict[str, int] = {}
+        self.route_names: list[str] = []
+        self.windows: dict[str, _Window] = {}
+        self.total = 0
+        self.spilled = 0
+        if self.spill: self.spill = Path(self.spill)
 
     def __repr__(self):
-        return f"{self.manager}.[RequestLog: {len(self.entries)} entries]"
+        return f"{self.manager}.[RequestLog: {self.count}/{self.capacity} entries]"
+
+    @property
+    def count(self) -> int:
+        return min(self.total, self.capacity)
+
+    @staticmethod
+    def _intern(value: str, ids: dict, names: list) -> int:
+        i = ids.get(value)
+        if i is None:
+            i = ids[value] = len(names)
+            names.append(value)
+        return i
+
+    def log(self, req: ReceptionistRequest, resp: ReceptionistResponse, route: str | None = None, size: int = 0):
+        if self.spill and self.total - self.spilled >= self.capacity: self.flush()
+        if len(self.url_names) > 2 * self.capacity: self._compact()
+        route = route or urlsplit(req.route).netloc
+        method = req.method.upper()
+        latency = resp.duration_ms or 0.0
+        i = self.total % self.capacity
+        self.timestamps[i] = time.time()
+        self.statuses[i] = resp.status_code
+        self.methods[i] = METHODS.index(method) if method in METHODS else len(METHODS)
+        self.url_ids[i] = self._intern(req.route, self.urls, self.url_names)
+        self.route_ids[i] = self._intern(route, self.routes, self.route_names)
+        self.latencies[i] = latency
+        self.sizes[i] = min(size, 0xFFFFFFFF)
+        self.total += 1
+        if route not in self.windows: self.windows[route] = _Window(self.window)
+        self.windows[route].add(latency, resp.status_code >= 400)
+        line = f"{self}: {resp.status_code} {method} {req.route} | {latency:.1f}ms {size}B"
+        if resp.status_code < 400: log.success(line)
+        else: log.warning(line)
+
+    def _compact(self):
+        """Drop interned URLs no live record points at"""
+        live = sorted({self.url_ids[self._slot(k)] for k in range(self.total - self.count, self.total)})
+        remap = {old: new for new, old in enumerate(live)}
+        self.url_names = [self.url_names[old] for old in live]
+        self.urls = {url: i for i, url in enumerate(self.url_names)}
+        for k in range(self.total - self.count, self.total):
+            slot = self._slot(k)
+            self.url_ids[slot] = remap[self.url_ids[slot]]
+
+    def _slot(self, k: int) -> int:
+        return k % self.capacity
+
+    def record(self, k: int) -> dict:
+        i = self._slot(k)
+        m = self.methods[i]
+        return {
+            "timestamp": self.timestamps[i],
+            "route": self.route_names[self.route_ids[i]],
+            "method": METHODS[m] if m < len(METHODS) else "OTHER",
+            "status": self.statuses[i],
+            "url": self.url_names[self.url_ids[i]],
+            "latency_ms": round(self.latencies[i], 3),
+            "size": self.sizes[i],
+        }
+
+    def records(self, last: int | None = None) -> list[dict]:
+        """The newest `last` records (all kept ones by default), oldest first"""
+        n = self.count if last is None else min(last, self.count)
+        return [self.record(k) for k in range(self.total - n, self.total)]
+
+    def stats(self, route: str | None = None) -> dict:
+        """Rolling latency percentiles and error rate, per route or for one"""
+        if route is not None: return self.windows[route].summary() if route in self.windows else {}
+        return {name: w.summary() for name, w in self.windows.items()}
+
+    def flush(self):
+        """Append the records not yet spilled to the spill file"""
+        if not self.spill: return
+        start = max(self.spilled, self.total - self.capacity)
+        if start >= self.total: return
+        if self.spilled < start: log.warning(f"{self}: {start - self.spilled} records overwritten before spilling")
+        fields = ("timestamp", "route", "method", "status", "url", "latency_ms", "size")
+        new = not self.spill.exists()
+        self.spill.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill.open("a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            if new: writer.writeheader()
+            writer.writerows(self.record(k) for k in range(start, self.total))
+        self.spilled = self.total
 
 # --- pydantic redis/json model ---
 class CallbackEntry(BaseModel):
@@ -0,0 +1,189 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from loguru import logger as log
+
+from back_end.receptionist.resilience import retry_after
+
+QUOTA_HEADERS = {
+    "limit": ("x-ratelimit-limit", "ratelimit-limit"),
+    "remaining": ("x-ratelimit-remaining", "ratelimit-remaining"),
+    "reset": ("x-ratelimit-reset", "ratelimit-reset"),
+}
+
+def quota(headers: dict) -> dict:
+    """X-RateLimit-* / RateLimit-* values as numbers; reset becomes seconds from now (epoch values are converted)"""
+    h = {str(k).lower(): v for k, v in (headers or {}).items()}
+    out = {}
+    for name, keys in QUOTA_HEADERS.items():
+        value = next((h[k] for k in keys if k in h), None)
+        if value is None: continue
+        try:
+            out[name] = float(str(value).split(",")[0].split(";")[0].strip())
+        except ValueError:
+            continue
+    if out.get("reset", 0) > 1e9: out["reset"] = max(0.0, out["reset"] - time.time())
+    return out
+
+@dataclass
+class BucketStats:
+    acquired: int = 0
+    waited: int = 0
+    """acquisitions that had to queue"""
+    wait_s: float = 0.0
+    max_depth: int = 0
+    pauses: int = 0
+    """times upstream quota headers emptied or paused the bucket"""
+
+class TokenBucket:
+    """
+    rate tokens per second up to burst; acquire() takes one, queueing FIFO when the bucket is empty.
+
+    Waiters are released in arrival order by a single timer, so nobody starves and nothing fails: a
+    request waits for its token instead of provoking a 429. observe() adapts to the upstream's view of
+    the quota: a lower X-RateLimit-Remaining drains the bucket, and the remaining quota is spread over the
+    time to X-RateLimit-Reset; pause() (Retry-After) stops releases until the given time.
+    """
+
+    def __init__(self, rate: float, burst: float = None, name: str = "bucket"):
+        self.base_rate = self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.name = name
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.adapted_until = 0.0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.timer: asyncio.TimerHandle | None = None
+        self.stats = BucketStats()
+
+    def __repr__(self):
+        return f"[TokenBucket {self.name} rate={self.rate:g}/s tokens={self.tokens:.1f} queued={len(self.waiters)}]"
+
+    def _refill(self, now: float):
+        if self.adapted_until and now >= self.adapted_until:
+            self.rate, self.adapted_until = self.base_rate, 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _take(self, now: float) -> bool:
+        self._refill(now)
+        if now < self.blocked_until or self.tokens < 1: return False
+        self.tokens -= 1
+        return True
+
+    async def acquire(self) -> float:
+        """Take a token, waiting in line if needed; returns the seconds waited"""
+        self.stats.acquired += 1
+        if not self.waiters and self._take(time.monotonic()): return 0.0
+        t0 = time.monotonic()
+        done = asyncio.get_running_loop().create_future()
+        self.waiters.append(done)
+        self.stats.max_depth = max(self.stats.max_depth, len(self.waiters))
+        self._schedule()
+        try:
+            await done
+        except asyncio.CancelledError:
+            if not done.done() or done.cancelled():
+                try: self.waiters.remove(done)
+                except ValueError: pass
+            else:
+                self.tokens += 1  # released just as we were cancelled: give the token back
+            self._schedule()
+            raise
+        waited = time.monotonic() - t0
+        self.stats.waited += 1
+        self.stats.wait_s += waited
+        return waited
+
+    def _schedule(self):
+        if self.timer is not None or not self.waiters: return
+        now = time.monotonic()
+        self._refill(now)
+        delay = max(self.blocked_until - now, (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0, 0.0)
+        self.timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self):
+        self.timer = None
+        now = time.monotonic()
+        while self.waiters and self._take(now):
+            done = self.waiters.popleft()
+            if done.done(): self.tokens += 1
+            else: done.set_result(None)
+        self._schedule()
+
+    def pause(self, seconds: float):
+        """Release nothing for the next seconds (Retry-After / exhausted quota)"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        if now + seconds <= self.blocked_until: return
+        self.blocked_until = now + seconds
+        self.stats.pauses += 1
+        log.warning(f"{self}: Upstream quota exhausted, pausing {seconds:.1f}s")
+
+    def observe(self, remaining: float = None, reset: float = None):
+        """Fold the upstream's remaining quota (and seconds until it resets) into the bucket"""
+        now = time.monotonic()
+        self._refill(now)
+        if remaining is None: return
+        self.tokens = min(self.tokens, remaining)
+        if reset is None or reset <= 0: return
+        if remaining < 1:
+            self.pause(reset)
+        elif remaining / reset < self.rate:  # spread what is left of the window instead of bursting into a 429
+            self.rate, self.adapted_until = remaining / reset, now + reset
+
+    def info(self) -> dict:
+        return dict(vars(self.stats), rate=self.rate, base_rate=self.base_rate, tokens=round(self.tokens, 2),
+                    queue_depth=len(self.waiters), paused_s=max(0.0, self.blocked_until - time.monotonic()))
+
+class RateLimiter:
+    """
+    Client-side throttling for one receptionist: an optional receptionist-wide bucket plus per-route buckets.
+
+        rate_limit={"rate": 10, "burst": 20, "routes": {"search": {"rate": 1}}}
+
+    A call takes a token from its route's bucket, then from the receptionist's. Quota headers and
+    Retry-After on a response adjust the most specific bucket the call went through.
+    """
+
+    def __init__(self, rate: float = None, burst: float = None, routes: dict = None, name: str = "RateLimiter"):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst, name=name) if rate else None
+        self.routes = {route: TokenBucket(name=f"{name}.{route}", **cfg) for route, cfg in (routes or {}).items()}
+
+    def __repr__(self):
+        return f"[{self.name}.RateLimiter]"
+
+    @classmethod
+    def resolve(cls, options: "RateLimiter | dict | None", name: str = "RateLimiter") -> "RateLimiter | None":
+        if isinstance(options, cls): return options
+        return cls(name=name, **options) if options else None
+
+    def buckets(self, route: str) -> list[TokenBucket]:
+        return [b for b in (self.routes.get(route), self.bucket) if b is not None]
+
+    async def acquire(self, route: str) -> float:
+        waited = 0.0
+        for bucket in self.buckets(route):
+            waited += await bucket.acquire()
+        return waited
+
+    def observe(self, route: str, status: int, headers: dict):
+        buckets = self.buckets(route)
+        if not buckets: return
+        bucket = buckets[0]
+        q = quota(headers)
+        if q: bucket.observe(q.get("remaining"), q.get("reset"))
+        if status in (429, 503):
+            wait = retry_after(headers)
+            if wait is None and status == 429: wait = q.get("reset", 1.0)
+            if wait: bucket.pause(wait)
+
+    def info(self) -> dict:
+        out = {route: b.info() for route, b in self.routes.items()}
+        if self.bucket is not None: out["*"] = self.bucket.info()
+        return out
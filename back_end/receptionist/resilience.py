@@ -0,0 +1,206 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+import aiohttp
+from loguru import logger as log
+
+from back_end.receptionist.http_cache import http_date
+from back_end.receptionist.single_flight import SCOPES
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+RETRYABLE_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+class CircuitOpen(Exception):
+    """The host's circuit breaker is open; the call was not attempted"""
+
+class BulkheadFull(Exception):
+    """The route's concurrency limit stayed saturated for bulkhead_wait seconds"""
+
+@dataclass
+class RoutePolicy:
+    """
+    Timeouts, retries and isolation for the calls of one route (Routes.policies[name], "*" for the default).
+
+    Only idempotent methods are retried: on connection errors, timeouts and retry_statuses, with full-jitter
+    exponential backoff (uniform in [0, min(backoff_max, backoff_base * 2**attempt)]), or the server's
+    Retry-After when it sends one no longer than max_retry_after. bulkhead caps concurrent calls on the route.
+    """
+    connect_timeout: float | None = 5.0
+    read_timeout: float | None = 30.0
+    total_timeout: float | None = None
+    retries: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 10.0
+    retry_statuses: frozenset = RETRY_STATUSES
+    retry_methods: frozenset = SCOPES["idempotent"]
+    max_retry_after: float = 60.0
+    bulkhead: int | None = None
+    bulkhead_wait: float | None = None
+    """seconds to wait for a bulkhead slot before BulkheadFull; None waits indefinitely"""
+
+    @classmethod
+    def resolve(cls, policy: "RoutePolicy | dict | None") -> "RoutePolicy":
+        if isinstance(policy, cls): return policy
+        return cls(**(policy or {}))
+
+    @property
+    def timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=self.total_timeout, sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+def retry_after(headers: dict) -> float | None:
+    """Retry-After as seconds from now (delta-seconds or HTTP-date)"""
+    value = next((v for k, v in (headers or {}).items() if k.lower() == "retry-after"), None)
+    if value is None: return None
+    value = str(value).strip()
+    if value.isdigit(): return float(value)
+    when = http_date(value)
+    return max(0.0, (when - datetime.utcnow()).total_seconds()) if when else None
+
+@dataclass
+class CircuitBreaker:
+    """
+    Per-host breaker: failure_threshold consecutive failures open it for reset_timeout seconds, then
+    half_open_probes calls are let through; a success closes it, a failure opens it again. A probe that ends
+    with neither (cancelled, or a non-network error) returns its slot through release().
+    """
+    host: str
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    half_open_probes: int = 1
+
+    def __post_init__(self):
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.trips = 0
+        self.rejected = 0
+
+    def __repr__(self):
+        return f"[CircuitBreaker {self.host} {self.state}]"
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state, self.probes = "half_open", 0
+            log.info(f"{self}: Probing")
+        if self.state == "half_open":
+            if self.probes >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self.probes += 1
+        return True
+
+    def success(self):
+        if self.state != "closed": log.success(f"{self}: Closed after a successful probe")
+        self.state, self.failures = "closed", 0
+
+    def failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+                log.warning(f"{self}: Opened after {self.failures} failure(s)")
+            self.state, self.opened_at = "open", time.monotonic()
+
+    def release(self):
+        """An allowed call that was cancelled or failed before reaching the host: let another probe through"""
+        if self.state == "half_open" and self.probes > 0: self.probes -= 1
+
+    def to_dict(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+@dataclass
+class Resilience:
+    """Applies RoutePolicies, per-host CircuitBreakers and per-route bulkheads to a receptionist's upstream calls"""
+    policies: dict = field(default_factory=dict)
+    breaker: dict = field(default_factory=dict)
+    """CircuitBreaker options (failure_threshold, reset_timeout, half_open_probes); {"enabled": False} turns breakers off"""
+    name: str = "Resilience"
+
+    def __post_init__(self):
+        self.policies = {route: RoutePolicy.resolve(p) for route, p in self.policies.items()}
+        self.default = self.policies.get("*", RoutePolicy())
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.bulkheads: dict[str, asyncio.Semaphore] = {}
+        self.counters = {"calls": 0, "retries": 0, "timeouts": 0, "errors": 0, "short_circuited": 0, "bulkhead_rejected": 0}
+
+    def __repr__(self):
+        return f"[{self.name}.Resilience]"
+
+    def policy(self, route: str) -> RoutePolicy:
+        return self.policies.get(route, self.default)
+
+    def circuit(self, url: str) -> CircuitBreaker | None:
+        options = dict(self.breaker)
+        if not options.pop("enabled", True): return None
+        host = urlsplit(url).netloc
+        if host not in self.breakers: self.breakers[host] = CircuitBreaker(host, **options)
+        return self.breakers[host]
+
+    def _bulkhead(self, route: str, policy: RoutePolicy) -> asyncio.Semaphore | None:
+        if not policy.bulkhead: return None
+        if route not in self.bulkheads: self.bulkheads[route] = asyncio.Semaphore(policy.bulkhead)
+        return self.bulkheads[route]
+
+    async def call(self, route: str, method: str, url: str, send: Callable[[aiohttp.ClientTimeout], Awaitable]):
+        """send(timeout) makes one attempt and returns a response with .status_code and .headers"""
+        policy = self.policy(route)
+        bulkhead = self._bulkhead(route, policy)
+        if bulkhead is None: return await self._attempts(policy, method, url, send)
+        try:
+            await asyncio.wait_for(bulkhead.acquire(), timeout=policy.bulkhead_wait)
+        except asyncio.TimeoutError:
+            self.counters["bulkhead_rejected"] += 1
+            raise BulkheadFull(f"{self}: {route} has {policy.bulkhead} calls in flight") from None
+        try:
+            return await self._attempts(policy, method, url, send)
+        finally:
+            bulkhead.release()
+
+    async def _attempts(self, policy: RoutePolicy, method: str, url: str, send):
+        retryable = method.upper() in policy.retry_methods
+        breaker = self.circuit(url)
+        attempt = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                self.counters["short_circuited"] += 1
+                raise CircuitOpen(f"{breaker}: not calling {url}")
+            self.counters["calls"] += 1
+            try:
+                out = await send(policy.timeout)
+            except RETRYABLE_ERRORS as e:
+                self.counters["timeouts" if isinstance(e, asyncio.TimeoutError) else "errors"] += 1
+                if breaker is not None: breaker.failure()
+                if not retryable or attempt >= policy.retries: raise
+                delay = policy.backoff(attempt)
+                log.warning(f"{self}: {method.upper()} {url} failed ({type(e).__name__}), retry {attempt + 1}/{policy.retries} in {delay:.2f}s")
+            except BaseException:
+                if breaker is not None: breaker.release()  # cancelled or not the host's fault: never strand a probe slot
+                raise
+            else:
+                if breaker is not None:
+                    if out.status_code >= 500: breaker.failure()
+                    else: breaker.success()
+                if out.status_code not in policy.retry_statuses or not retryable or attempt >= policy.retries: return out
+                wait = retry_after(out.headers)
+                if wait is not None and wait > policy.max_retry_after: return out
+                delay = wait if wait is not None else policy.backoff(attempt)
+                log.warning(f"{self}: {method.upper()} {url} returned {out.status_code}, retry {attempt + 1}/{policy.retries} in {delay:.2f}s")
+            self.counters["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def info(self) -> dict:
+        return dict(self.counters, breakers={host: b.to_dict() for host, b in self.breakers.items()},
+                    bulkheads={route: s._value for route, s in self.bulkheads.items()})
@@ -0,0 +1,71 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+SCOPES = {
+    "get": frozenset({"GET", "HEAD"}),
+    "idempotent": frozenset({"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"}),
+}
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    """calls that ran the shared work (a cache lookup, and the upstream call when it misses)"""
+    coalesced: int = 0
+    """calls that waited on a leader's result instead"""
+    errors: int = 0
+    max_followers: int = 0
+
+    def to_dict(self) -> dict:
+        total = self.leaders + self.coalesced
+        return dict(vars(self), coalesced_rate=self.coalesced / total if total else 0.0)
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent calls with the same key share one in-flight upstream call.
+
+    The first caller (the leader) starts the call as a task; callers arriving before it finishes await
+    the same task and get the same result or exception. The task is shielded, so a cancelled caller
+    doesn't cancel the call for everyone else. Only methods in the scope ("get" or "idempotent") coalesce.
+    """
+
+    def __init__(self, scope: str = "get"):
+        if scope not in SCOPES: raise ValueError(f"[SingleFlight] scope must be one of {tuple(SCOPES)}")
+        self.scope = scope
+        self.methods = SCOPES[scope]
+        self.calls: dict[str, asyncio.Task] = {}
+        self.followers: dict[str, int] = {}
+        self.stats = SingleFlightStats()
+
+    def __repr__(self):
+        return f"[SingleFlight scope={self.scope} in_flight={len(self.calls)}]"
+
+    @classmethod
+    def resolve(cls, scope: "SingleFlight | str | None") -> "SingleFlight | None":
+        if isinstance(scope, cls): return scope
+        return cls(scope) if scope else None
+
+    def applies(self, method: str) -> bool:
+        return method.upper() in self.methods
+
+    async def do(self, key: str, call: Callable[[], Awaitable]):
+        task = self.calls.get(key)
+        if task is None:
+            self.stats.leaders += 1
+            task = self.calls[key] = asyncio.get_running_loop().create_task(call())
+            self.followers[key] = 0
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.stats.coalesced += 1
+            self.followers[key] += 1
+            self.stats.max_followers = max(self.stats.max_followers, self.followers[key])
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+            self.followers.pop(key, None)
+        if not task.cancelled() and task.exception() is not None: self.stats.errors += 1
+
+    def info(self) -> dict:
+        return dict(self.stats.to_dict(), scope=self.scope, in_flight=len(self.calls))
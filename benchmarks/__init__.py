@@ -0,0 +1,89 @@
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from loguru import logger as log
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+def quiet(level: str = "WARNING"):
+    """Benchmarks run with every service at verbose=False; also mute loguru below level"""
+    log.remove()
+    log.add(sys.stderr, level=level)
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).parent)
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+def percentiles(samples: list[float]) -> dict:
+    """Latency summary in milliseconds"""
+    if not samples: return {}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+def timed(fn: Callable, n: int) -> dict:
+    """Call fn n times synchronously and summarize per-call latency"""
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return percentiles(samples)
+
+async def run_concurrent(call: Callable[[], Awaitable], total: int, concurrency: int) -> dict:
+    """Issue total calls with at most concurrency in flight; report latency percentiles and throughput"""
+    samples = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            t0 = time.perf_counter()
+            await call()
+            samples.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - t0
+    out = percentiles(samples)
+    out.update(concurrency=concurrency, elapsed_s=elapsed, throughput_rps=total / elapsed)
+    return out
+
+def write_results(name: str, results: dict, out: Path = None) -> Path:
+    """Write results as JSON keyed by commit so runs can be diffed across history"""
+    commit = git_commit()
+    out = out or RESULTS_DIR / f"{name}-{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    out.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    log.success(f"[Benchmarks]: Wrote {name} results to {out}")
+    return out
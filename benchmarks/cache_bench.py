@@ -0,0 +1,81 @@
+"""
+Receptionist response-cache hit latency, with and without the in-process L1.
+
+    python -m benchmarks.cache_bench [--requests 5000] [--keys 100]
+
+A local aiohttp upstream serves `Cache-Control: max-age=3600` JSON; every key is fetched once to fill
+the cache, then `--requests` cached GETs over `--keys` URLs run at several concurrencies against
+  - l2: the SQLite tier only (l1=False)
+  - l1: the LRU in front of it (l1=True)
+plus the cost of a cold L1 that promotes every key from SQLite once.
+"""
+import argparse
+import asyncio
+import itertools
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+from benchmarks import quiet, run_concurrent, write_results
+from back_end.receptionist.factory import Receptionist
+from back_end.receptionist.models import Headers, Routes
+
+CONCURRENCIES = (1, 8, 32, 64)
+PAYLOAD = {"items": [{"id": i, "name": f"item-{i}", "tags": ["a", "b", "c"]} for i in range(50)]}
+
+async def upstream(port: int = 0):
+    async def handler(request):
+        return web.json_response(PAYLOAD, headers={"Cache-Control": "max-age=3600"})
+
+    app = web.Application()
+    app.router.add_get("/{key}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+def receptionist(name: str, base: str, **options) -> Receptionist:
+    return Receptionist(name=name, dir=Path(tempfile.mkdtemp(prefix="fastcontainer-cache-")), db=True,
+                        routes=Routes(base=base, routes={}), headers=Headers(index={}), write_behind=False, **options)
+
+async def bench(base: str, tier: str, total: int, keys: int) -> dict:
+    m = receptionist(f"cache_bench_{tier}", base, l1=tier == "l1").manager
+    urls = [f"{base}/k{i}" for i in range(keys)]
+    for url in urls: await m.get(url)
+    out = {}
+    for concurrency in CONCURRENCIES:
+        cycle = itertools.cycle(urls)
+        out[f"c{concurrency}"] = await run_concurrent(lambda: m.get(next(cycle)), total, concurrency)
+    if m.l1:
+        m.l1.clear()
+        cycle = itertools.cycle(urls)
+        out["cold_l1_promotion"] = await run_concurrent(lambda: m.get(next(cycle)), keys, 1)
+        out["l1_info"] = m.l1.info()
+    await m.close()
+    return out
+
+async def run(total: int, keys: int) -> dict:
+    runner, base = await upstream()
+    try:
+        results = {"requests": total, "keys": keys}
+        for tier in ("l2", "l1"):
+            results[tier] = await bench(base, tier, total, keys)
+        results["speedup_p50"] = {c: results["l2"][c]["p50_ms"] / max(results["l1"][c]["p50_ms"], 1e-9)
+                                  for c in (f"c{n}" for n in CONCURRENCIES)}
+        return results
+    finally:
+        await runner.cleanup()
+
+def main(total: int, keys: int, out: Path = None):
+    quiet("ERROR")
+    return write_results("cache", asyncio.run(run(total, keys)), out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark receptionist cache hits (L1 vs SQLite)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--keys", type=int, default=100)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(args.requests, args.keys, args.out)
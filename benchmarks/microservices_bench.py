@@ -0,0 +1,163 @@
+"""
+Benchmarks for the microservices package.
+
+    python -m benchmarks.microservices_bench [--requests 2000] [--out results.json]
+
+Spins up Microservice instances on random local ports and measures:
+  - APIClient call latency percentiles and throughput at several concurrencies
+  - Microservice.api regeneration cost versus route count (and the cached path)
+  - PublicApp page serving
+  - Gateway-style proxying through ThreadedServer.forward
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+from benchmarks import quiet, run_concurrent, timed, write_results
+
+CONCURRENCIES = (1, 8, 32, 64)
+ROUTE_COUNTS = (10, 100, 500)
+
+def wait_until_up(url: str, timeout: float = 10.0):
+    import urllib.error
+    import urllib.request
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=0.5)
+            return
+        except urllib.error.HTTPError:
+            return  # any HTTP answer means the listener is up
+        except Exception:
+            time.sleep(0.05)
+    raise RuntimeError(f"[Benchmarks]: {url} never came up")
+
+def launch(server, probe: str = "/ping"):
+    server.thread.start()
+    wait_until_up(f"{server.base_url}{probe}")
+    return server
+
+async def bench_api_client(total: int) -> dict:
+    from microservices.core import Microservice
+
+    server = Microservice(alias="bench_api", verbose=False)
+
+    @server.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @server.get("/users/{user_id}")
+    async def get_user(user_id: str):
+        return {"user_id": user_id, "name": "John"}
+
+    launch(server)
+    api = server.api
+    await api.get_user("warmup")
+
+    out = {}
+    for c in CONCURRENCIES:
+        out[f"c{c}"] = await run_concurrent(lambda: api.get_user("123"), total=total, concurrency=c)
+    return out
+
+def bench_api_regeneration(repeats: int = 50) -> dict:
+    from microservices.core import APIClient, Microservice
+
+    out = {}
+    for n in ROUTE_COUNTS:
+        server = Microservice(alias=f"bench_regen_{n}", verbose=False)
+        for i in range(n):
+            async def endpoint(): return {}
+            endpoint.__name__ = f"route_{i}"
+            server.get(f"/route/{i}")(endpoint)
+        out[f"routes_{n}"] = {
+            "regenerate": timed(lambda: APIClient(server), repeats),
+            "cached": timed(lambda: server.api, repeats * 20),
+        }
+    return out
+
+async def bench_public_app(total: int) -> dict:
+    cwd = Path(tempfile.mkdtemp(prefix="fastcontainer-bench-"))
+    (cwd / "index").mkdir()
+    (cwd / "static_pages").mkdir()
+    (cwd / "index" / "index.html").write_text(
+        "<html><body>{% for p in pages %}<a href='/page/{{ p.name }}'>{{ p.title }}</a>{% endfor %}</body></html>"
+    )
+    for i in range(20):
+        (cwd / "static_pages" / f"page_{i}.html").write_text(f"<html><title>Page {i}</title><body>{'x' * 2048}</body></html>")
+    os.chdir(cwd)
+
+    from microservices.core import PublicApp
+    app = PublicApp(verbose=False)  # starts its own thread
+    wait_until_up(f"{app.base_url}/")
+
+    async with aiohttp.ClientSession() as ses:
+        async def fetch(path):
+            async with ses.get(f"{app.base_url}{path}") as res:
+                await res.read()
+
+        out = {}
+        for c in CONCURRENCIES:
+            out[f"index_c{c}"] = await run_concurrent(lambda: fetch("/"), total=total, concurrency=c)
+            out[f"page_c{c}"] = await run_concurrent(lambda: fetch("/page/page_7.html"), total=total, concurrency=c)
+    return out
+
+async def bench_gateway(total: int) -> dict:
+    """
+    Gateway needs a live cloudflared tunnel, so this measures the proxy hop it relies on:
+    a front Microservice forwarding through ThreadedServer.forward to a backend, against direct calls.
+    """
+    from fastapi import Request
+    from microservices.core import Microservice
+
+    backend = Microservice(alias="bench_backend", verbose=False)
+    front = Microservice(alias="bench_front", verbose=False)
+
+    @backend.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @front.get("/ping")
+    async def front_ping():
+        return {"ok": True}
+
+    @front.api_route("/proxy/{path:path}", methods=["GET", "POST"])
+    async def proxy(path: str, request: Request):
+        return await backend.forward(f"/{path}", request)
+
+    launch(backend)
+    launch(front)
+
+    async with aiohttp.ClientSession() as ses:
+        async def fetch(url):
+            async with ses.get(url) as res:
+                await res.read()
+
+        out = {}
+        for c in CONCURRENCIES:
+            out[f"direct_c{c}"] = await run_concurrent(lambda: fetch(f"{backend.base_url}/ping"), total=total, concurrency=c)
+            out[f"proxied_c{c}"] = await run_concurrent(lambda: fetch(f"{front.base_url}/proxy/ping"), total=total, concurrency=c)
+    return out
+
+async def main(total: int, out: Path = None):
+    quiet()
+    t0 = time.perf_counter()
+    results = {
+        "api_client": await bench_api_client(total),
+        "api_regeneration": bench_api_regeneration(),
+        "gateway_proxy": await bench_gateway(total),
+        "public_app": await bench_public_app(total),  # last: it chdirs into a scratch directory
+    }
+    results["wall_s"] = time.perf_counter() - t0
+    return write_results("microservices", results, out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the microservices package")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument("--out", type=Path, default=None, help="JSON output path (default: benchmarks/results/microservices-<commit>.json)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.out))
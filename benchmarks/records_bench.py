@@ -0,0 +1,145 @@
+"""
+Allocation and per-call overhead of the receptionist's hot-path records.
+
+    python -m benchmarks.records_bench [--iterations 20000]
+
+Compares the slotted records in back_end.receptionist.models with the eager shapes they replaced
+(plain dataclasses, dict(res.headers) copy, str-then-json body decode, to_json dict + json.dumps):
+  response:   build a response from an aiohttp-style header proxy and raw bytes, then read status only
+  read:       the same, then read headers and body
+  entry:      build a RequestEntryDC and its bulk-insert row
+  serialize:  entry -> bytes; deserialize: bytes -> entry
+Each case reports mean microseconds per call and the peak bytes allocated during one call (tracemalloc).
+  retained:   bytes and allocated blocks held per live response + entry pair (10k kept alive)
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from benchmarks import quiet, write_results
+from back_end.receptionist.models import RequestEntryDC, recep_resp
+
+RAW = json.dumps({"items": [{"id": i, "name": f"item-{i}", "tags": ["a", "b", "c"]} for i in range(50)]}).encode()
+HEADERS = CIMultiDictProxy(CIMultiDict({"Content-Type": "application/json", "Cache-Control": "max-age=60", "ETag": '"abc"',
+                                        "Date": "Mon, 19 Oct 2026 12:00:00 GMT", "Content-Length": str(len(RAW))}))
+
+@dataclass
+class EagerResponse:
+    status_code: int
+    headers: dict
+    body: dict | str
+    duration_ms: float | None = None
+    received_at: datetime = field(default_factory=datetime.utcnow)
+
+@dataclass
+class EagerEntry:
+    status: int
+    method: str
+    headers: dict | None
+    url: str
+    body: dict | str | None
+    response: dict | str
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    key: str | None = None
+    vary: dict | None = None
+    response_headers: dict | None = None
+    expires_at: datetime | None = None
+    stale_until: datetime | None = None
+
+    def to_json(self) -> dict:
+        return {"status": self.status, "method": self.method, "api_headers": self.headers, "url": self.url, "body": self.body,
+                "response": self.response, "timestamp": self.timestamp.isoformat(), "key": self.key, "vary": self.vary,
+                "response_headers": self.response_headers, "expires_at": None, "stale_until": None}
+
+def eager_response() -> EagerResponse:
+    return EagerResponse(200, dict(HEADERS), json.loads(RAW.decode()), duration_ms=1.0)
+
+def slotted_response(raw: bytes = RAW):
+    return recep_resp(200, HEADERS, raw=raw, content_type="application/json", duration_ms=1.0)
+
+ENTRY = dict(status=200, method="get", headers={"Accept": "application/json"}, url="https://api.example.com/items", body=None,
+             response=json.loads(RAW), response_headers=dict(HEADERS), key="GET https://api.example.com/items")
+
+def per_call(fn, n: int, samples: int = 200) -> dict:
+    for _ in range(min(n, 1000)): fn()
+    t0 = time.perf_counter()
+    for _ in range(n): fn()
+    us = (time.perf_counter() - t0) / n * 1e6
+    peaks = []
+    tracemalloc.start()
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return {"us_per_call": round(us, 3), "peak_bytes_per_call": sorted(peaks)[len(peaks) // 2]}
+
+def retained(make, n: int = 10000) -> dict:
+    tracemalloc.start()
+    before, blocks = tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+    kept = [make() for _ in range(n)]
+    after, blocks_after = tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+    tracemalloc.stop()
+    del kept
+    return {"bytes_per_record": (after - before) // n, "blocks_per_record": round((blocks_after - blocks) / n, 2)}
+
+def run(n: int) -> dict:
+    eager_entry = EagerEntry(**ENTRY)
+    slotted_entry = RequestEntryDC(**ENTRY)
+    eager_blob = json.dumps(eager_entry.to_json()).encode()
+    slotted_blob = slotted_entry.to_bytes()
+
+    def eager_read():
+        r = eager_response()
+        return r.headers, r.body
+
+    def slotted_read():
+        r = slotted_response()
+        return r.headers, r.body
+
+    cases = {
+        "response": (eager_response, slotted_response),
+        "read": (eager_read, slotted_read),
+        "entry": (lambda: dict(vars(EagerEntry(**ENTRY))), lambda: RequestEntryDC(**ENTRY).to_row()),
+        "serialize": (lambda: json.dumps(eager_entry.to_json()).encode(), slotted_entry.to_bytes),
+        "deserialize": (lambda: RequestEntryDC.from_json(json.loads(eager_blob)), lambda: RequestEntryDC.from_bytes(slotted_blob)),
+    }
+    out = {}
+    for name, (eager, slotted) in cases.items():
+        e, s = per_call(eager, n), per_call(slotted, n)
+        out[name] = {"eager": e, "slotted": s, "speedup": round(e["us_per_call"] / s["us_per_call"], 2)}
+    def kept(response):
+        return response, response.headers, response.body, RequestEntryDC(200, "get", None, "u", None, None)
+
+    fresh = lambda: bytes(bytearray(RAW))  # every upstream response has its own bytes
+    out["retained"] = {
+        "eager": retained(lambda: (eager_response(), EagerEntry(200, "get", None, "u", None, None))),
+        "slotted_read": retained(lambda: kept(slotted_response(fresh()))),
+        "slotted_unread": retained(lambda: (slotted_response(fresh()), RequestEntryDC(200, "get", None, "u", None, None))),
+    }
+    out["instance_bytes"] = {
+        "eager": {"response": sys.getsizeof(eager_response()) + sys.getsizeof(vars(eager_response())),
+                  "entry": sys.getsizeof(eager_entry) + sys.getsizeof(vars(eager_entry))},
+        "slotted": {"response": sys.getsizeof(slotted_response()), "entry": sys.getsizeof(slotted_entry)},
+    }
+    out["blob_bytes"] = {"eager": len(eager_blob), "slotted": len(slotted_blob)}
+    return out
+
+def main(n: int, out: Path = None):
+    quiet("ERROR")
+    return write_results("records", run(n), out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark receptionist hot-path record allocation and overhead")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(args.iterations, args.out)
@@ -0,0 +1,87 @@
+"""
+RedisManager round trips and write pipelining, against fakeredis (default) or a real server.
+
+    python -m benchmarks.redis_bench [--writes 2000] [--url redis://localhost:6379/0]
+
+  round_trip:  values of every shape read back unchanged: JSON, raw bytes (including ones starting with
+               b"x", zlib's header byte), compressed and uncompressed, with and without TTL
+  writes:      --writes concurrent create() calls (pipelined per loop turn) vs the same SETs awaited one by one
+Each scenario's expected behaviour is asserted (check()), so a regression fails the run.
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from benchmarks import quiet, write_results
+from back_end.database.redis_manager import RedisManager
+
+VALUES = {
+    "json": {"id": 1, "tags": ["a", "b"], "name": "x-ray"},
+    "json_big": {"pad": "y" * 10_000},
+    "raw": b"raw-bytes",
+    "raw_x": b"xyz-raw",
+    "raw_zlib_like": b"x\x9c not compressed",
+    "raw_big": b"x" * 10_000,
+    "empty": b"",
+}
+
+def client(url: str | None):
+    if url: return None  # RedisManager connects on first use
+    from fakeredis.aioredis import FakeRedis  # pip install fakeredis
+
+    return FakeRedis()
+
+async def round_trip(url: str | None) -> dict:
+    rm = RedisManager("bench_rt", url=url or "redis://localhost:6379/0", compress_min=4096, client=client(url))
+    out = {}
+    for name, value in VALUES.items():
+        await rm.create(name, value, ttl=60 if name.startswith("json") else None)
+        data = await rm.read(name)
+        out[name] = data == value if isinstance(value, bytes) else await rm.read_json(name) == value
+    out["ttl"] = await rm.ttl("json")
+    out["missing"] = await rm.read("nope")
+    out["info"] = rm.info()
+    await rm.delete(*VALUES)
+    await rm.close()
+    return out
+
+async def writes(url: str | None, n: int) -> dict:
+    rm = RedisManager("bench_w", url=url or "redis://localhost:6379/0", client=client(url))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(rm.create(f"p{i}", {"i": i}, ttl=60) for i in range(n)))
+    pipelined = time.perf_counter() - t0
+    pipelines = rm.stats.pipelines
+    t0 = time.perf_counter()
+    for i in range(n): await rm.create(f"s{i}", {"i": i}, ttl=60)
+    sequential = time.perf_counter() - t0
+    out = {"writes": n, "pipelined_s": pipelined, "pipelines": pipelines, "sequential_s": sequential,
+           "speedup": sequential / max(pipelined, 1e-9), "read_back": await rm.read_json(f"p{n - 1}")}
+    await rm.close()
+    return out
+
+def check(results: dict):
+    """What each scenario exists to show"""
+    rt = results["round_trip"]
+    assert all(rt[name] for name in VALUES), rt
+    assert 0 < rt["ttl"] <= 60 and rt["missing"] is None, rt
+    assert rt["info"]["compressed"] == 2, rt["info"]  # json_big and raw_big
+    w = results["writes"]
+    assert w["pipelines"] <= -(-w["writes"] // 256) and w["read_back"] == {"i": w["writes"] - 1}, w
+
+async def run(n: int, url: str | None) -> dict:
+    results = {"backend": url or "fakeredis", "round_trip": await round_trip(url), "writes": await writes(url, n)}
+    check(results)
+    return results
+
+def main(n: int, url: str = None, out: Path = None):
+    quiet("ERROR")
+    return write_results("redis", asyncio.run(run(n, url)), out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RedisManager round trips and write pipelining")
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--url", default=None, help="a real Redis server; fakeredis when omitted")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(args.writes, args.url, args.out)
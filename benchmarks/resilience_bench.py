@@ -0,0 +1,205 @@
+"""
+ReceptionistManager resilience against a local fault-injecting upstream.
+
+    python -m benchmarks.resilience_bench [--requests 200]
+
+The stub server injects the faults; each scenario reports what the caller saw:
+  flaky:       30% of calls answer 503; success rate with retries=0 vs retries=3
+  hang:        the upstream never answers; read_timeout bounds the caller's latency
+  retry_after: 429 + Retry-After: 1 on the first call; the retry waits for it
+  down:        nothing listens on the port; the circuit breaker opens and short-circuits later calls
+  bulkhead:    slow upstream hit with 50 concurrent calls; peak server-side concurrency stays at the cap
+  probe:       a half-open probe that is cancelled, or fails before reaching the host, frees its slot for the next call
+Each scenario's expected behaviour is asserted (check()), so a regression fails the run.
+"""
+import argparse
+import asyncio
+import random
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from benchmarks import percentiles, quiet, write_results
+from back_end.receptionist.core import ReceptionistManager
+from back_end.receptionist.factory import Receptionist
+from back_end.receptionist.models import Headers, Routes
+from back_end.receptionist.resilience import CircuitOpen
+
+NO_STORE = {"Cache-Control": "no-store"}
+
+class FaultStub:
+    """aiohttp app whose routes fail on purpose"""
+
+    def __init__(self, flaky_rate: float = 0.3):
+        self.flaky_rate = flaky_rate
+        self.active = 0
+        self.peak = 0
+        self.throttled = set()
+        self.app = web.Application()
+        self.app.router.add_get("/flaky", self.flaky)
+        self.app.router.add_get("/hang", self.hang)
+        self.app.router.add_get("/throttle/{id}", self.throttle)
+        self.app.router.add_get("/slow", self.slow)
+
+    async def flaky(self, request):
+        if random.random() < self.flaky_rate: return web.json_response({"error": "injected"}, status=503, headers=NO_STORE)
+        return web.json_response({"ok": True}, headers=NO_STORE)
+
+    async def hang(self, request):
+        await asyncio.sleep(3600)
+
+    async def throttle(self, request):
+        key = request.match_info["id"]
+        if key not in self.throttled:
+            self.throttled.add(key)
+            return web.json_response({"error": "slow down"}, status=429, headers={"Retry-After": "1", **NO_STORE})
+        return web.json_response({"ok": True}, headers=NO_STORE)
+
+    async def slow(self, request):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.05)
+            return web.json_response({"ok": True}, headers=NO_STORE)
+        finally:
+            self.active -= 1
+
+    async def start(self) -> tuple[web.AppRunner, str]:
+        runner = web.AppRunner(self.app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def manager(name: str, base: str, policies: dict, **options) -> ReceptionistManager:
+    recep = Receptionist(name=name, dir=Path(tempfile.mkdtemp(prefix="fastcontainer-resilience-")), db=True, single_flight=None,
+                         routes=Routes(base=base, routes={"flaky": "/flaky", "hang": "/hang", "slow": "/slow"}, policies=policies),
+                         headers=Headers(index={}), **options)
+    return recep.manager
+
+async def outcome(call) -> tuple[str, float]:
+    t0 = time.perf_counter()
+    try:
+        out = await call()
+        result = "ok" if out.status_code < 400 else str(out.status_code)
+    except Exception as e:
+        result = type(e).__name__
+    return result, time.perf_counter() - t0
+
+def summarize(outcomes: list) -> dict:
+    counts = {}
+    for result, _ in outcomes: counts[result] = counts.get(result, 0) + 1
+    return {"outcomes": counts, "success_rate": counts.get("ok", 0) / len(outcomes), "latency": percentiles([t for _, t in outcomes])}
+
+async def scenario_flaky(base: str, n: int) -> dict:
+    out = {}
+    for retries in (0, 3):
+        m = manager(f"flaky{retries}", base, {"flaky": {"retries": retries, "backoff_base": 0.01}}, breaker={"enabled": False})
+        out[f"retries={retries}"] = summarize([await outcome(lambda: m.get("flaky")) for _ in range(n)])
+        await m.close()
+    return out
+
+async def scenario_hang(base: str) -> dict:
+    m = manager("hang", base, {"hang": {"read_timeout": 0.5, "retries": 1, "backoff_base": 0.01}})
+    out = summarize([await outcome(lambda: m.get("hang")) for _ in range(3)])
+    await m.close()
+    return out
+
+async def scenario_retry_after(base: str) -> dict:
+    m = manager("retry_after", base, {"*": {"retries": 2}})
+    out = summarize([await outcome(lambda i=i: m.get(f"{base}/throttle/{i}")) for i in range(3)])
+    await m.close()
+    return out
+
+async def scenario_down(n: int) -> dict:
+    base = f"http://127.0.0.1:{free_port()}"
+    m = manager("down", base, {"*": {"retries": 0, "connect_timeout": 0.5}}, breaker={"failure_threshold": 5, "reset_timeout": 60})
+    outcomes = [await outcome(lambda: m.get("flaky")) for _ in range(n)]
+    out = summarize(outcomes)
+    out["short_circuited_latency"] = percentiles([t for r, t in outcomes if r == CircuitOpen.__name__])
+    out["resilience"] = m.resilience.info()
+    await m.close()
+    return out
+
+async def scenario_bulkhead(stub: FaultStub, base: str, cap: int = 4) -> dict:
+    m = manager("bulkhead", base, {"slow": {"bulkhead": cap}})
+    stub.peak = 0
+    outcomes = await asyncio.gather(*(outcome(lambda: m.get("slow")) for _ in range(50)))
+    out = summarize(outcomes)
+    out.update(cap=cap, server_peak_concurrency=stub.peak)
+    await m.close()
+    return out
+
+async def scenario_probe(base: str) -> dict:
+    m = manager("probe", base, {"hang": {"read_timeout": 0.2, "retries": 0}}, breaker={"failure_threshold": 1, "reset_timeout": 0.1})
+
+    async def reopen():
+        await outcome(lambda: m.get("hang"))  # one timeout opens the breaker
+        await asyncio.sleep(0.15)  # past reset_timeout: the next call is the half-open probe
+
+    out = {}
+    await reopen()
+    probe = asyncio.get_running_loop().create_task(m.get("hang"))
+    await asyncio.sleep(0.05)
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+    out["after_cancel"], _ = await outcome(lambda: m.get("slow"))
+    await reopen()
+    out["bad_probe"], _ = await outcome(lambda: m.get("slow", headers={"X-Bad": "a\nb"}))  # rejected by aiohttp, never sent
+    out["after_error"], _ = await outcome(lambda: m.get("slow"))
+    out["breaker"] = m.resilience.info()["breakers"]
+    await m.close()
+    return out
+
+def check(results: dict, n: int):
+    """What each scenario exists to show"""
+    flaky = results["flaky"]
+    assert flaky["retries=3"]["success_rate"] >= flaky["retries=0"]["success_rate"], flaky
+    assert flaky["retries=3"]["success_rate"] > 0.9, flaky["retries=3"]
+    hang = results["hang"]
+    assert "ok" not in hang["outcomes"] and hang["latency"]["max_ms"] < 2000, hang  # 2 attempts of read_timeout=0.5
+    retry = results["retry_after"]
+    assert retry["success_rate"] == 1.0 and retry["latency"]["min_ms"] >= 900, retry  # waited out Retry-After: 1
+    down = results["down"]
+    assert down["resilience"]["short_circuited"] == min(n, 50) - 5 and down["outcomes"].get("ok", 0) == 0, down
+    bulkhead = results["bulkhead"]
+    assert bulkhead["server_peak_concurrency"] <= bulkhead["cap"] and bulkhead["success_rate"] == 1.0, bulkhead
+    probe = results["probe"]
+    assert probe["after_cancel"] == "ok" and probe["after_error"] == "ok", probe
+    assert probe["bad_probe"] != CircuitOpen.__name__, probe
+
+async def run(n: int) -> dict:
+    stub = FaultStub()
+    runner, base = await stub.start()
+    try:
+        results = {
+            "flaky": await scenario_flaky(base, n),
+            "hang": await scenario_hang(base),
+            "retry_after": await scenario_retry_after(base),
+            "down": await scenario_down(min(n, 50)),
+            "bulkhead": await scenario_bulkhead(stub, base),
+            "probe": await scenario_probe(base),
+        }
+    finally:
+        await runner.cleanup()
+    check(results, n)
+    return results
+
+def main(n: int, out: Path = None):
+    quiet("ERROR")
+    return write_results("resilience", asyncio.run(run(n)), out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fault-injection run of the receptionist resilience layer")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(args.requests, args.out)
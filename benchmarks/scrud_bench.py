@@ -0,0 +1,143 @@
+"""
+scrud write-path benchmarks.
+
+    python -m benchmarks.scrud_bench [--rows 2000] [--ops 500] [--bulk-rows 100000]
+
+update/delete: the old read-then-write path (SELECT in one session, mutate in a second)
+against the set-based UPDATE/DELETE ... WHERE ... RETURNING path, reporting statements,
+transactions and latency per operation.
+
+bulk insert: the old c(list) path (add_all + one refresh SELECT per row) against c_bulk
+with and without returned ids / materialized objects, in rows per second.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, Field
+
+from benchmarks import percentiles, quiet, write_results
+from back_end.database.sqlite_manager import Database
+
+class ScrudRow(SQLModel, table=True):
+    __tablename__ = "scrud_row"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: str = Field(index=True)
+    value: str
+    hits: int = 0
+
+class RoundTrips:
+    """Counts statements and commits on every engine of a DatabaseManager"""
+
+    def __init__(self, manager):
+        self.statements = 0
+        self.commits = 0
+        for engine in {manager.engine, manager.read_engine}:
+            event.listen(engine, "before_cursor_execute", self._statement)
+            event.listen(engine, "commit", self._commit)
+
+    def _statement(self, *_):
+        self.statements += 1
+
+    def _commit(self, *_):
+        self.commits += 1
+
+    def snapshot(self) -> tuple[int, int]:
+        return self.statements, self.commits
+
+def fresh_db(rows: int):
+    db = Database(name="scrud", dir=Path(tempfile.mkdtemp(prefix="fastcontainer-scrud-")), input_model=ScrudRow)
+    model = db.manager.models.scrudrow
+    model.c([{"key": f"k{i}", "value": "x" * 32} for i in range(rows)])
+    return db.manager, model
+
+def legacy_update(manager, model, match: dict, changes: dict):
+    obj = model.r(match)
+    with manager.session() as s:
+        s.add(obj)
+        for k, v in changes.items():
+            setattr(obj, k, v)
+        s.commit()
+        s.refresh(obj)
+    return obj
+
+def legacy_delete(manager, model, match: dict):
+    obj = model.r(match)
+    if obj:
+        with manager.session() as s:
+            s.delete(obj)
+            s.commit()
+    return obj
+
+def measure(counter: RoundTrips, ops: int, fn) -> dict:
+    samples = []
+    s0, c0 = counter.snapshot()
+    for i in range(ops):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    s1, c1 = counter.snapshot()
+    return dict(percentiles(samples), statements_per_op=(s1 - s0) / ops, commits_per_op=(c1 - c0) / ops)
+
+def bench_update_delete(rows: int, ops: int) -> dict:
+    out = {}
+    manager, model = fresh_db(rows)
+    counter = RoundTrips(manager)
+    out["update_legacy"] = measure(counter, ops, lambda i: legacy_update(manager, model, {"key": f"k{i}"}, {"hits": 1}))
+    out["update_set_based"] = measure(counter, ops, lambda i: model.u({"key": f"k{i}"}, {"hits": 2}))
+    out["update_bulk_x10"] = measure(counter, ops // 10, lambda i: model.u_many([{"key": f"k{i * 10 + j}"} for j in range(10)], {"hits": 3}))
+    out["delete_legacy"] = measure(counter, ops, lambda i: legacy_delete(manager, model, {"key": f"k{i}"}))
+    out["delete_set_based"] = measure(counter, ops, lambda i: model.d({"key": f"k{ops + i}"}))
+    out["delete_bulk_x10"] = measure(counter, ops // 10, lambda i: model.d_many([{"key": f"k{2 * ops + i * 10 + j}"} for j in range(10)]))
+    return out
+
+def legacy_bulk_create(manager, model, data: list):
+    with manager.session() as s:
+        objs = [model(**item) for item in data]
+        s.add_all(objs)
+        s.commit()
+        for obj in objs:
+            s.refresh(obj)
+    return objs
+
+def bench_bulk_insert(n: int) -> dict:
+    data = [{"key": f"k{i}", "value": "x" * 32} for i in range(n)]
+    out = {}
+    runs = {
+        "legacy_add_all_refresh": lambda manager, model: legacy_bulk_create(manager, model, data),
+        "c_list": lambda manager, model: model.c(data),
+        "c_bulk": lambda manager, model: model.c_bulk(data),
+        "c_bulk_return_ids": lambda manager, model: model.c_bulk(data, return_ids=True),
+        "c_bulk_materialize": lambda manager, model: model.c_bulk(data, materialize=True),
+    }
+    for name, run in runs.items():
+        manager, model = fresh_db(0)
+        t0 = time.perf_counter()
+        run(manager, model)
+        elapsed = time.perf_counter() - t0
+        out[name] = {"rows": n, "elapsed_s": elapsed, "rows_per_s": n / elapsed}
+    base = out["legacy_add_all_refresh"]["rows_per_s"]
+    for v in out.values(): v["speedup"] = v["rows_per_s"] / base
+    return out
+
+def main(rows: int, ops: int, bulk_rows: int, out: Path = None):
+    quiet("ERROR")
+    results = {
+        "rows": rows,
+        "ops": ops,
+        "update_delete": bench_update_delete(rows, ops),
+        "bulk_insert": bench_bulk_insert(bulk_rows),
+    }
+    return write_results("scrud", results, out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scrud write paths")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--bulk-rows", type=int, default=100_000)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(args.rows, args.ops, args.bulk_rows, args.out)
@@ -0,0 +1,84 @@
+"""
+Concurrent read/write throughput of DatabaseManager under the stock and tuned SQLite profiles.
+
+    python -m benchmarks.sqlite_bench [--writers 4] [--readers 8] [--seconds 5]
+
+Writers insert through scrud `.c()`, readers filter through scrud `.r()`, all from plain threads
+the way ThreadedServer handlers hit the database.
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+from benchmarks import percentiles, quiet, write_results
+from back_end.database.pragmas import SQLiteProfile
+from back_end.database.sqlite_manager import Database
+
+class BenchRow(SQLModel, table=True):
+    __tablename__ = "bench_row"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: str = Field(index=True)
+    value: str
+
+def _worker(fn, stop: threading.Event, samples: list, errors: list):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            fn()
+            samples.append(time.perf_counter() - t0)
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+def run_profile(profile: SQLiteProfile, writers: int, readers: int, seconds: float, seed_rows: int = 2_000) -> dict:
+    db = Database(name="bench", dir=Path(tempfile.mkdtemp(prefix="fastcontainer-sqlite-")), input_model=BenchRow, profile=profile)
+    model = db.manager.models.benchrow
+    model.c([{"key": f"k{i}", "value": "x" * 64} for i in range(seed_rows)])
+
+    rng = random.Random(0)
+    stop = threading.Event()
+    w_samples, r_samples, w_errors, r_errors = [], [], [], []
+
+    def write():
+        model.c({"key": f"k{rng.randrange(seed_rows)}", "value": "y" * 64})
+
+    def read():
+        model.r({"key": f"k{rng.randrange(seed_rows)}"})
+
+    threads = [threading.Thread(target=_worker, args=(write, stop, w_samples, w_errors)) for _ in range(writers)]
+    threads += [threading.Thread(target=_worker, args=(read, stop, r_samples, r_errors)) for _ in range(readers)]
+    for t in threads: t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads: t.join()
+
+    return {
+        "profile": profile.to_dict(),
+        "writes": dict(percentiles(w_samples), ops_per_s=len(w_samples) / seconds, errors=len(w_errors)),
+        "reads": dict(percentiles(r_samples), ops_per_s=len(r_samples) / seconds, errors=len(r_errors)),
+    }
+
+def main(writers: int, readers: int, seconds: float, out: Path = None):
+    quiet()
+    results = {"writers": writers, "readers": readers, "seconds": seconds}
+    for name, profile in (("stock", SQLiteProfile.stock()), ("tuned", SQLiteProfile.tuned())):
+        results[name] = run_profile(profile, writers, readers, seconds)
+    results["speedup"] = {
+        op: results["tuned"][op]["ops_per_s"] / max(results["stock"][op]["ops_per_s"], 1e-9)
+        for op in ("writes", "reads")
+    }
+    return write_results("sqlite", results, out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager SQLite profiles")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(args.writers, args.readers, args.seconds, args.out)
@@ -0,0 +1,115 @@
+"""
+Database startup cost with many receptionists.
+
+    python -m benchmarks.startup_bench [--receptionists 100] [--tables 5]
+
+receptionists: one Database per receptionist, like ReceptionistManager builds them, timing
+construction, first `.models` access (migration + scrud binding) and a re-open of the same files.
+
+models file: every receptionist pointing at an identical `<name>-db-models.py`, comparing the old
+exec_module-per-Database load against the registry's load-once-per-content-hash.
+"""
+import argparse
+import importlib.util
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from sqlalchemy import MetaData
+from sqlalchemy.exc import SAWarning
+
+from benchmarks import percentiles, quiet, write_results
+from back_end.database.registry import registry, table_models
+from back_end.database.scrud import scrud
+from back_end.database.sqlite_manager import Database
+from back_end.receptionist.models import CallbackEntrySQL, RequestEntrySQL
+
+def models_source(tables: int) -> str:
+    """A models file whose tables live on their own MetaData, so the legacy loader can exec it repeatedly"""
+    lines = ["from typing import Optional", "from sqlalchemy import MetaData", "from sqlmodel import SQLModel, Field", ""]
+    for t in range(tables):
+        lines += [
+            f"class Table{t}(SQLModel, table=True):",
+            f"    __tablename__ = 'bench_table_{t}'",
+            "    metadata = MetaData()",
+            "    id: Optional[int] = Field(default=None, primary_key=True)",
+            "    key: str = Field(index=True)",
+            "    value: Optional[str] = None",
+            "    hits: int = 0",
+            "",
+        ]
+    return "\n".join(lines)
+
+def open_receptionists(d: Path, n: int) -> dict:
+    construct, first_use = [], []
+    for i in range(n):
+        t0 = time.perf_counter()
+        db = Database(name=f"recep{i}", dir=d, input_model=[RequestEntrySQL, CallbackEntrySQL])
+        t1 = time.perf_counter()
+        _ = db.manager.models.requestentrysql
+        t2 = time.perf_counter()
+        construct.append(t1 - t0)
+        first_use.append(t2 - t1)
+    return {
+        "total_s": sum(construct) + sum(first_use),
+        "construct": percentiles(construct),
+        "first_models_access": percentiles(first_use),
+    }
+
+def legacy_load(db: Database):
+    """The pre-registry DatabaseManager.models + migrate: exec the models file, scrud-wrap every class, create tables"""
+    spec = importlib.util.spec_from_file_location("models", db.model_path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    models = table_models(vars(mod))
+    meta = MetaData()
+    for model in models.values(): model.__table__.to_metadata(meta)
+    meta.create_all(db.manager.engine, checkfirst=True)
+    return {name: scrud(db.manager, obj) for name, obj in models.items()}
+
+def services(n: int, source: str) -> list[Database]:
+    d = Path(tempfile.mkdtemp(prefix="fastcontainer-startup-"))
+    for i in range(n):
+        (d / f"svc{i}-db-models.py").write_text(source)
+    return [Database(name=f"svc{i}", dir=d) for i in range(n)]
+
+def bench_models_file(n: int, tables: int) -> dict:
+    source = models_source(tables)
+    out = {}
+    samples = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", SAWarning)  # the legacy loader redefines the same classes every time
+        for db in services(n, source):
+            t0 = time.perf_counter()
+            legacy_load(db)
+            samples.append(time.perf_counter() - t0)
+    out["legacy_exec_per_db"] = dict(percentiles(samples), total_s=sum(samples))
+    samples = []
+    for db in services(n, source):
+        t0 = time.perf_counter()
+        _ = db.manager.models
+        samples.append(time.perf_counter() - t0)
+    out["registry"] = dict(percentiles(samples), total_s=sum(samples), module_loads=registry.loads, registry_hits=registry.hits)
+    out["speedup"] = out["legacy_exec_per_db"]["total_s"] / max(out["registry"]["total_s"], 1e-9)
+    return out
+
+def main(receptionists: int, tables: int, out: Path = None):
+    quiet("ERROR")
+    d = Path(tempfile.mkdtemp(prefix="fastcontainer-startup-"))
+    results = {
+        "receptionists": receptionists,
+        "tables": tables,
+        "cold": open_receptionists(d, receptionists),
+        "reopen": open_receptionists(d, receptionists),
+        "models_file": bench_models_file(receptionists, tables),
+    }
+    return write_results("startup", results, out=out)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Database / model startup")
+    parser.add_argument("--receptionists", type=int, default=100)
+    parser.add_argument("--tables", type=int, default=5)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    main(args.receptionists, args.tables, args.out)
@@ -1,6 +1,7 @@
 import ast
 import asyncio
 import inspect
+import os
 import time
 from dataclasses import dataclass
 from functools import cached_property
@@ -23,6 +24,8 @@ from fastapi.responses import HTMLResponse
 from loguru import logger as log
 
 from fast_template import FastTemplates
+from microservices.hub import Hub, Policy
+from microservices.workers import WorkerPool, REQUESTS, ERRORS, IN_FLIGHT, LATENCY_US, SLOTS
 
 @dataclass
 class PageConfig:
@@ -90,7 +93,7 @@ class PublicApp(ThreadedServer):
     @cached_property
     def api(self) -> 'Macroservice':
         if self.verbose: log.debug(f"[{self}]: Initializing Macroservice API")
-        return Macroservice()
+        return Macroservice  # module-level singleton instance, see below
 
     @cached_property
     def pages(self) -> List[PageConfig]:
@@ -120,10 +123,12 @@ class PublicApp(ThreadedServer):
     def static_env(self):
         return FastTemplates(self.cwd.static_pages)
 
-    def __init__(self, host="localhost", port=None, verbose=True):
+    def __init__(self, host="localhost", port=None, verbose=True, expose_hub=False):
+        """expose_hub=True mounts the hub's unauthenticated /hub routes (WS, SSE, publish) on this public app"""
         super().__init__(host=host, port=port, verbose=verbose)
         app = self
         _ = self.pages
+        if expose_hub: self.api.hub.mount(self)
 
         @self.get("/", response_class=HTMLResponse)
         async def home(request: Request):
@@ -164,6 +169,20 @@ class PublicApp(ThreadedServer):
 @singleton
 class Macroservice:
     microservices = {}
+    hub = Hub()
+
+    def publish(self, topic: str, data: Any) -> int:
+        """Push data to every local and remote subscriber of topic"""
+        return self.hub.publish(topic, data)
+
+    def subscribe(self, topic: str, maxsize: int = 256, policy: Policy = "drop_oldest"):
+        """Subscribe the running event loop to topic; iterate the result with `async for`"""
+        return self.hub.subscribe(topic, maxsize=maxsize, policy=policy)
+
+    @property
+    def stats(self) -> dict:
+        """One entry per logical service, however many worker processes back it"""
+        return {name: svc.stats for name, svc in self.microservices.items()}
 
     def __getattr__(self, name: str):
         if name in self.microservices:
@@ -184,13 +203,76 @@ class Microservice(ThreadedServer):
     _last_route_count = None
     _api_client = None
 
-    def __init__(self, host="localhost", port=None, alias: str = None, verbose=True):
+    def __init__(self, host="localhost", port=None, alias: str = None, verbose=True, expose_hub=False, workers: int | str = 1):
+        """
+        workers > 1 (or "auto" for one per CPU) forks that many processes sharing the port via SO_REUSEPORT
+        when .thread.start() is called; hub subscriptions are then local to each worker process.
+        """
         super().__init__(host=host, port=port, verbose=verbose)
         _ = self.base_url
-        self.name = str(port)
+        self.name = str(self.port)
         if alias: self.name = alias
+        self.workers = (os.cpu_count() or 1) if workers == "auto" else int(workers)
+        self.worker_index = None
+        self.worker_counters = None
+        self.loop = None
+        self._pending_subs = []
+        self.add_event_handler("startup", self._on_startup)
+        if self.workers > 1: self.middleware("http")(self._count_requests)
+        if expose_hub: Macroservice.hub.mount(self)
         Macroservice.microservices[self.name] = self
 
+    @cached_property
+    def thread(self):
+        if self.workers > 1: return WorkerPool(self, self.workers)
+        return super().thread
+
+    async def _count_requests(self, request, call_next):
+        c, base = self.worker_counters, self.worker_index * SLOTS
+        c[base + IN_FLIGHT] += 1
+        t0 = time.perf_counter()
+        try:
+            res = await call_next(request)
+            if res.status_code >= 500: c[base + ERRORS] += 1
+            return res
+        except Exception:
+            c[base + ERRORS] += 1
+            raise
+        finally:
+            c[base + IN_FLIGHT] -= 1
+            c[base + REQUESTS] += 1
+            c[base + LATENCY_US] += int((time.perf_counter() - t0) * 1_000_000)
+
+    @property
+    def stats(self) -> dict:
+        if isinstance(self.thread, WorkerPool):
+            per_worker = self.thread.stats
+        else:
+            per_worker = [{"worker": 0, "pid": os.getpid(), "alive": self.thread.is_alive()}]
+        return {"url": self.base_url, "workers": self.workers, "per_worker": per_worker}
+
+    async def _on_startup(self):
+        self.loop = asyncio.get_running_loop()
+        for args in self._pending_subs:
+            Macroservice.hub.on(*args)
+        self._pending_subs.clear()
+
+    def subscribe(self, topic: str, handler, maxsize: int = 256, policy: Policy = "drop_oldest"):
+        """Deliver messages on topic to handler inside this service's own event loop"""
+        args = (topic, handler, maxsize, policy)
+        if self.loop is None:
+            self._pending_subs.append(args)
+            if self.verbose: log.debug(f"{self}: Deferred subscription to '{topic}' until startup")
+            return None
+
+        async def attach():
+            return Macroservice.hub.on(*args)
+
+        return asyncio.run_coroutine_threadsafe(attach(), self.loop)
+
+    def publish(self, topic: str, data: Any) -> int:
+        return Macroservice.hub.publish(topic, data)
+
     def __repr__(self):
         return f"[Microservices.{self.name}]"
 
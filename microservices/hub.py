@@ -0,0 +1,230 @@
+import asyncio
+import inspect
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Literal, Optional, Set
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from loguru import logger as log
+
+Policy = Literal["drop_oldest", "drop_newest", "disconnect"]
+WILDCARD = "*"
+
+@dataclass
+class Message:
+    topic: str
+    data: Any
+    sent_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> dict:
+        return {"topic": self.topic, "data": self.data, "sent_at": self.sent_at}
+
+class Subscriber:
+    """Bounded per-subscriber queue bound to the event loop that consumes it"""
+
+    def __init__(self, hub: "Hub", topic: str, maxsize: int = 256, policy: Policy = "drop_oldest", name: str = None):
+        self.hub = hub
+        self.topic = topic
+        self.policy = policy
+        self.name = name or f"{topic}-{id(self):x}"
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.closed = False
+
+    def __repr__(self):
+        return f"[Hub.Subscriber.{self.name}]"
+
+    def offer(self, msg: Message) -> bool:
+        """Thread-safe enqueue; the actual put always runs on the subscriber's own loop. False once that loop is gone"""
+        if self.closed: return False
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._put(msg)
+            return True
+        try:
+            if self.loop.is_closed(): raise RuntimeError("Event loop is closed")
+            self.loop.call_soon_threadsafe(self._put, msg)
+            return True
+        except RuntimeError:
+            log.warning(f"{self}: Event loop closed, dropping dead subscriber")
+            self.hub.unsubscribe(self)
+            return False
+
+    def _put(self, msg: Message):
+        if self.closed: return
+        if not self.queue.full():
+            self.queue.put_nowait(msg)
+            self.delivered += 1
+            return
+        self.dropped += 1
+        if self.policy == "drop_oldest":
+            self.queue.get_nowait()
+            self.queue.put_nowait(msg)
+            self.delivered += 1
+        elif self.policy == "disconnect":
+            log.warning(f"{self}: Queue full ({self.queue.maxsize}), disconnecting slow subscriber")
+            self.hub.unsubscribe(self)
+        # drop_newest: discard msg
+
+    def _sentinel(self):
+        while self.queue.full(): self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    def close(self):
+        """Wake the consumer with a sentinel and stop accepting messages"""
+        if self.closed: return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        self.closed = True
+        if running is self.loop: self._sentinel()
+        elif not self.loop.is_closed(): self.loop.call_soon_threadsafe(self._sentinel)
+
+    async def get(self, timeout: float = None) -> Optional[Message]:
+        if timeout is None: return await self.queue.get()
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Message:
+        msg = await self.queue.get()
+        if msg is None: raise StopAsyncIteration
+        return msg
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "topic": self.topic,
+            "policy": self.policy,
+            "depth": self.queue.qsize(),
+            "maxsize": self.queue.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+class Hub:
+    """Topic-based pub/sub fan-out shared by every service in the process"""
+
+    def __init__(self, verbose: bool = True):
+        self.topics: Dict[str, Set[Subscriber]] = {}
+        self.lock = threading.Lock()
+        self.published = 0
+        self.verbose = verbose
+
+    def __repr__(self):
+        return "[Macroservice.Hub]"
+
+    def subscribe(self, topic: str, maxsize: int = 256, policy: Policy = "drop_oldest", name: str = None) -> Subscriber:
+        """Must be called from inside the event loop that will consume the subscription"""
+        sub = Subscriber(self, topic, maxsize=maxsize, policy=policy, name=name)
+        with self.lock:
+            self.topics.setdefault(topic, set()).add(sub)
+        if self.verbose: log.debug(f"{self}: {sub} subscribed to '{topic}' (maxsize={maxsize}, policy={policy})")
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self.lock:
+            subs = self.topics.get(sub.topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs: del self.topics[sub.topic]
+        sub.close()
+        if self.verbose: log.debug(f"{self}: {sub} unsubscribed from '{sub.topic}'")
+
+    def publish(self, topic: str, data: Any) -> int:
+        """Fan a message out to every subscriber of topic (and of the wildcard); safe from any thread. Returns the live recipients"""
+        msg = Message(topic=topic, data=data)
+        with self.lock:
+            targets = list(self.topics.get(topic, ())) + list(self.topics.get(WILDCARD, ()))
+            self.published += 1
+        return sum(sub.offer(msg) for sub in targets)  # a dead subscriber is dropped, the others still get msg
+
+    def on(self, topic: str, handler: Callable[[Message], Any], maxsize: int = 256, policy: Policy = "drop_oldest") -> asyncio.Task:
+        """Run handler for every message on topic as a task on the current loop"""
+        sub = self.subscribe(topic, maxsize=maxsize, policy=policy, name=getattr(handler, "__name__", None))
+
+        async def consume():
+            try:
+                async for msg in sub:
+                    try:
+                        out = handler(msg)
+                        if inspect.isawaitable(out): await out
+                    except Exception as e:
+                        log.error(f"{self}: Handler {sub.name} failed on '{msg.topic}': {e}")
+            finally:
+                self.unsubscribe(sub)
+
+        task = asyncio.get_running_loop().create_task(consume())
+        task.subscriber = sub
+        return task
+
+    @property
+    def stats(self) -> dict:
+        with self.lock:
+            subs = {t: [s.stats for s in subs] for t, subs in self.topics.items()}
+        return {"published": self.published, "topics": subs}
+
+    def mount(self, app: FastAPI, prefix: str = "/hub", maxsize: int = 256, policy: Policy = "drop_oldest", heartbeat: float = 15.0):
+        """Expose the hub to remote clients over WebSocket and server-sent events"""
+
+        @app.websocket(prefix + "/ws/{topic}")
+        async def hub_ws(websocket: WebSocket, topic: str):
+            await websocket.accept()
+            sub = self.subscribe(topic, maxsize=maxsize, policy=policy, name=f"ws-{websocket.client}")
+
+            async def pump():
+                async for msg in sub:
+                    await websocket.send_json(msg.to_json())
+                await websocket.close(code=1013)  # disconnected by backpressure policy
+
+            sender = asyncio.create_task(pump())
+            try:
+                while True:
+                    data = await websocket.receive_json()
+                    self.publish(topic, data)
+            except WebSocketDisconnect:
+                pass
+            finally:
+                self.unsubscribe(sub)
+                sender.cancel()
+
+        @app.get(prefix + "/sse/{topic}")
+        async def hub_sse(topic: str, request: Request):
+            sub = self.subscribe(topic, maxsize=maxsize, policy=policy, name=f"sse-{request.client}")
+
+            async def stream():
+                try:
+                    while not await request.is_disconnected():
+                        try:
+                            msg = await sub.get(timeout=heartbeat)
+                        except asyncio.TimeoutError:
+                            yield ": keep-alive\n\n"
+                            continue
+                        if msg is None: break
+                        yield f"event: {msg.topic}\ndata: {json.dumps(msg.to_json(), default=str)}\n\n"
+                finally:
+                    self.unsubscribe(sub)
+
+            return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+        @app.post(prefix + "/publish/{topic}")
+        async def hub_publish(topic: str, request: Request):
+            data = await request.json()
+            return {"topic": topic, "delivered": self.publish(topic, data)}
+
+        @app.get(prefix + "/stats")
+        async def hub_stats():
+            return self.stats
+
+        if self.verbose: log.debug(f"{self}: Mounted on {app} at {prefix}")
+        return app
@@ -0,0 +1,89 @@
+import multiprocessing as mp
+import os
+import socket
+import time
+from typing import List
+
+import uvicorn
+from loguru import logger as log
+
+# per-worker counter slots in the shared array
+REQUESTS, ERRORS, IN_FLIGHT, LATENCY_US = range(4)
+SLOTS = 4
+
+def reuseport_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT is not supported on this platform")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def _serve(service, index: int, counters):
+    """Child entrypoint: each worker binds its own SO_REUSEPORT listener so the kernel spreads accepts"""
+    service.worker_index = index
+    service.worker_counters = counters
+    sock = reuseport_socket(service.host, service.port)
+    if service.verbose: log.info(f"{service}: Worker {index} (pid={os.getpid()}) listening on {service.host}:{service.port}")
+    server = uvicorn.Server(config=service.uvicorn_cfg)
+    server.run(sockets=[sock])
+
+class WorkerPool:
+    """
+    Runs a Microservice in N forked processes that share one port via SO_REUSEPORT.
+    Quacks like the ThreadedServer thread (start / is_alive / join) so callers don't need to care.
+    Routes must be registered before start(); workers are forked with the app as it is at that moment.
+    """
+
+    def __init__(self, service, workers: int):
+        self.service = service
+        self.workers = workers
+        self.ctx = mp.get_context("fork")
+        self.counters = self.ctx.Array("q", workers * SLOTS, lock=False)
+        self.procs: List[mp.Process] = []
+        self.started_at = None
+
+    def __repr__(self):
+        return f"{self.service}.[WorkerPool: {self.workers} workers]"
+
+    def start(self):
+        if self.procs: raise RuntimeError(f"{self}: Already started")
+        for i in range(self.workers):
+            p = self.ctx.Process(target=_serve, args=(self.service, i, self.counters), name=f"{self.service.name}-worker-{i}", daemon=True)
+            p.start()
+            self.procs.append(p)
+        self.started_at = time.time()
+        if self.service.verbose: log.success(f"{self}: Started on port {self.service.port} (pids={[p.pid for p in self.procs]})")
+
+    def is_alive(self) -> bool:
+        return any(p.is_alive() for p in self.procs)
+
+    def join(self, timeout: float = None):
+        for p in self.procs:
+            p.join(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        for p in self.procs:
+            if p.is_alive(): p.terminate()
+        self.join(timeout)
+        if self.service.verbose: log.warning(f"{self}: Stopped")
+
+    @property
+    def stats(self) -> List[dict]:
+        out = []
+        for i, p in enumerate(self.procs):
+            base = i * SLOTS
+            requests = self.counters[base + REQUESTS]
+            out.append({
+                "worker": i,
+                "pid": p.pid,
+                "alive": p.is_alive(),
+                "requests": requests,
+                "errors": self.counters[base + ERRORS],
+                "in_flight": self.counters[base + IN_FLIGHT],
+                "avg_latency_ms": (self.counters[base + LATENCY_US] / requests / 1000) if requests else 0.0,
+            })
+        return out
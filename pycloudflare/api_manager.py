@@ -1,3 +1,4 @@
+import asyncio
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
@@ -9,6 +10,8 @@ import toml
 from loguru import logger as log
 from toomanythreads import ThreadedServer
 
+from back_end.receptionist.rate_limit import RateLimiter
+
 
 @dataclass
 class Headers:
@@ -175,8 +178,44 @@ class Response:
 class Receptionist(API):
     cache: dict[str | SimpleNamespace] = {}
 
-    def __init__(self, path):
+    def __init__(self, path, rate_limit: RateLimiter | dict | None = None):
+        """rate_limit: client-side token buckets as in back_end's RateLimiter ({"rate", "burst", "routes"}); None sends unthrottled"""
         API.__init__(self, path=path)
+        self._http_session: aiohttp.ClientSession | None = None
+        self._http_loop = None
+        self.rate_limit = RateLimiter.resolve(rate_limit, name=type(self).__name__)
+
+    @property
+    def http_session(self) -> aiohttp.ClientSession:
+        """
+        One pooled session per event loop, shared by every api_request: connections to the API host are kept
+        alive and reused (no TCP + TLS handshake per call) and DNS answers are cached.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_session is None or self._http_session.closed or self._http_loop is not loop:
+            if self._http_session is not None and not self._http_session.closed:
+                self._close_elsewhere(self._http_session, self._http_loop)
+            connector = aiohttp.TCPConnector(limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30)
+            self._http_session = aiohttp.ClientSession(connector=connector)
+            self._http_loop = loop
+        return self._http_session
+
+    @staticmethod
+    def _close_elsewhere(session: aiohttp.ClientSession, loop):
+        """Close a session owned by another loop: on that loop while it runs, otherwise by closing its transports directly"""
+        if loop is not None and loop.is_running():
+            return asyncio.run_coroutine_threadsafe(session.close(), loop)
+        if session.connector is not None: session.connector._close()  # a closed loop's sockets are left to it
+        return None
+
+    async def aclose(self):
+        """Close the pooled session, on the loop that owns it; call before the event loop shuts down"""
+        session, loop, self._http_session = self._http_session, self._http_loop, None
+        if session is None or session.closed: return
+        if loop is asyncio.get_running_loop(): await session.close()
+        else:
+            done = self._close_elsewhere(session, loop)
+            if done is not None: await asyncio.wrap_future(done)
 
     async def api_request(self,
                           method: str,
@@ -220,27 +259,30 @@ class Receptionist(API):
                     log.warning(
                         f"{self}: No match! Cache was {cache.method}, while this request is {method}! Continuing...")
 
-        async with aiohttp.ClientSession(headers=headers) as ses:
-            async with ses.request(method.upper(), path, **kw) as res:
-                try:
-                    content_type = res.headers.get("Content-Type", "")
-                    if "json" in content_type:
-                        content = await res.json()
-                    else:
-                        content = await res.text()
-                except Exception as e:
-                    content = await res.text()  # always fallback
-                    log.warning(f"{self}: Bad response decode → {e} | Fallback body: {content}")
-
-                out = Response(
-                    status=res.status,
-                    method=method,
-                    headers=dict(res.headers),
-                    body=content,
-                )
-
-                self.cache[path] = out
-                return self.cache[path]
+        if self.rate_limit:
+            waited = await self.rate_limit.acquire(route)
+            if waited: log.debug(f"{self}: Rate limited {method.upper()} {path} for {waited:.2f}s")
+        async with self.http_session.request(method.upper(), path, headers=headers, **kw) as res:
+            if self.rate_limit: self.rate_limit.observe(route, res.status, res.headers)
+            try:
+                content_type = res.headers.get("Content-Type", "")
+                if "json" in content_type:
+                    content = await res.json()
+                else:
+                    content = await res.text()
+            except Exception as e:
+                content = await res.text()  # always fallback
+                log.warning(f"{self}: Bad response decode → {e} | Fallback body: {content}")
+
+            out = Response(
+                status=res.status,
+                method=method,
+                headers=dict(res.headers),
+                body=content,
+            )
+
+            self.cache[path] = out
+            return self.cache[path]
 
     async def api_get(self, route, append=None, format=None, force_refresh=False, append_headers=None, **kw):
         return await self.api_request("get", route, append=append, format=format, force_refresh=force_refresh,
@@ -260,8 +302,8 @@ class Receptionist(API):
 
 
 class APIGateway(Receptionist, ThreadedServer):
-    def __init__(self, path: Path):
-        Receptionist.__init__(self, path)
+    def __init__(self, path: Path, rate_limit: RateLimiter | dict | None = None):
+        Receptionist.__init__(self, path, rate_limit=rate_limit)
         ThreadedServer.__init__(self)
 
 # b = APIGateway(Path(Path.cwd().parent / "test.toml"))
@@ -94,8 +94,11 @@ class CFG:
 
 CFG = CFG.from_toml
 
+# Cloudflare's API allows 1200 requests per 5 minutes per user; stay under it, bursts included
+RATE_LIMIT = {"rate": 3.9, "burst": 10}
+
 class Cloudflare(APIGateway):
-    def __init__(self, toml: Path = None):
+    def __init__(self, toml: Path = None, rate_limit: dict | None = RATE_LIMIT):
         self.cwd = Path.cwd()
         self.path = Path(self.cwd / "cloudflare_api.toml")
         self.cfg_path = Path(self.cwd / "cloudflare_api_cfg.toml")
@@ -103,7 +106,7 @@ class Cloudflare(APIGateway):
             self.cwd = toml.parent
             self.path = toml
         _ = self.cloudflare_cfg
-        APIGateway.__init__(self, path=self.path)
+        APIGateway.__init__(self, path=self.path, rate_limit=rate_limit)
 
     def __repr__(self):
         return f"[Cloudflare.Gateway]"